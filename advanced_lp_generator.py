@@ -6,10 +6,19 @@
 
 import os
 import sys
+import glob
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, Any
-from correct_lp_generator import CorrectLPGenerator
+from typing import Dict, Any, List, Optional
+from correct_lp_generator import CorrectLPGenerator, parse_kishima_csv
 from competitor_analyzer import CompetitorAnalyzer
+from parse_cache import set_cache_enabled
+from input_router import INPUT_TYPE_KISHIMA_CSV, InputTypeError, require_input_type
+from record_validator import RECORD_TYPE_CORRECT, validate_record
+from jan_index import STATUS_CONFLICT, STATUS_LABELS, STATUS_NEW, JanIndex, product_identity
+from input_manifest import InputManifest
 from docbase_lp_uploader import DocbaseLPUploader
 
 class AdvancedLPGenerator(CorrectLPGenerator):
@@ -17,6 +26,7 @@ class AdvancedLPGenerator(CorrectLPGenerator):
         """初期化"""
         super().__init__()
         self.competitor_analyzer = CompetitorAnalyzer()
+        self.last_error = None
     
     def generate_with_competitor_analysis(self, csv_path: str, enable_analysis: bool = True, 
                                         upload_to_docbase: bool = False) -> Dict[str, Any]:
@@ -26,21 +36,36 @@ class AdvancedLPGenerator(CorrectLPGenerator):
         print(f"📁 入力ファイル: {csv_path}")
         print(f"🔍 競合分析: {'有効' if enable_analysis else '無効'}")
         
+        self.last_error = None
+        timings = {}
+        
         try:
             # 基本データ抽出
+            stage_start = time.perf_counter()
             product_data = self.parse_kishima_csv(csv_path)
             product_name = product_data.get('商品名', '商品名不明')
+            timings['parse'] = time.perf_counter() - stage_start
+            
+            # 競合分析などの重い処理の前に検証（問題はまとめて報告）
+            errors = validate_record(product_data, RECORD_TYPE_CORRECT)
+            if errors:
+                for error in errors:
+                    print(f"❌ 検証エラー: {error}")
+                self.last_error = '; '.join(errors)
+                return None
             print(f"✅ 商品データ抽出完了: {product_name}")
             
             result = {
                 'product_data': product_data,
                 'product_name': product_name,
-                'analysis_enabled': enable_analysis
+                'analysis_enabled': enable_analysis,
+                'timings': timings
             }
             
             # 競合分析実行
             if enable_analysis:
                 print(f"\n🔍 競合分析開始...")
+                stage_start = time.perf_counter()
                 
                 # 商品カテゴリ自動判定
                 category = self._detect_category(product_name)
@@ -55,29 +80,37 @@ class AdvancedLPGenerator(CorrectLPGenerator):
                 result['competitor_analysis'] = competitor_analysis
                 result['category'] = category
                 
+                timings['analysis'] = time.perf_counter() - stage_start
                 print(f"✅ 競合分析完了: {competitor_analysis.get('competitor_count', 0)}商品を分析")
                 
                 # 強化版LPラフ案生成
                 print(f"\n📝 競合分析反映LPラフ案生成中...")
+                stage_start = time.perf_counter()
                 enhanced_lp_content = self.competitor_analyzer.generate_enhanced_lp_with_analysis(
                     product_data, competitor_analysis
                 )
                 result['lp_content'] = enhanced_lp_content
                 result['generation_type'] = '競合分析強化版'
+                timings['render'] = time.perf_counter() - stage_start
                 
             else:
                 # 通常版LPラフ案生成
                 print(f"\n📝 通常LPラフ案生成中...")
+                stage_start = time.perf_counter()
                 lp_content = self.generate_correct_lp_rough(product_data)
                 result['lp_content'] = lp_content
                 result['generation_type'] = '通常版'
+                timings['render'] = time.perf_counter() - stage_start
             
             # ファイル保存
+            stage_start = time.perf_counter()
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             safe_product_name = product_name.replace(' ', '_').replace('/', '_')
+            # バッチで同じ商品名の規定書を同時に処理しても上書きしないよう入力ファイル名も含める
+            input_stem = os.path.splitext(os.path.basename(csv_path))[0].replace(' ', '_')
             
             # LPラフ案保存
-            lp_filename = f"lp_rough_{'enhanced' if enable_analysis else 'standard'}_{safe_product_name}_{timestamp}.md"
+            lp_filename = f"lp_rough_{'enhanced' if enable_analysis else 'standard'}_{safe_product_name}_{input_stem}_{timestamp}.md"
             lp_output_path = os.path.join('output', lp_filename)
             
             os.makedirs('output', exist_ok=True)
@@ -89,18 +122,20 @@ class AdvancedLPGenerator(CorrectLPGenerator):
             
             # 競合分析データ保存
             if enable_analysis and 'competitor_analysis' in result:
-                analysis_filename = f"competitor_analysis_{safe_product_name}_{timestamp}.json"
+                analysis_filename = f"competitor_analysis_{safe_product_name}_{input_stem}_{timestamp}.json"
                 analysis_output_path = os.path.join('output', analysis_filename)
                 
-                import json
                 with open(analysis_output_path, 'w', encoding='utf-8') as f:
                     json.dump(result['competitor_analysis'], f, ensure_ascii=False, indent=2)
                 
                 result['analysis_output_path'] = analysis_output_path
                 print(f"📊 競合分析データ保存: {analysis_output_path}")
             
+            timings['save'] = time.perf_counter() - stage_start
+            
             # Docbaseアップロード
             if upload_to_docbase:
+                stage_start = time.perf_counter()
                 try:
                     print(f"\n📤 Docbaseアップロード中...")
                     
@@ -130,11 +165,15 @@ class AdvancedLPGenerator(CorrectLPGenerator):
                     
                 except Exception as e:
                     print(f"❌ Docbaseアップロードエラー: {e}")
+                    result['docbase_error'] = str(e)
+                
+                timings['upload'] = time.perf_counter() - stage_start
             
             return result
             
         except Exception as e:
             print(f"❌ エラー: {e}")
+            self.last_error = str(e)
             import traceback
             traceback.print_exc()
             return None
@@ -256,6 +295,213 @@ class AdvancedLPGenerator(CorrectLPGenerator):
         
         return report
 
+# バッチ処理用（ワーカープロセスごとに1回だけ生成器を初期化）
+_batch_generator = None
+
+def _init_batch_worker():
+    """バッチワーカープロセスの初期化"""
+    global _batch_generator
+    _batch_generator = AdvancedLPGenerator()
+
+def _error_entry(csv_path: str, error: Optional[str] = None) -> Dict[str, Any]:
+    """マニフェスト用の失敗エントリを作成"""
+    return {
+        'input': csv_path,
+        'status': 'error',
+        'product_name': None,
+        'output_path': None,
+        'analysis_output_path': None,
+        'docbase_id': None,
+        'docbase_url': None,
+        'timings': {},
+        'error': error
+    }
+
+def _run_batch_item(csv_path: str, enable_analysis: bool, upload_to_docbase: bool) -> Dict[str, Any]:
+    """バッチ内の1ファイルを処理してマニフェスト用エントリを返す"""
+    
+    started = time.perf_counter()
+    entry = _error_entry(csv_path)
+    
+    try:
+        result = _batch_generator.generate_with_competitor_analysis(
+            csv_path,
+            enable_analysis=enable_analysis,
+            upload_to_docbase=upload_to_docbase
+        )
+        if result:
+            entry['status'] = 'success'
+            entry['product_name'] = result.get('product_name')
+            entry['output_path'] = result.get('lp_output_path')
+            entry['analysis_output_path'] = result.get('analysis_output_path')
+            entry['docbase_id'] = result.get('docbase_id')
+            entry['docbase_url'] = result.get('docbase_url')
+            entry['timings'] = result.get('timings', {})
+            if result.get('docbase_error'):
+                # 生成はできたがアップロードに失敗した（成功には数えない）
+                entry['status'] = 'upload_failed'
+                entry['error'] = result['docbase_error']
+        else:
+            entry['error'] = _batch_generator.last_error or '生成処理に失敗しました'
+    except Exception as e:
+        entry['error'] = str(e)
+    
+    entry['timings']['total'] = time.perf_counter() - started
+    return entry
+
+def collect_batch_inputs(batch_target: str) -> List[str]:
+    """--batch 引数（ディレクトリまたはglob）から入力ファイル一覧を取得"""
+    
+    if os.path.isdir(batch_target):
+        pattern = os.path.join(batch_target, '*.csv')
+    else:
+        pattern = batch_target
+    
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+def run_batch(batch_target: str, enable_analysis: bool = True, upload_to_docbase: bool = False,
+              max_workers: Optional[int] = None, manifest_path: Optional[str] = None,
+              jan_index: Optional[JanIndex] = None,
+              input_manifest: Optional[InputManifest] = None) -> Dict[str, Any]:
+    """複数の規定書CSVをプロセスプールで並列処理し、実行マニフェストを書き出す
+    
+    jan_index を渡すと、ワーカーに渡す前に親プロセスで索引と照合し、生成済み・重複の商品は
+    スキップ、JANが別の商品と衝突する商品は失敗として扱う。
+    input_manifest を渡すと、前回の生成から変更のない入力は解析も生成もせずにスキップする（差分再生成）。
+    """
+    
+    if max_workers is not None and max_workers < 1:
+        raise ValueError(f"ワーカー数は1以上を指定してください: {max_workers}")
+    inputs = collect_batch_inputs(batch_target)
+    max_workers = max_workers or os.cpu_count() or 1
+    
+    print(f"\n📦 バッチ処理開始: {len(inputs)}ファイル（ワーカー数: {max_workers}）")
+    
+    started_at = datetime.now()
+    batch_start = time.perf_counter()
+    entries = []
+    
+    # 規定書CSVでない入力はワーカーに渡す前に内容判定で弾く
+    routed_inputs = []
+    for csv_path in inputs:
+        try:
+            require_input_type(csv_path, [INPUT_TYPE_KISHIMA_CSV])
+            routed_inputs.append(csv_path)
+        except (InputTypeError, OSError) as e:
+            entries.append(_error_entry(csv_path, str(e)))
+            print(f"❌ [{len(entries)}/{len(inputs)}] {csv_path}: {e}")
+    
+    # 差分再生成: サイズ・更新時刻（変わっていれば内容ハッシュ）が前回と同じ入力は処理しない
+    options = {'analysis': enable_analysis, 'upload': upload_to_docbase}
+    if input_manifest is not None:
+        changed_inputs = []
+        for csv_path in routed_inputs:
+            if input_manifest.is_changed(csv_path, options):
+                changed_inputs.append(csv_path)
+                continue
+            entry = _error_entry(csv_path)
+            entry['status'] = 'unchanged'
+            entry['output_path'] = input_manifest.previous_output(csv_path)
+            entries.append(entry)
+        print(f"📝 変更あり: {len(changed_inputs)}ファイル / 未変更: {len(routed_inputs) - len(changed_inputs)}ファイル")
+        routed_inputs = changed_inputs
+    
+    # 索引の照合（解析結果は解析キャッシュに入るため、ワーカーでの再解析は軽い）
+    product_keys = {}
+    if jan_index is not None:
+        claimed_inputs = []
+        for csv_path in routed_inputs:
+            try:
+                identity = product_identity(parse_kishima_csv(csv_path))
+            except Exception as e:
+                entries.append(_error_entry(csv_path, str(e)))
+                print(f"❌ [{len(entries)}/{len(inputs)}] {csv_path}: {e}")
+                continue
+            
+            # 差分再生成で前回この入力から生成した商品は、生成済みでも作り直す
+            regenerate = input_manifest is not None and input_manifest.previous_output(csv_path) is not None
+            status, details = jan_index.claim(identity, csv_path, regenerate=regenerate)
+            if status == STATUS_NEW:
+                product_keys[csv_path] = identity['key']
+                claimed_inputs.append(csv_path)
+                continue
+            
+            entry = _error_entry(csv_path, ' / '.join(details) or None)
+            entry['product_name'] = identity['name']
+            if status == STATUS_CONFLICT:
+                print(f"❌ [{len(entries) + 1}/{len(inputs)}] {csv_path}: {entry['error']}")
+            else:
+                entry['status'] = 'skipped'
+                entry['error'] = None
+                entry['output_path'] = details[0] if details else None
+                print(f"⏭️ [{len(entries) + 1}/{len(inputs)}] {csv_path}: {STATUS_LABELS[status]}のためスキップ")
+            entries.append(entry)
+        routed_inputs = claimed_inputs
+    
+    if routed_inputs:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_batch_worker) as executor:
+            futures = {
+                executor.submit(_run_batch_item, csv_path, enable_analysis, upload_to_docbase): csv_path
+                for csv_path in routed_inputs
+            }
+            
+            for future in as_completed(futures):
+                csv_path = futures[future]
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    # ワーカープロセス自体が落ちた場合も処理を継続
+                    entry = _error_entry(csv_path, str(e))
+                entries.append(entry)
+                if jan_index is not None and entry['status'] == 'success' and csv_path in product_keys:
+                    jan_index.mark_generated(product_keys[csv_path], entry['output_path'], entry['docbase_url'])
+                if input_manifest is not None and entry['status'] == 'success':
+                    input_manifest.record(csv_path, entry['output_path'], options)
+                
+                mark = '✅' if entry['status'] == 'success' else '❌'
+                suffix = f"（アップロード失敗: {entry['error']}）" if entry['status'] == 'upload_failed' else ''
+                print(f"{mark} [{len(entries)}/{len(inputs)}] {csv_path}{suffix}")
+    
+    if jan_index is not None:
+        jan_index.save()
+    if input_manifest is not None:
+        input_manifest.forget_missing()
+        input_manifest.save()
+    
+    entries.sort(key=lambda entry: entry['input'])
+    success_count = sum(1 for entry in entries if entry['status'] == 'success')
+    skipped_count = sum(1 for entry in entries if entry['status'] == 'skipped')
+    unchanged_count = sum(1 for entry in entries if entry['status'] == 'unchanged')
+    upload_failed_count = sum(1 for entry in entries if entry['status'] == 'upload_failed')
+    
+    manifest = {
+        'batch_target': batch_target,
+        'started_at': started_at.isoformat(),
+        'finished_at': datetime.now().isoformat(),
+        'elapsed': time.perf_counter() - batch_start,
+        'workers': max_workers,
+        'analysis_enabled': enable_analysis,
+        'upload_to_docbase': upload_to_docbase,
+        'total': len(entries),
+        'succeeded': success_count,
+        'skipped': skipped_count,
+        'unchanged': unchanged_count,
+        'upload_failed': upload_failed_count,
+        'failed': len(entries) - success_count - skipped_count - unchanged_count,
+        'entries': entries
+    }
+    
+    if not manifest_path:
+        timestamp = started_at.strftime('%Y%m%d_%H%M%S')
+        manifest_path = os.path.join('output', f'batch_manifest_{timestamp}.json')
+    
+    os.makedirs(os.path.dirname(manifest_path) or '.', exist_ok=True)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    
+    manifest['manifest_path'] = manifest_path
+    return manifest
+
 def main():
     """メイン処理"""
     
@@ -263,15 +509,25 @@ def main():
         print("🚀 高度LPラフ案生成システム（競合分析機能付き）")
         print("\n使用方法:")
         print("  python advanced_lp_generator.py <規定書CSVファイル> [オプション]")
+        print("  python advanced_lp_generator.py --batch <ディレクトリ|glob> [オプション]")
         print("\nオプション:")
         print("  --upload          Docbaseにアップロード")
         print("  --no-analysis     競合分析を無効化")
         print("  --report          競合分析レポートも生成")
+        print("  --batch <対象>    ディレクトリ内（またはglobに一致）の規定書CSVを一括処理")
+        print("  --workers <数>    バッチ処理のワーカープロセス数（デフォルト: CPU数）")
+        print("  --no-cache        解析キャッシュを使わずに規定書を読み直す")
+        print("  --skip-generated  JAN/SKU索引で生成済み・重複の規定書をスキップ（バッチ処理）")
+        print("  --delta           前回のバッチから変更された規定書だけを再生成（バッチ処理）")
         print("\n例:")
         print("  python advanced_lp_generator.py 規定書.csv")
         print("  python advanced_lp_generator.py 規定書.csv --upload")
         print("  python advanced_lp_generator.py 規定書.csv --upload --report")
         print("  python advanced_lp_generator.py 規定書.csv --no-analysis")
+        print("  python advanced_lp_generator.py --batch data/specs --workers 8")
+        print("  python advanced_lp_generator.py --batch 'data/specs/*.csv' --no-analysis")
+        print("  python advanced_lp_generator.py --batch data/specs --skip-generated")
+        print("  python advanced_lp_generator.py --batch data/specs --delta")
         sys.exit(1)
     
     csv_path = sys.argv[1]
@@ -281,10 +537,68 @@ def main():
     
     enable_analysis = not no_analysis_flag
     
+    # 環境変数経由でバッチのワーカープロセスにも伝わる
+    if '--no-cache' in sys.argv:
+        set_cache_enabled(False)
+    
+    # バッチモード
+    if '--batch' in sys.argv:
+        batch_index = sys.argv.index('--batch')
+        if batch_index + 1 >= len(sys.argv):
+            print("❌ --batch には対象ディレクトリまたはglobを指定してください")
+            sys.exit(1)
+        batch_target = sys.argv[batch_index + 1]
+        
+        max_workers = None
+        if '--workers' in sys.argv:
+            workers_index = sys.argv.index('--workers')
+            try:
+                max_workers = int(sys.argv[workers_index + 1])
+            except (IndexError, ValueError):
+                print("❌ --workers には整数を指定してください")
+                sys.exit(1)
+            if max_workers < 1:
+                print(f"❌ --workers には1以上の整数を指定してください: {max_workers}")
+                sys.exit(1)
+        
+        if not collect_batch_inputs(batch_target):
+            print(f"❌ 対象の規定書CSVファイルが見つかりません: {batch_target}")
+            sys.exit(1)
+        
+        manifest = run_batch(
+            batch_target,
+            enable_analysis=enable_analysis,
+            upload_to_docbase=upload_flag,
+            max_workers=max_workers,
+            jan_index=JanIndex() if '--skip-generated' in sys.argv else None,
+            input_manifest=InputManifest() if '--delta' in sys.argv else None
+        )
+        
+        print(f"\n🎉 バッチ処理完了！")
+        print(f"✅ 成功: {manifest['succeeded']}件 / ❌ 失敗: {manifest['failed']}件")
+        if manifest['skipped']:
+            print(f"⏭️ スキップ（生成済み・重複）: {manifest['skipped']}件")
+        if manifest['unchanged']:
+            print(f"💤 未変更（--delta）: {manifest['unchanged']}件")
+        if manifest['upload_failed']:
+            print(f"⚠️ うちDocbaseアップロード失敗: {manifest['upload_failed']}件（LPラフ案は出力済み）")
+        print(f"⏱️ 処理時間: {manifest['elapsed']:.1f}秒")
+        print(f"📋 実行マニフェスト: {manifest['manifest_path']}")
+        
+        if manifest['failed']:
+            sys.exit(1)
+        return
+    
     if not os.path.exists(csv_path):
         print(f"❌ 規定書CSVファイルが見つかりません: {csv_path}")
         sys.exit(1)
     
+    try:
+        require_input_type(csv_path, [INPUT_TYPE_KISHIMA_CSV])
+    except InputTypeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
     try:
         # 高度LP生成実行
         generator = AdvancedLPGenerator()
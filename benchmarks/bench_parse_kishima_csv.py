@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+規定書CSV解析のベンチマーク（旧: list(reader)の2パス版 / 新: 1パスのストリーミング版）
+
+使用方法:
+  python benchmarks/bench_parse_kishima_csv.py [行数]
+"""
+
+import os
+import sys
+import csv
+import time
+import tempfile
+import tracemalloc
+from typing import Dict, Any, Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from correct_lp_generator import parse_kishima_rows
+
+def legacy_parse_kishima_csv(csv_path: str) -> Dict[str, Any]:
+    """比較用: 変更前の実装（全行をリスト化して2回走査）"""
+
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        rows = list(reader)
+
+    product_data = {}
+    jan_codes = []
+
+    for i, row in enumerate(rows):
+        if len(row) >= 6 and row[4] and row[5]:
+            key = row[4].strip()
+            value = row[5].strip()
+            product_data[key] = value
+
+            if "JANコード" in key:
+                jan_codes.append(value)
+                if i + 1 < len(rows) and len(rows[i + 1]) >= 6 and rows[i + 1][5]:
+                    next_jan = rows[i + 1][5].strip()
+                    if next_jan and ('：' in next_jan or ':' in next_jan):
+                        jan_codes.append(next_jan)
+
+    if jan_codes:
+        product_data["JANコード\n（バリエーション別）"] = "\n".join(jan_codes)
+
+    sales_points = []
+    for i, row in enumerate(rows):
+        if len(row) > 3 and row[3] and "セールスポイント" in row[3]:
+            for j in range(i+1, len(rows)):
+                if len(rows[j]) > 3 and rows[j][3]:
+                    point_text = rows[j][3].strip()
+                    if point_text.startswith("●"):
+                        sales_points.append(point_text.replace("●", "").strip())
+            break
+
+    product_data["セールスポイント"] = sales_points
+
+    return product_data
+
+def streaming_parse_kishima_csv(csv_path: str) -> Dict[str, Any]:
+    """新実装: CorrectLPGenerator.parse_kishima_csv と同じ読み込み方"""
+
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        return parse_kishima_rows(csv.reader(f))
+
+def write_spec_export(path: str, row_count: int):
+    """規定書エクスポートを模した大きなCSVを生成"""
+
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["", "", "", "", "商品名", "PowerArQ Electric Blanket Lite"])
+        writer.writerow(["", "", "", "", "JANコード\n（バリエーション別）", "ブラック：4571427130640"])
+        writer.writerow(["", "", "", "", "", "ベージュ：4571427130657"])
+
+        half = row_count // 2
+        for i in range(half):
+            writer.writerow(["", "", "", "", f"項目{i}", f"値{i}"])
+
+        writer.writerow(["", "", "", "セールスポイント", "", ""])
+        for i in range(row_count - half):
+            writer.writerow(["", "", "", f"●セールスポイント{i}", "", ""])
+
+def measure(label: str, func: Callable[[str], Dict[str, Any]], path: str) -> Dict[str, Any]:
+    """処理時間とピークメモリを計測"""
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"  {label:<12} {elapsed:8.3f}秒  ピークメモリ {peak / 1024 / 1024:8.1f}MB")
+    return result
+
+def main():
+    """メイン処理"""
+
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'spec_export.csv')
+        write_spec_export(path, row_count)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+
+        print(f"📊 規定書CSV解析ベンチマーク: {row_count:,}行 ({size_mb:.1f}MB)")
+        legacy = measure('旧実装', legacy_parse_kishima_csv, path)
+        streaming = measure('1パス版', streaming_parse_kishima_csv, path)
+
+    if legacy != streaming:
+        print("❌ 解析結果が一致しません")
+        sys.exit(1)
+    print("✅ 解析結果一致")
+
+if __name__ == "__main__":
+    main()
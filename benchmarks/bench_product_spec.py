@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+商品データ（従来の辞書 / ProductSpec）のメモリ使用量と参照速度のベンチマーク
+
+使用方法:
+  python benchmarks/bench_product_spec.py [件数]
+"""
+
+import os
+import sys
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from product_spec import JAN_KEY, ProductSpec
+
+def make_items(index: int) -> List[tuple]:
+    """1商品分の (規定書のキー, 値) を生成"""
+    return [
+        ('商品名', f'PowerArQ Electric Blanket {index}'),
+        ('商品名カナ', f'パワーアーク エレクトリック ブランケット {index}'),
+        ('メーカー型番', f'EB{index:06d}'),
+        (JAN_KEY, f'ブラック：4571427{index:06d}\nベージュ：4571428{index:06d}'),
+        ('商品サイズ(cm)', '約188×130cm'),
+        ('1個 重量(kg)', '約1.1kg'),
+        ('定格', 'DC12V 60W'),
+        ('表面素材', 'ポリエステル100%'),
+        ('発売日', '2024/10/01'),
+        ('セールスポイント', ['洗える', 'USB給電', 'タイマー付き']),
+    ]
+
+def measure_memory(label: str, build: Callable[[List[tuple]], Any], count: int) -> List[Any]:
+    """count 件分のレコードを保持したときの確保メモリを計測"""
+    
+    items = [make_items(i) for i in range(count)]
+    gc.collect()
+    tracemalloc.start()
+    records = [build(item) for item in items]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<12} {current / 1024 / 1024:8.2f}MB  {current / count:7.0f}バイト/件")
+    return records
+
+def measure_access(label: str, read: Callable[[Any], Any], records: List[Any]):
+    """全レコードの主要項目を読む時間を計測（GCを止めたベストオブ5）"""
+    
+    best = None
+    gc.disable()
+    try:
+        for _ in range(5):
+            start = time.perf_counter()
+            for record in records:
+                read(record)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    print(f"  {label:<12} {best:8.3f}秒  {len(records) / best / 1e6:6.2f}M件/秒")
+
+def read_dict(record: dict):
+    return (record.get('商品名', ''), record.get('メーカー型番', ''), record.get(JAN_KEY, ''),
+            record.get('定格', ''), record.get('セールスポイント', []))
+
+def read_spec(record: ProductSpec):
+    return (record.name or '', record.model_number or '', record.jan_info or '',
+            record.power or '', record.sales_points or [])
+
+def main():
+    """メイン処理"""
+    
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    
+    print(f"📊 商品データベンチマーク: {count:,}件")
+    print("メモリ（値の文字列を含まない、レコード本体のみ）")
+    dicts = measure_memory('辞書', dict, count)
+    specs = measure_memory('ProductSpec', ProductSpec.from_items, count)
+    
+    print("主要項目の参照")
+    measure_access('辞書', read_dict, dicts)
+    measure_access('ProductSpec', read_spec, specs)
+    
+    if any(spec.to_dict() != record for spec, record in zip(specs, dicts)):
+        print("❌ 変換結果が一致しません")
+        sys.exit(1)
+    print("✅ 変換結果一致")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+セールスポイントの特徴フラグ判定（キーワードごとの any() 走査 / FeatureMatcher の1回走査）のベンチマーク
+
+使用方法:
+  python benchmarks/bench_sales_point_flags.py [商品数]
+"""
+
+import os
+import sys
+import gc
+import time
+import random
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sales_point_features import FeatureMatcher
+
+FLAGS = {
+    'camp': 'キャンプ',
+    'ten_levels': '10段階',
+    'overheat': '過熱保護',
+    'washable': '丸洗い',
+    'controller': 'コントローラー',
+    'timer': 'タイマー',
+    'usb': 'USB給電',
+    'outdoor': 'アウトドア',
+    'compact': 'コンパクト',
+    'lightweight': '軽量',
+    'waterproof': '防水',
+    'warranty': '保証',
+}
+
+PHRASES = [
+    '●10段階の温度調節で好みの暖かさに',
+    '●過熱保護システム搭載で安心',
+    '●カバーは取り外して丸洗いOK',
+    '●キャンプやアウトドアでも使える',
+    '●手元のコントローラーで簡単操作',
+    '●寝る前に便利なタイマー機能',
+    '●ソフトな肌触りのフランネル素材',
+    '●インテリアになじむカラーデザイン',
+    '●収納袋付きで持ち運びやすい',
+    '●メーカー1年保証付き',
+]
+
+def make_sales_points(rng: random.Random) -> List[str]:
+    """1商品分のセールスポイント（8〜12件）を生成"""
+    return [rng.choice(PHRASES) for _ in range(rng.randint(8, 12))]
+
+def scan_each(sales_points: List[str]) -> Dict[str, bool]:
+    """従来の方式: フラグごとに全セールスポイントを走査"""
+    return {
+        flag: any(keyword in point for point in sales_points)
+        for flag, keyword in FLAGS.items()
+    }
+
+def measure(label: str, flags: Callable[[List[str]], Any], products: List[List[str]]) -> List[Any]:
+    """全商品のフラグ判定の時間を計測（GCを止めたベストオブ5）"""
+    
+    best = None
+    gc.disable()
+    try:
+        for _ in range(5):
+            start = time.perf_counter()
+            results = [flags(sales_points) for sales_points in products]
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    print(f"  {label:<16} {best:8.3f}秒  {len(products) / best / 1e3:8.1f}千件/秒")
+    return results
+
+def main():
+    """メイン処理"""
+    
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rng = random.Random(0)
+    products = [make_sales_points(rng) for _ in range(count)]
+    matcher = FeatureMatcher(FLAGS.items())
+    
+    print(f"📊 セールスポイントのフラグ判定: {count:,}商品 / キーワード {len(FLAGS)}個")
+    expected = measure('any() × フラグ数', scan_each, products)
+    actual = measure('FeatureMatcher', lambda points: matcher.flag_dict(matcher.flags(points)), products)
+    
+    if expected != actual:
+        print("❌ 判定結果が一致しません")
+        sys.exit(1)
+    print("✅ 判定結果一致")
+
+if __name__ == "__main__":
+    main()
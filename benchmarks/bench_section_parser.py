@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+セクション形式パーサーのベンチマーク（旧: csv_to_json_simple の状態機械 / 新: section_parser の表駆動版）
+
+使用方法:
+  python benchmarks/bench_section_parser.py [行数]
+"""
+
+import os
+import sys
+import gc
+import csv
+import time
+import tempfile
+from typing import Dict, Any, Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from section_parser import parse_section_rows
+
+def legacy_parse_section_rows(rows: List[List[str]]) -> Dict[str, Any]:
+    """比較用: 変更前の csv_to_json_simple.parse_csv_to_json の行処理"""
+    
+    product_data = {}
+    sku_list = []
+    lp_structure = []
+    page_details = []
+    
+    current_section = "basic"
+    page_data = {}
+    
+    for row in rows:
+        if not row or not row[0]:
+            continue
+        
+        if "====" in str(row[0]):
+            if "SKU" in row[0]:
+                current_section = "sku"
+                continue
+            elif "LP構成" in row[0]:
+                current_section = "structure"
+                continue
+            elif "各ページ詳細" in row[0]:
+                current_section = "page_details"
+                continue
+            elif "その他" in row[0]:
+                current_section = "other"
+                continue
+        
+        if current_section == "basic":
+            if row[0] and row[0] != "項目名":
+                product_data[row[0]] = row[1] if len(row) > 1 else ""
+        elif current_section == "sku":
+            if row[0] and row[0] != "sku_type":
+                if len(row) >= 3:
+                    sku_list.append({'type': row[0], 'sku': row[1], 'jan': row[2]})
+        elif current_section == "structure":
+            if row[0] and row[0].startswith("page_"):
+                lp_structure.append(row[1] if len(row) > 1 else "")
+        elif current_section == "page_details":
+            if row[0] and row[0].startswith("page_"):
+                key = row[0]
+                value = row[1] if len(row) > 1 else ""
+                parts = key.split("_")
+                if len(parts) >= 2:
+                    try:
+                        page_num = int(parts[1])
+                        if page_num not in page_data:
+                            page_data[page_num] = {}
+                        if "_text" in key:
+                            page_data[page_num]['text'] = value.replace('\\n', '\n')
+                        elif "_layout_note" in key:
+                            page_data[page_num]['layout_note'] = value
+                        elif "_image_" in key:
+                            if 'images' not in page_data[page_num]:
+                                page_data[page_num]['images'] = []
+                            if value:
+                                page_data[page_num]['images'].append(value)
+                    except ValueError:
+                        pass
+        elif current_section == "other":
+            if row[0] and len(row) > 1:
+                product_data[row[0]] = row[1].replace('\\n', '\n')
+    
+    for page_num in sorted(page_data.keys()):
+        page_info = page_data[page_num]
+        if not page_info.get('images'):
+            page_info['has_images'] = True
+        page_details.append(page_info)
+    
+    if sku_list:
+        product_data['sku_list'] = sku_list
+    if lp_structure:
+        product_data['lp_structure'] = lp_structure
+    if page_details:
+        product_data['page_details'] = page_details
+    
+    return product_data
+
+def legacy_parse_excel_rows(rows: List[tuple]) -> Dict[str, Any]:
+    """比較用: 変更前の excel_to_lp_generator の行処理（セルごとに str() を呼ぶ版）"""
+    
+    product_data = {}
+    sku_list = []
+    lp_structure = []
+    page_details = []
+    
+    # セクションごとに処理
+    current_section = "basic"
+    page_data = {}
+    
+    # 全行を読み取り
+    for row in rows:
+        if not row or not row[0]:  # 空行
+            continue
+        
+        # セクション判定
+        if str(row[0]).find("====") != -1:
+            if "SKU" in str(row[0]):
+                current_section = "sku"
+                continue
+            elif "LP構成" in str(row[0]):
+                current_section = "structure"
+                continue
+            elif "各ページ詳細" in str(row[0]):
+                current_section = "page_details"
+                continue
+            elif "その他" in str(row[0]):
+                current_section = "other"
+                continue
+        
+        # 基本情報
+        if current_section == "basic":
+            if row[0] and str(row[0]) != "項目名":
+                product_data[str(row[0])] = str(row[1]) if len(row) > 1 and row[1] else ""
+        
+        # SKU情報
+        elif current_section == "sku":
+            if row[0] and str(row[0]) != "sku_type":
+                if len(row) >= 3 and row[0] and row[1] and row[2]:
+                    sku_list.append({
+                        'type': str(row[0]),
+                        'sku': str(row[1]),
+                        'jan': str(row[2])
+                    })
+        
+        # LP構成
+        elif current_section == "structure":
+            if row[0] and str(row[0]).startswith("page_"):
+                lp_structure.append(str(row[1]) if len(row) > 1 and row[1] else "")
+        
+        # ページ詳細
+        elif current_section == "page_details":
+            if row[0] and str(row[0]).startswith("page_"):
+                key = str(row[0])
+                value = str(row[1]) if len(row) > 1 and row[1] else ""
+                
+                # ページ番号を取得
+                parts = key.split("_")
+                if len(parts) >= 2:
+                    try:
+                        page_num = int(parts[1])
+                        
+                        # ページデータを初期化
+                        if page_num not in page_data:
+                            page_data[page_num] = {}
+                        
+                        # データタイプを判定
+                        if "_text" in key:
+                            page_data[page_num]['text'] = value.replace('\\n', '\n')
+                        elif "_layout_note" in key:
+                            page_data[page_num]['layout_note'] = value
+                        elif "_image_" in key:
+                            if 'images' not in page_data[page_num]:
+                                page_data[page_num]['images'] = []
+                            if value:  # 画像URLがある場合のみ追加
+                                page_data[page_num]['images'].append(value)
+                    except ValueError:
+                        pass
+        
+        # その他の情報
+        elif current_section == "other":
+            if row[0] and len(row) > 1 and row[1]:
+                product_data[str(row[0])] = str(row[1]).replace('\\n', '\n')
+    
+    # ページ詳細を配列に変換
+    for page_num in sorted(page_data.keys()):
+        page_info = page_data[page_num]
+        if not page_info.get('images'):
+            page_info['has_images'] = True  # 画像準備中フラグ
+        page_details.append(page_info)
+    
+    # 最終的なデータ構造を作成
+    if sku_list:
+        product_data['sku_list'] = sku_list
+    if lp_structure:
+        product_data['lp_structure'] = lp_structure
+    if page_details:
+        product_data['page_details'] = page_details
+    
+    return product_data
+
+
+def write_section_file(path: str, row_count: int):
+    """各セクションに行を振り分けた大きなセクション形式CSVを生成"""
+    
+    quarter = row_count // 4
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["項目名", "値", "説明"])
+        for i in range(quarter):
+            writer.writerow([f"field_{i}", f"値{i}", ""])
+        
+        writer.writerow(["==== SKU情報 ====", "", ""])
+        writer.writerow(["sku_type", "sku", "jan"])
+        for i in range(quarter):
+            writer.writerow([f"カラー{i}", f"SKU{i:07d}", f"4571427{i:06d}"])
+        
+        writer.writerow(["==== LP構成 ====", "", ""])
+        for i in range(quarter):
+            writer.writerow([f"page_{i + 1}", f"構成{i}", ""])
+        
+        writer.writerow(["==== 各ページ詳細 ====", "", ""])
+        for i in range(row_count - quarter * 3):
+            page_num = i // 3 + 1
+            field = ("text", "layout_note", "image_1")[i % 3]
+            writer.writerow([f"page_{page_num}_{field}", f"内容{i}\\n2行目", ""])
+
+def measure(label: str, func: Callable[[List[List[str]]], Dict[str, Any]], rows: List[List[str]]) -> Dict[str, Any]:
+    """処理時間とスループットを計測（timeit と同様にGCを止めたベストオブ5）"""
+    
+    best = None
+    gc.disable()
+    try:
+        for _ in range(5):
+            start = time.perf_counter()
+            result = func(rows)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    
+    print(f"  {label:<12} {best:8.3f}秒  {len(rows) / best / 1e6:6.2f}M行/秒")
+    return result
+
+def main():
+    """メイン処理"""
+    
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'sections.csv')
+        write_section_file(path, row_count)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        
+        # CSV読み込みのコストを除いてパーサー本体だけを比較する
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        
+        print(f"📊 セクションパーサーベンチマーク: {len(rows):,}行 ({size_mb:.1f}MB)")
+        print("CSV形式（全セル文字列）")
+        legacy = measure('旧実装', legacy_parse_section_rows, rows)
+        table_driven = measure('表駆動版', parse_section_rows, rows)
+        
+        start = time.perf_counter()
+        with open(path, 'r', encoding='utf-8') as f:
+            parse_section_rows(csv.reader(f))
+        elapsed = time.perf_counter() - start
+        print(f"  {'CSV込み':<12} {elapsed:8.3f}秒  {len(rows) / elapsed / 1e6:6.2f}M行/秒")
+        
+        # Excel（values_only）と同じく空セルは None、JANは数値の行
+        excel_rows = [
+            tuple(int(cell) if cell.isdigit() else (cell or None) for cell in row)
+            for row in rows
+        ]
+        del rows
+        print("Excel形式（None・数値セルを含む）")
+        legacy_excel = measure('旧実装', legacy_parse_excel_rows, excel_rows)
+        table_driven_excel = measure('表駆動版', parse_section_rows, excel_rows)
+    
+    if legacy != table_driven or legacy_excel != table_driven_excel:
+        print("❌ 解析結果が一致しません")
+        sys.exit(1)
+    print("✅ 解析結果一致")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+商品カタログ表（Parquet / Arrow / CSV）からLPラフ案を一括生成するスクリプト
+表を列単位のバッチで読み、商品データを1件ずつ遅延生成します（カタログ全体を辞書として保持しない）
+"""
+
+import os
+import sys
+import csv
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Any, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from input_router import INPUT_TYPE_ARROW, INPUT_TYPE_PARQUET, detect_catalog_magic, open_text
+from jan_index import STATUS_CONFLICT, STATUS_NEW, JanIndex, product_identity
+from product_spec import JAN_KEY, ProductSpec
+from record_validator import print_problems, validate_batch
+from variant_extractor import extract_variants_column
+
+CATALOG_FORMAT_PARQUET = INPUT_TYPE_PARQUET
+CATALOG_FORMAT_ARROW = INPUT_TYPE_ARROW
+CATALOG_FORMAT_CSV = 'csv'
+
+TARGET_CORRECT = 'correct'  # CorrectLPGenerator.generate_correct_lp_rough 用（規定書の日本語キー）
+TARGET_ROUGH = 'rough'      # LPRoughGenerator.generate_lp_rough 用（英語キー）
+
+DEFAULT_BATCH_SIZE = 1024
+
+# 出力先の商品データキー → カタログ列名の候補（先に見つかった列を使う）
+CATALOG_COLUMNS = {
+    TARGET_CORRECT: {
+        '商品名': ('商品名', 'product_name'),
+        '商品名カナ': ('商品名カナ', 'product_kana'),
+        'メーカー型番': ('メーカー型番', 'model_number'),
+        JAN_KEY: (JAN_KEY, 'JANコード', 'jan'),
+        '商品サイズ(cm)': ('商品サイズ(cm)', 'size'),
+        '1個 重量(kg)': ('1個 重量(kg)', 'weight'),
+        '定格': ('定格', 'power_rating'),
+        '表面素材': ('表面素材', 'material'),
+        '発売日': ('発売日', 'release_date'),
+        'セールスポイント': ('セールスポイント', 'sales_points'),
+    },
+    TARGET_ROUGH: {
+        'product_name': ('product_name', '商品名'),
+        'purpose': ('purpose',),
+        'target_platform': ('target_platform',),
+        'catch_copy': ('catch_copy',),
+        'main_features': ('main_features',),
+        'tonmana_url': ('tonmana_url',),
+        'base_data_url': ('base_data_url',),
+        'achievements': ('achievements',),
+        'brand_value': ('brand_value',),
+        'use_scenes': ('use_scenes',),
+        'specs': ('specs',),
+        'accessories': ('accessories',),
+        'warranty': ('warranty',),
+        'faq': ('faq',),
+        'lp_structure': ('lp_structure',),
+        'sku': ('sku', 'メーカー型番'),
+        'jan': ('jan', 'JANコード'),
+    },
+}
+
+# 改行区切りのセルをリストとして扱うキー（行頭の「●」「•」は除去）
+LIST_KEYS = ('セールスポイント', 'lp_structure')
+
+def detect_catalog_format(catalog_path: str) -> str:
+    """ファイル先頭のマジックバイトからカタログ形式を判定"""
+    with open(catalog_path, 'rb') as f:
+        head = f.read(8)
+    return detect_catalog_magic(head) or CATALOG_FORMAT_CSV
+
+def _import_pyarrow():
+    """pyarrow を必要になった時だけ読み込む（CSVカタログだけなら不要）"""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        raise ImportError("Parquet/Arrowカタログの読み込みには pyarrow が必要です: pip install pyarrow")
+
+def _open_arrow_batches(catalog_path: str):
+    """Arrow IPCファイル（ランダムアクセス形式/ストリーム形式）の (スキーマ, バッチイテレータ) を返す"""
+    pyarrow = _import_pyarrow()
+    source = pyarrow.memory_map(catalog_path, 'r')
+    try:
+        reader = pyarrow.ipc.open_file(source)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    except pyarrow.ArrowInvalid:
+        reader = pyarrow.ipc.open_stream(source)
+        batches = iter(reader)
+    return reader.schema.names, batches
+
+def read_catalog_columns(catalog_path: str) -> List[str]:
+    """カタログの列名一覧を取得（データ本体は読まない）"""
+    
+    catalog_format = detect_catalog_format(catalog_path)
+    if catalog_format == CATALOG_FORMAT_PARQUET:
+        pyarrow = _import_pyarrow()
+        return pyarrow.parquet.ParquetFile(catalog_path).schema_arrow.names
+    if catalog_format == CATALOG_FORMAT_ARROW:
+        column_names, _ = _open_arrow_batches(catalog_path)
+        return column_names
+    
+    with open_text(catalog_path, newline='') as f:
+        return next(csv.reader(f), [])
+
+def resolve_columns(column_names: Sequence[str], target: str = TARGET_CORRECT) -> Dict[str, str]:
+    """出力キー → 使用するカタログ列名 の対応を決定"""
+    
+    available = set(column_names)
+    mapping = {}
+    for key, candidates in CATALOG_COLUMNS[target].items():
+        for candidate in candidates:
+            if candidate in available:
+                mapping[key] = candidate
+                break
+    return mapping
+
+def iter_column_batches(catalog_path: str, columns: List[str],
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Dict[str, list]]:
+    """指定列だけを列単位のバッチ（列名 → 値リスト）で読み出す"""
+    
+    catalog_format = detect_catalog_format(catalog_path)
+    
+    if catalog_format == CATALOG_FORMAT_PARQUET:
+        pyarrow = _import_pyarrow()
+        parquet_file = pyarrow.parquet.ParquetFile(catalog_path)
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+            yield {name: batch.column(name).to_pylist() for name in columns}
+    
+    elif catalog_format == CATALOG_FORMAT_ARROW:
+        _, batches = _open_arrow_batches(catalog_path)
+        for batch in batches:
+            # IPCのバッチは書き出し時のサイズなので batch_size ごとに切り出す
+            for offset in range(0, batch.num_rows, batch_size):
+                chunk = batch.slice(offset, batch_size)
+                yield {name: chunk.column(name).to_pylist() for name in columns}
+    
+    else:
+        with open_text(catalog_path, newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            indices = [header.index(name) for name in columns]
+            
+            while True:
+                values = [[] for _ in columns]
+                for row in reader:
+                    for column_values, index in zip(values, indices):
+                        column_values.append(row[index] if index < len(row) else None)
+                    if len(values[0]) >= batch_size:
+                        break
+                if not values or not values[0]:
+                    return
+                yield dict(zip(columns, values))
+
+def _to_text(value: Any) -> str:
+    """セル値を文字列に変換（欠損は空文字）"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def _to_list(value: Any) -> List[str]:
+    """改行区切りのセル（またはリスト型の列）を項目リストに変換"""
+    if value is None:
+        return []
+    items = value if isinstance(value, list) else str(value).splitlines()
+    return [item for item in (str(item).strip().lstrip('●•').strip() for item in items) if item]
+
+def _build_record(target: str, keys: Sequence[str], values: Sequence[Any],
+                  variants: Optional[List[Dict[str, Any]]] = None) -> Mapping[str, Any]:
+    """1商品分の値から出力先の商品データを組み立てる（規定書形式は ProductSpec）"""
+    
+    if target == TARGET_CORRECT:
+        return ProductSpec.from_items(
+            (key, _to_list(value) if key in LIST_KEYS else _to_text(value))
+            for key, value in zip(keys, values)
+        )
+    
+    record = {}
+    for key, value in zip(keys, values):
+        record[key] = _to_list(value) if key in LIST_KEYS else _to_text(value)
+    
+    if target == TARGET_ROUGH:
+        # JAN列が「色名：JAN」の並びなら色ごとのSKU、それ以外は1バリエーションとして扱う
+        sku = record.pop('sku', '')
+        jan = record.pop('jan', '')
+        if variants:
+            record['sku_list'] = [
+                {'type': variant['color'], 'sku': f"{sku}-{variant['color']}" if sku else '', 'jan': variant['jan']}
+                for variant in variants
+            ]
+        elif sku or jan:
+            record['sku_list'] = [{'type': '', 'sku': sku, 'jan': jan}]
+        
+        product_name = record.get('product_name', '')
+        if not record.get('purpose'):
+            record['purpose'] = f'{product_name}の販売促進とブランド認知向上'
+        if not record.get('target_platform'):
+            record['target_platform'] = 'ECサイト'
+    
+    return record
+
+def iter_catalog_products(catalog_path: str, target: str = TARGET_CORRECT,
+                          batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Mapping[str, Any]]:
+    """カタログ表から商品データを1件ずつ遅延生成（同時に保持するのは1バッチ分の列だけ）"""
+    
+    if target not in CATALOG_COLUMNS:
+        raise ValueError(f"未対応の出力形式: {target}")
+    
+    mapping = resolve_columns(read_catalog_columns(catalog_path), target)
+    if not mapping:
+        raise ValueError(f"カタログに使用できる列がありません: {catalog_path}")
+    
+    keys = list(mapping)
+    columns = list(dict.fromkeys(mapping.values()))
+    
+    for batch in iter_column_batches(catalog_path, columns, batch_size):
+        column_values = [batch[mapping[key]] for key in keys]
+        if target == TARGET_ROUGH and 'jan' in mapping:
+            # JAN列はバッチ単位でまとめて抽出
+            for values, variants in zip(zip(*column_values), extract_variants_column(batch[mapping['jan']])):
+                yield _build_record(target, keys, values, variants)
+        else:
+            for values in zip(*column_values):
+                yield _build_record(target, keys, values)
+
+def generate_from_catalog(catalog_path: str, target: str = TARGET_CORRECT,
+                          batch_size: int = DEFAULT_BATCH_SIZE, limit: Optional[int] = None,
+                          output_dir: Optional[str] = None,
+                          jan_index: Optional[JanIndex] = None) -> Tuple[str, int, int, int]:
+    """カタログの全商品のLPラフ案を生成して保存し、(出力ディレクトリ, 成功件数, 失敗件数, スキップ件数) を返す
+    
+    jan_index を渡すと、生成済み・重複の商品はスキップし、JAN・SKUが別の商品と衝突する商品は失敗として扱う。
+    """
+    
+    if target == TARGET_CORRECT:
+        from correct_lp_generator import CorrectLPGenerator
+        render = CorrectLPGenerator().generate_correct_lp_rough
+        name_key = '商品名'
+    else:
+        from lp_rough_generator import LPRoughGenerator
+        render = LPRoughGenerator().generate_lp_rough
+        name_key = 'product_name'
+    
+    if not output_dir:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_dir = os.path.join('output', f'catalog_{timestamp}')
+    os.makedirs(output_dir, exist_ok=True)
+    
+    products = iter_catalog_products(catalog_path, target, batch_size)
+    if limit:
+        products = islice(products, limit)
+    
+    success_count = 0
+    error_count = 0
+    skipped_count = 0
+    index = 1
+    while True:
+        batch = list(islice(products, batch_size))
+        if not batch:
+            break
+        
+        # 取り込み直後にバッチ単位で検証し、問題のある商品は生成前に除外
+        valid, problems = validate_batch(batch, target, start=index)
+        index += len(batch)
+        if problems:
+            error_count += len(problems)
+            print_problems(problems)
+        
+        for product_index, product_data in valid:
+            product_name = product_data.get(name_key) or '商品名'
+            
+            if jan_index is not None:
+                identity = product_identity(product_data)
+                status, details = jan_index.claim(identity, catalog_path)
+                if status == STATUS_CONFLICT:
+                    error_count += 1
+                    print(f"❌ [{product_index}] {product_name}: {' / '.join(details)}")
+                    continue
+                if status != STATUS_NEW:
+                    skipped_count += 1
+                    continue
+            
+            try:
+                lp_content = render(product_data)
+            except Exception as e:
+                error_count += 1
+                print(f"❌ [{product_index}] {product_name}: {e}")
+                continue
+            
+            safe_name = product_name.replace(' ', '_').replace('/', '_')
+            output_path = os.path.join(output_dir, f"lp_rough_{target}_{product_index:05d}_{safe_name}.md")
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(lp_content)
+            success_count += 1
+            if jan_index is not None:
+                jan_index.mark_generated(identity['key'], output_path)
+    
+    if jan_index is not None:
+        jan_index.save()
+    
+    return output_dir, success_count, error_count, skipped_count
+
+def main():
+    """メイン処理"""
+    
+    if len(sys.argv) < 2:
+        print("使用方法:")
+        print("  python catalog_ingest.py <カタログ(.parquet/.arrow/.csv)> [オプション]")
+        print("\nオプション:")
+        print("  --target <形式>      correct（規定書形式、デフォルト）| rough（LPラフ形式）")
+        print("  --batch-size <数>    1回に読み込む行数（デフォルト: 1024）")
+        print("  --limit <数>         先頭から指定件数だけ生成")
+        print("  --columns            列の対応だけを表示して終了")
+        print("  --skip-generated     JAN/SKU索引で生成済み・重複の商品をスキップ")
+        print("\n例:")
+        print("  python catalog_ingest.py data/catalog.parquet")
+        print("  python catalog_ingest.py data/catalog.csv --target rough --limit 100")
+        sys.exit(1)
+    
+    catalog_path = sys.argv[1]
+    
+    target = TARGET_CORRECT
+    if '--target' in sys.argv:
+        target_index = sys.argv.index('--target')
+        if target_index + 1 < len(sys.argv):
+            target = sys.argv[target_index + 1]
+    if target not in CATALOG_COLUMNS:
+        print(f"❌ --target には {' / '.join(CATALOG_COLUMNS)} を指定してください")
+        sys.exit(1)
+    
+    options = {}
+    for flag, name in (('--batch-size', 'batch_size'), ('--limit', 'limit')):
+        if flag in sys.argv:
+            flag_index = sys.argv.index(flag)
+            try:
+                options[name] = int(sys.argv[flag_index + 1])
+            except (IndexError, ValueError):
+                print(f"❌ {flag} には整数を指定してください")
+                sys.exit(1)
+    if options.get('batch_size', 1) < 1:
+        print(f"❌ --batch-size には1以上の整数を指定してください: {options['batch_size']}")
+        sys.exit(1)
+    
+    if not os.path.exists(catalog_path):
+        print(f"❌ カタログファイルが見つかりません: {catalog_path}")
+        sys.exit(1)
+    
+    try:
+        catalog_format = detect_catalog_format(catalog_path)
+        mapping = resolve_columns(read_catalog_columns(catalog_path), target)
+        print(f"\n📚 カタログ読み込み: {catalog_path}（{catalog_format}）")
+        for key, column in mapping.items():
+            print(f"  {key!r} ← {column!r}")
+        
+        if '--columns' in sys.argv:
+            return
+        
+        if '--skip-generated' in sys.argv:
+            options['jan_index'] = JanIndex()
+        output_dir, success_count, error_count, skipped_count = generate_from_catalog(catalog_path, target, **options)
+        
+        print(f"\n🎉 処理完了！")
+        print(f"✅ 成功: {success_count}件 / ❌ 失敗: {error_count}件")
+        if skipped_count:
+            print(f"⏭️ スキップ（生成済み・重複）: {skipped_count}件")
+        print(f"📁 出力ディレクトリ: {output_dir}")
+        
+        if error_count:
+            sys.exit(1)
+    
+    except Exception as e:
+        print(f"❌ エラーが発生しました: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -4,14 +4,15 @@
 競合分析・他社事例参照システム
 """
 
-import os
 import re
 import json
 import requests
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List
 from datetime import datetime
 from urllib.parse import urljoin, urlparse
 
+from render_sink import stream_to
+
 class CompetitorAnalyzer:
     def __init__(self):
         """初期化"""
@@ -280,6 +281,10 @@ class CompetitorAnalyzer:
     
     def generate_enhanced_lp_with_analysis(self, product_data: Dict, competitor_analysis: Dict) -> str:
         """競合分析を反映した強化LPラフ案生成"""
+        return ''.join(self.iter_enhanced_lp_with_analysis(product_data, competitor_analysis))
+    
+    def iter_enhanced_lp_with_analysis(self, product_data: Dict, competitor_analysis: Dict) -> Iterator[str]:
+        """競合分析を反映した強化LPラフ案を断片ごとに生成"""
         
         optimized_appeals = competitor_analysis.get('optimized_appeals', [])
         recommendations = competitor_analysis.get('recommendations', {})
@@ -289,20 +294,24 @@ class CompetitorAnalyzer:
         product_name = product_data.get('商品名', '')
         
         # 競合分析を反映したLPラフ案
-        enhanced_lp = f"""# LPラフ（競合分析強化版）
+        yield f"""# LPラフ（競合分析強化版）
 
 ## 📊 競合分析サマリー
 - 分析商品数: {competitor_analysis.get('competitor_count', 0)}商品
 - 市場平均価格: {best_practices.get('price_range', {}).get('avg', 0):,}円
 - 成功パターン: {len(best_practices.get('success_features', []))}の共通特徴を確認
 
-## 作成の目的、意図
+"""
+        
+        yield f"""## 作成の目的、意図
 {product_data.get('purpose', '販売促進のため')}
 
 **💡 競合分析による改善点:**
 {chr(10).join([f'• {rec}' for rec in recommendations.get('copy_improvements', [])[:3]])}
 
-## 対象商品
+"""
+        
+        yield f"""## 対象商品
 ### 商品名
 {product_name}
 
@@ -318,12 +327,12 @@ class CompetitorAnalyzer:
         sku_list = product_data.get('sku_list', [])
         if sku_list:
             for sku in sku_list:
-                enhanced_lp += f"| {sku.get('type', '')} | {sku.get('sku', '')} | {sku.get('jan', '')} |\n"
+                yield f"| {sku.get('type', '')} | {sku.get('sku', '')} | {sku.get('jan', '')} |\n"
         else:
-            enhanced_lp += "| カラー・サイズ | SKUコード | JANコード |\n"
+            yield "| カラー・サイズ | SKUコード | JANコード |\n"
         
         # 競合分析を反映したLP構成
-        enhanced_lp += f"""
+        yield """
 ## 基本情報
 ### バナースペック
 | 項目 | 内容 |
@@ -340,7 +349,9 @@ class CompetitorAnalyzer:
 ---
 # LP構成（競合分析最適化版）
 
-## 📈 成功パターンに基づく構成
+"""
+        
+        yield f"""## 📈 成功パターンに基づく構成
 {chr(10).join([f'• {pattern[0]} (競合{pattern[1]}社で使用)' for pattern in best_practices.get('effective_structures', [])[:5]])}
 
 | 枚数 | コンテンツ概要 | 競合分析ポイント |
@@ -359,7 +370,9 @@ class CompetitorAnalyzer:
 ---
 # ラフ詳細（競合分析強化版）
 
-## 1枚目 - TOPキャッチ（最適化版）
+"""
+        
+        yield f"""## 1枚目 - TOPキャッチ（最適化版）
 
 ### レイアウト案
 【画像準備中】
@@ -378,7 +391,9 @@ class CompetitorAnalyzer:
 ### 使用画像
 【画像準備中】
 
-## 2枚目 - 実績訴求（競合対抗版）
+"""
+        
+        yield f"""## 2枚目 - 実績訴求（競合対抗版）
 
 ### レイアウト案
 【画像準備中】
@@ -394,7 +409,9 @@ PowerARQブランドの実績
 
 💡 **競合優位点**: 一般家電メーカーにない「アウトドア専用設計」
 
-## 3枚目 - 差別化・ブランド価値
+"""
+        
+        yield """## 3枚目 - 差別化・ブランド価値
 
 ### レイアウト案
 【画像準備中】
@@ -413,7 +430,9 @@ PowerARQ製品との組み合わせで、どこでも快適な温もり環境を
 ### 使用画像
 【画像準備中】
 
-## 4枚目 - メイン機能1（10段階温度調節）
+"""
+        
+        yield f"""## 4枚目 - メイン機能1（10段階温度調節）
 
 ### レイアウ案
 【画像準備中】
@@ -433,7 +452,9 @@ PowerARQ製品との組み合わせで、どこでも快適な温もり環境を
 ### 使用画像
 【画像準備中】
 
-## 5枚目 - メイン機能2（安全性・過熱保護）
+"""
+        
+        yield """## 5枚目 - メイン機能2（安全性・過熱保護）
 
 ### レイアウト案
 【画像準備中】
@@ -454,7 +475,9 @@ PowerARQ製品との組み合わせで、どこでも快適な温もり環境を
 ### 使用画像
 【画像準備中】
 
-## 6枚目 - 使用シーン（アウトドア特化）
+"""
+        
+        yield """## 6枚目 - 使用シーン（アウトドア特化）
 
 ### レイアウト案
 【画像準備中】
@@ -475,7 +498,9 @@ PowerARQ製品との組み合わせで、どこでも快適な温もり環境を
 ### 使用画像
 【画像準備中】
 
-## 7枚目 - スペック詳細（競合比較）
+"""
+        
+        yield """## 7枚目 - スペック詳細（競合比較）
 
 ### レイアウト案
 【画像準備中】
@@ -496,7 +521,9 @@ PowerARQ製品との組み合わせで、どこでも快適な温もり環境を
 ### 使用画像
 【画像準備中】
 
-## 8枚目 - 付属品・同梱物
+"""
+        
+        yield """## 8枚目 - 付属品・同梱物
 
 ### レイアウト案
 【画像準備中】
@@ -518,7 +545,9 @@ PowerARQ製品との組み合わせで、どこでも快適な温もり環境を
 ### 使用画像
 【画像準備中】
 
-## 9枚目 - 保証・アフターサービス
+"""
+        
+        yield """## 9枚目 - 保証・アフターサービス
 
 ### レイアウト案
 【画像準備中】
@@ -542,7 +571,9 @@ Email: support@powerarq.jp
 ### 使用画像
 【画像準備中】
 
-## 10枚目 - よくある質問・購入決定
+"""
+        
+        yield """## 10枚目 - よくある質問・購入決定
 
 ### レイアウト案
 【画像準備中】
@@ -570,11 +601,13 @@ A4: アウトドア特化設計と品質へのこだわりによる適正価格
 ### 使用画像
 【画像準備中】
 
-## 競合分析データ
+"""
+        
+        yield """## 競合分析データ
 """
         
         # 競合分析の詳細データも追加
-        enhanced_lp += f"""
+        yield f"""
 ### 📊 市場分析データ
 - **価格競争力**: 市場平均{best_practices.get('price_range', {}).get('avg', 0):,}円に対する位置づけ
 - **機能優位性**: {len(best_practices.get('success_features', []))}項目で競合優位
@@ -588,8 +621,6 @@ A4: アウトドア特化設計と品質へのこだわりによる適正価格
 - アウトドア市場での優位性確立
 - ブランド差別化の明確化
 """
-        
-        return enhanced_lp
 
 def main():
     """メイン処理（テスト用）"""
@@ -608,16 +639,11 @@ def main():
     analyzer = CompetitorAnalyzer()
     analysis = analyzer.analyze_similar_products('PowerArQ Electric Blanket Lite', 'outdoor')
     
-    # 強化LPラフ案生成
-    enhanced_lp = analyzer.generate_enhanced_lp_with_analysis(sample_product, analysis)
-    
-    # 結果保存
+    # 強化LPラフ案を生成しながら保存
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     output_path = f'output/lp_rough_enhanced_{timestamp}.md'
     
-    os.makedirs('output', exist_ok=True)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(enhanced_lp)
+    stream_to(analyzer.iter_enhanced_lp_with_analysis(sample_product, analysis), output_path)
     
     print(f"✅ 競合分析強化LP生成完了: {output_path}")
     
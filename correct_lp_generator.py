@@ -8,326 +8,197 @@ import os
 import sys
 import csv
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+from parse_cache import cached_parser, set_cache_enabled
+from input_router import INPUT_TYPE_KISHIMA_CSV, InputTypeError, open_text, require_input_type
+from product_spec import JAN_KEY, ProductSpec, is_kishima_block_start
+from variant_extractor import extract_variants
+from jan_index import STATUS_CONFLICT, STATUS_LABELS, STATUS_NEW, JanIndex, product_identity
+from input_manifest import InputManifest
+from lp_template import load_layout
+from lp_document import SIDECAR_SUFFIX, changed_nodes, load_sidecar, save_document, sidecar_path, to_markdown
 from docbase_lp_uploader import DocbaseLPUploader
 
-class CorrectLPGenerator:
-    def __init__(self):
-        """初期化"""
-        self.docbase_uploader = DocbaseLPUploader()
+# LPラフ案のレイアウトテンプレート（templates/layouts/<名前>.json）
+DEFAULT_LAYOUT = 'correct_lp_rough'
+
+# 連結規定書から生成するLPラフ案のファイル名の接頭辞
+EXPORT_PREFIX = 'lp_rough_correct_'
+
+def _index_export_outputs(output_dir: str) -> Dict[str, str]:
+    """前回の連結規定書の出力（サイドカー付き）を 商品キー → 出力パス で引けるようにする"""
     
-    def parse_kishima_csv(self, csv_path: str) -> Dict[str, Any]:
-        """加島商事規定書CSVを正確に解析"""
-        
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            rows = list(reader)
-        
-        # データ抽出
-        product_data = {}
-        jan_codes = []
-        
-        for i, row in enumerate(rows):
-            if len(row) >= 6 and row[4] and row[5]:
-                key = row[4].strip()
-                value = row[5].strip()
-                product_data[key] = value
-                
-                # JANコード行の特別処理
-                if "JANコード" in key:
-                    # この行と次の行でJANコード情報を収集
-                    jan_codes.append(value)
-                    # 次の行もチェック
-                    if i + 1 < len(rows) and len(rows[i + 1]) >= 6 and rows[i + 1][5]:
-                        next_jan = rows[i + 1][5].strip()
-                        if next_jan and ('：' in next_jan or ':' in next_jan):
-                            jan_codes.append(next_jan)
+    outputs = {}
+    for entry in sorted(os.scandir(output_dir), key=lambda entry: entry.name):
+        if not (entry.name.startswith(EXPORT_PREFIX) and entry.name.endswith(SIDECAR_SUFFIX)):
+            continue
+        previous = load_sidecar(entry.path)
+        product_key = previous and previous['meta'].get('product_key')
+        if product_key:
+            outputs.setdefault(product_key, entry.path[:-len(SIDECAR_SUFFIX)] + '.md')
+    return outputs
+
+def _finish_kishima_product(product_data: Dict[str, Any], jan_codes: List[str],
+                            sales_points: List[str]) -> Dict[str, Any]:
+    """1商品分の解析結果にJANコード・セールスポイントをまとめる"""
+    
+    # JANコード情報をまとめる
+    if jan_codes:
+        product_data[JAN_KEY] = "\n".join(jan_codes)
+    
+    product_data["セールスポイント"] = sales_points
+    
+    return product_data
+
+def iter_kishima_products(rows: Iterable[List[str]]) -> Iterator[Dict[str, Any]]:
+    """規定書の行イテレータを1パスで解析し、商品データを1件ずつ生成
+    
+    複数の規定書を連結した出力にも対応し、2件目以降の「商品名」行（is_kishima_block_start）から
+    新しい商品として扱う。1商品の中で同じ項目が繰り返された場合は後の値で上書きする。
+    """
+    
+    product_data = {}
+    jan_codes = []
+    sales_points = []
+    
+    # 状態: 商品の先頭行を読んだか / 直前の行がJANコード行か / セールスポイント行以降か
+    in_block = False
+    after_jan_row = False
+    in_sales_points = False
+    
+    for row in rows:
+        # 次の商品の先頭行なら、ここまでを1商品として返す
+        if is_kishima_block_start(row):
+            if in_block:
+                yield _finish_kishima_product(product_data, jan_codes, sales_points)
+                product_data = {}
+                jan_codes = []
+                sales_points = []
+                after_jan_row = False
+                in_sales_points = False
+            in_block = True
         
-        # JANコード情報をまとめる
-        if jan_codes:
-            product_data["JANコード\n（バリエーション別）"] = "\n".join(jan_codes)
+        has_value = len(row) >= 6 and row[5]
         
-        # セールスポイントの特別処理
-        sales_points = []
-        for i, row in enumerate(rows):
-            if len(row) > 3 and row[3] and "セールスポイント" in row[3]:
-                # セールスポイント行以降を取得
-                for j in range(i+1, len(rows)):
-                    if len(rows[j]) > 3 and rows[j][3]:
-                        point_text = rows[j][3].strip()
-                        if point_text.startswith("●"):
-                            sales_points.append(point_text.replace("●", "").strip())
-                break
+        # 直前がJANコード行なら、この行の値をJANコード続き行として扱う
+        if after_jan_row and has_value:
+            next_jan = row[5].strip()
+            if next_jan and ('：' in next_jan or ':' in next_jan):
+                jan_codes.append(next_jan)
+        after_jan_row = False
         
-        product_data["セールスポイント"] = sales_points
+        if has_value and row[4]:
+            key = row[4].strip()
+            value = row[5].strip()
+            product_data[key] = value
+            
+            # JANコード行の特別処理
+            if "JANコード" in key:
+                jan_codes.append(value)
+                after_jan_row = True
         
-        return product_data
+        # セールスポイントの特別処理（最初のセールスポイント行以降の●行を収集）
+        if len(row) > 3 and row[3]:
+            if in_sales_points:
+                point_text = row[3].strip()
+                if point_text.startswith("●"):
+                    sales_points.append(point_text.replace("●", "").strip())
+            elif "セールスポイント" in row[3]:
+                in_sales_points = True
+    
+    if product_data or jan_codes or sales_points:
+        yield _finish_kishima_product(product_data, jan_codes, sales_points)
+
+def parse_kishima_rows(rows: Iterable[List[str]]) -> Dict[str, Any]:
+    """規定書の行イテレータを解析（複数商品を連結した出力では先頭の1商品だけを返す）"""
+    return next(iter_kishima_products(rows), None) or _finish_kishima_product({}, [], [])
+
+@cached_parser('kishima_csv', version=2)
+def parse_kishima_csv(csv_path: str) -> Dict[str, Any]:
+    """加島商事規定書CSVを正確に解析（UTF-8 / CP932 は自動判定）"""
+    
+    with open_text(csv_path) as f:
+        return parse_kishima_rows(csv.reader(f))
+
+def iter_kishima_csv_products(csv_path: str) -> Iterator[Dict[str, Any]]:
+    """複数の規定書を連結したCSVから商品データを1件ずつ生成（ファイルは1回だけ読む）"""
+    
+    with open_text(csv_path) as f:
+        yield from iter_kishima_products(csv.reader(f))
+
+class CorrectLPGenerator:
+    def __init__(self, layout_name: str = DEFAULT_LAYOUT):
+        """初期化（レイアウトテンプレートはここで1回だけコンパイル）"""
+        self.docbase_uploader = DocbaseLPUploader()
+        self.layout = load_layout(layout_name)
+    
+    def parse_kishima_csv(self, csv_path: str) -> Dict[str, Any]:
+        """加島商事規定書CSVを正確に解析"""
+        return parse_kishima_csv(csv_path)
     
     def generate_correct_lp_rough(self, product_data: Dict) -> str:
-        """正しいフォーマットのLPラフ案を生成"""
+        """正しいフォーマットのLPラフ案を生成（product_data は辞書または ProductSpec）
         
-        # 基本情報取得
-        product_name = product_data.get('商品名', 'PowerArQ Electric Blanket Lite')
-        product_kana = product_data.get('商品名カナ', '')
-        model_number = product_data.get('メーカー型番', '')
-        jan_info = product_data.get('JANコード\n（バリエーション別）', '')
-        size = product_data.get('商品サイズ(cm)', '')
-        weight = product_data.get('1個 重量(kg)', '')
-        power = product_data.get('定格', '')
-        material = product_data.get('表面素材', '')
-        release_date = product_data.get('発売日', '')
-        sales_points = product_data.get('セールスポイント', [])
+        ページ構成・文面はレイアウトテンプレート（templates/layouts/correct_lp_rough.json）で定義し、
+        ここでは商品ごとの値とセールスポイントのフラグだけを用意する。
+        """
+        return self.layout.render(self.build_context(product_data))
+    
+    def build_correct_lp_document(self, product_data: Dict, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """LPラフ案を文書ツリーとして生成（to_markdown の結果は generate_correct_lp_rough と同じ）
         
-        # JANコードの解析（複数行対応）
-        jan_colors = []
-        if jan_info:
-            # まず全体のテキストから色とJANを抽出
-            full_text = jan_info.replace('\n', ' ')
-            # ブラックとベージュの情報を個別に処理
-            # 正規表現的な処理でより確実に抽出
-            import re
-            color_patterns = [
-                (r'ブラック[：:]\s*(\d+)', 'ブラック'),
-                (r'ベージュ[：:]\s*(\d+)', 'ベージュ')
-            ]
-            
-            for pattern, color in color_patterns:
-                match = re.search(pattern, full_text)
-                if match:
-                    jan_colors.append({'color': color, 'jan': match.group(1)})
+        previous（前回のサイドカーのツリー）を渡すと、入力が変わっていないページは描画し直さない。
+        """
+        context = self.build_context(product_data)
+        return self.layout.render_document(
+            context,
+            previous,
+            product_name=context['product_name'],
+            model_number=context['model_number'],
+            product_key=product_identity(product_data)['key'],
+            jan_codes=[variant['jan'] for variant in context['variants']],
+            generator='correct_lp_rough',
+        )
+    
+    def build_context(self, product_data: Dict) -> Dict[str, Any]:
+        """レイアウトテンプレートに渡す商品ごとの値とセールスポイントのフラグ"""
         
-        # LPラフ案生成
-        lp_content = f"""# LPラフ
-## 作成の目的、意図
-{product_name}の販売促進とブランド認知向上のため
-
-## 対象商品
-### 商品名
-{product_name}
-{f"（{product_kana}）" if product_kana else ""}
-
-### SKU・JAN
-| 種類 | SKU | JAN |
-| --- | --- | --- |
-"""
+        # 基本情報取得
+        spec = ProductSpec.from_dict(product_data)
+        product_name = spec.name if spec.name is not None else 'PowerArQ Electric Blanket Lite'
+        model_number = spec.model_number or ''
+        sales_points = spec.sales_points or []
         
-        # SKU・JANテーブル
-        if jan_colors:
-            for item in jan_colors:
-                sku = f"{model_number}-{item['color']}" if model_number else f"PAQ-{item['color']}"
-                lp_content += f"| {item['color']} | {sku} | {item['jan']} |\n"
-        else:
-            lp_content += "| カラー・サイズ | SKUコード | JANコード |\n"
+        # JANコードの解析（「色名：JAN」の並び、複数行対応）
+        variants = []
+        for item in extract_variants(spec.jan_info or ''):
+            variants.append({
+                'color': item['color'],
+                'sku': f"{model_number}-{item['color']}" if model_number else f"PAQ-{item['color']}",
+                'jan': item['jan'] if item['valid'] else f"{item['jan']}（チェックデジット不一致）",
+            })
         
-        # 基本情報
-        lp_content += f"""
-## 基本情報
-### バナースペック
-| 項目 | 内容 |
-| --- | --- |
-| サイズ | PC:W1200px、SP：850px、flick：1000px |
-| 拡張子 | JPG |
-| カラーモード | RGB |
-| 画質 | なるべく画質優先で大丈夫です |
-| 圧縮方式 | プログレッシブとベースラインで容量が小さい方、同じ容量の場合はプログレッシブ優先 |
-| 解像度 | 72ppi |
-| アンチエイリアス | 文字に最適 |
-| ICCプロファイル | 消してください |
-
-### フォント、カラー指定
-
-下記、トンマナを踏まえて作成お願いします。
-（別途共有）
-
-### ベースのデータ
-
-（別途共有）
-
----
-# LP構成
-| 枚数 | コンテンツ概要 |
-| --- | --- |
-| 1枚目 | TOPキャッチ |
-| 2枚目 | 売れている訴求・実績 |
-| 3枚目 | ブランド価値・安全性 |
-| 4枚目 | メイン機能・特徴1（10段階温度調節） |
-| 5枚目 | メイン機能・特徴2（過熱保護・安全性） |
-| 6枚目 | 使用シーン |
-| 7枚目 | サイズ・スペック詳細 |
-| 8枚目 | 付属品・同梱物 |
-| 9枚目 | 保証・アフターサービス |
-| 10枚目 | よくある質問 |
-
----
-# ラフ詳細
-
-## 1枚目
-
-### レイアウト案
-【画像準備中】
-
-商品の魅力が一目で伝わるデザインにしてください。
-
-### テキスト
-
-{product_name}
-
-{f"キャンプギアに合うデザイン" if sales_points and any("キャンプ" in point for point in sales_points) else "快適な温もりを"}
-
-{f"• 10段階の温度調節" if sales_points and any("10段階" in point for point in sales_points) else ""}
-{f"• 過熱保護システム搭載" if sales_points and any("過熱保護" in point for point in sales_points) else ""}
-{f"• 丸洗い可能" if sales_points and any("丸洗い" in point for point in sales_points) else ""}
-
-### 使用画像
-
-【画像準備中】
-
-## 2枚目
-
-### レイアウト案
-【画像準備中】
-
-数字やロゴを効果的に配置してください。
-
-### テキスト
-
-PowerARQブランド
-
-信頼の実績
-累計販売台数○○万台突破
-※2025年○月時点
-
-## 3枚目
-
-### レイアウト案
-【画像準備中】
-
-### テキスト
-
-PowerARQブランドの安心品質
-
-日本ブランドとしての品質・安全性
-
-### 使用画像
-
-【画像準備中】
-
-## 4枚目
-
-### レイアウト案
-【画像準備中】
-
-### テキスト
-
-10段階の温度調節
-
-お好みの温かさに細かく設定
-{f"コントローラーから簡単操作" if sales_points and any("コントローラー" in point for point in sales_points) else ""}
-
-### 使用画像
-
-【画像準備中】
-
-## 5枚目
-
-### レイアウト案
-【画像準備中】
-
-### テキスト
-
-安全機能搭載
-
-{f"過熱保護システム" if sales_points and any("過熱保護" in point for point in sales_points) else "安全機能"}
-安心してお使いいただけます
-
-### 使用画像
-
-【画像準備中】
-
-## 6枚目
-
-### レイアウト案
-【画像準備中】
-
-### テキスト
-
-いつでも、どこでも暖かく
-
-{f"キャンプ・アウトドア・自宅" if sales_points and any("キャンプ" in point for point in sales_points) else "リビング・寝室・書斎"}
-あらゆるシーンで活躍
-
-### 使用画像
-
-【画像準備中】
-
-## 7枚目
-
-### レイアウト案
-【画像準備中】
-
-### テキスト
-
-仕様・スペック
-
-{f"サイズ：{size}" if size else ""}
-{f"重量：{weight}" if weight else ""}
-{f"定格：{power}" if power else ""}
-{f"素材：{material}" if material else ""}
-
-### 使用画像
-
-【画像準備中】
-
-## 8枚目
-
-### レイアウト案
-【画像準備中】
-
-### テキスト
-
-付属品・同梱物
-
-コントローラー
-取扱説明書
-保証書
-
-### 使用画像
-
-【画像準備中】
-
-## 9枚目
-
-### レイアウト案
-【画像準備中】
-
-### テキスト
-
-安心の保証・アフターサービス
-
-メーカー保証
-充実のサポート体制
-
-## 10枚目
-
-### レイアウト案
-【画像準備中】
-
-### テキスト
-
-よくある質問
-
-Q: 電気代はどのくらいかかりますか？
-A: 1時間あたり約○円です（中間設定時）
-
-{f"Q: 丸洗いできますか？" if sales_points and any("丸洗い" in point for point in sales_points) else "Q: お手入れ方法は？"}
-{f"A: はい、丸洗い可能です" if sales_points and any("丸洗い" in point for point in sales_points) else "A: 簡単なお手入れで清潔に保てます"}
-
-"""
-        
-        return lp_content
+        context = {
+            'product_name': product_name,
+            'product_kana': spec.kana or '',
+            'model_number': model_number,
+            'size': spec.size or '',
+            'weight': spec.weight or '',
+            'power': spec.power or '',
+            'material': spec.material or '',
+            'release_date': spec.release_date or '',
+            'variants': variants,
+        }
+        context.update(self.layout.sales_point_flags(sales_points))
+        return context
     
-    def generate_from_kishima_csv(self, csv_path: str, upload_to_docbase: bool = False) -> Dict[str, Any]:
-        """加島商事規定書CSVから正しいLPラフ案を生成"""
+    def generate_from_kishima_csv(self, csv_path: str, upload_to_docbase: bool = False,
+                                  previous_output: Optional[str] = None) -> Dict[str, Any]:
+        """加島商事規定書CSVから正しいLPラフ案を生成
+        
+        previous_output（前回の出力ファイル）にサイドカーがあれば、入力が変わったページだけを描画し直して
+        新しいファイルを作らずに前回の出力を更新する。
+        """
         
         print(f"\n📋 規定書解析開始: {csv_path}")
         
@@ -336,20 +207,28 @@ A: 1時間あたり約○円です（中間設定時）
             product_data = self.parse_kishima_csv(csv_path)
             print(f"✅ 規定書解析完了: {product_data.get('商品名', '商品名不明')}")
             
-            # LPラフ案生成
-            lp_content = self.generate_correct_lp_rough(product_data)
+            # LPラフ案生成（前回のツリーがあれば入力が変わったページだけ描画）
+            previous = load_sidecar(previous_output) if previous_output else None
+            lp_document = self.build_correct_lp_document(product_data, previous)
             print("✅ LPラフ案生成完了")
             
             # ファイル保存
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            product_name = product_data.get('商品名', '商品名').replace(' ', '_')
-            output_filename = f"lp_rough_correct_{product_name}_{timestamp}.md"
-            output_path = os.path.join('output', output_filename)
+            if previous is not None:
+                output_path = previous_output
+                changed = changed_nodes(lp_document, previous)
+                print(f"🧩 再描画: {len(changed)}/{len(lp_document['blocks'])}セクション")
+            else:
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                product_name = product_data.get('商品名', '商品名').replace(' ', '_')
+                output_filename = f"lp_rough_correct_{product_name}_{timestamp}.md"
+                output_path = os.path.join('output', output_filename)
+                changed = None
             
-            os.makedirs('output', exist_ok=True)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(lp_content)
+            if changed == [] and os.path.exists(output_path):
+                lp_content = to_markdown(lp_document)
+            else:
+                # Markdown と同じツリーをサイドカー（.lp.json）にも保存
+                lp_content = save_document(lp_document, output_path)
             
             print(f"📁 出力ファイル: {output_path}")
             
@@ -385,30 +264,181 @@ A: 1時間あたり約○円です（中間設定時）
         except Exception as e:
             print(f"❌ エラー: {e}")
             return None
+    
+    def generate_from_kishima_export(self, csv_path: str, output_dir: str = None,
+                                     jan_index: Optional[JanIndex] = None,
+                                     regenerate: bool = False) -> Dict[str, Any]:
+        """複数の規定書を連結したCSVから、商品を1件ずつ読みながらLPラフ案を生成
+        
+        jan_index を渡すと、以前の実行で生成済みの商品・同じ実行内の重複はスキップし、
+        JANが別の商品と衝突する商品は失敗として扱う（regenerate=True なら生成済みでも作り直す）。
+        output_dir に前回の出力（サイドカー付き）があれば、商品キー（メーカー型番）が同じ前回の出力から
+        入力が変わったページだけを描画し直して更新し、連結規定書から消えた商品の出力は削除する。
+        """
+        
+        print(f"\n📋 連結規定書の解析開始: {csv_path}")
+        
+        if not output_dir:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            output_dir = os.path.join('output', f'export_{timestamp}')
+        os.makedirs(output_dir, exist_ok=True)
+        
+        # 商品の並びが変わっても前回の出力を使えるよう、ファイル名の連番ではなく商品キーで引く
+        previous_outputs = _index_export_outputs(output_dir)
+        moved_paths = []
+        
+        output_paths = []
+        error_count = 0
+        skipped_count = 0
+        unchanged_count = 0
+        for index, product_data in enumerate(iter_kishima_csv_products(csv_path), 1):
+            product_name = product_data.get('商品名') or '商品名'
+            identity = product_identity(product_data)
+            previous_path = previous_outputs.pop(identity['key'], None)
+            
+            if jan_index is not None:
+                status, details = jan_index.claim(identity, csv_path, regenerate=regenerate)
+                if status == STATUS_CONFLICT:
+                    error_count += 1
+                    print(f"❌ [{index}] {product_name}: {' / '.join(details)}")
+                    continue
+                if status != STATUS_NEW:
+                    skipped_count += 1
+                    print(f"⏭️ [{index}] {product_name}: {STATUS_LABELS[status]}のためスキップ")
+                    continue
+            
+            safe_name = product_name.replace(' ', '_').replace('/', '_')
+            output_path = os.path.join(output_dir, f"{EXPORT_PREFIX}{index:04d}_{safe_name}.md")
+            previous = load_sidecar(previous_path) if previous_path else None
+            # 同じ実行内で別の商品に上書きされたサイドカーは使わない
+            if previous is not None and previous['meta'].get('product_key') != identity['key']:
+                previous = None
+            
+            try:
+                lp_document = self.build_correct_lp_document(product_data, previous)
+            except Exception as e:
+                error_count += 1
+                print(f"❌ [{index}] {product_name}: {e}")
+                continue
+            
+            # 前回と同じファイルで変わったページがなければ書き直さない
+            if previous is None or previous_path != output_path or changed_nodes(lp_document, previous):
+                save_document(lp_document, output_path)
+                if previous_path and previous_path != output_path:
+                    moved_paths.append(previous_path)
+                print(f"✅ [{index}] {product_name}")
+            else:
+                unchanged_count += 1
+                print(f"💤 [{index}] {product_name}: 変更なし")
+            output_paths.append(output_path)
+            if jan_index is not None:
+                jan_index.mark_generated(identity['key'], output_path)
+        
+        if jan_index is not None:
+            jan_index.save()
+        
+        # 連結規定書から消えた商品・ファイル名が変わった商品の前回の出力を削除
+        removed_count = 0
+        for stale_path in sorted(set(moved_paths).union(previous_outputs.values()).difference(output_paths)):
+            for path in (stale_path, sidecar_path(stale_path)):
+                if os.path.exists(path):
+                    os.remove(path)
+            removed_count += 1
+            print(f"🗑️ 削除: {os.path.basename(stale_path)}")
+        
+        return {
+            'output_dir': output_dir,
+            'output_paths': output_paths,
+            'error_count': error_count,
+            'skipped_count': skipped_count,
+            'unchanged_count': unchanged_count,
+            'removed_count': removed_count
+        }
 
 def main():
     """メイン処理"""
     
     if len(sys.argv) < 2:
         print("使用方法:")
-        print("  python correct_lp_generator.py <規定書CSVファイル> [--upload]")
+        print("  python correct_lp_generator.py <規定書CSVファイル> [--upload] [--no-cache] [--all-products] [--skip-generated] [--delta]")
+        print("\n  --all-products    複数の規定書を連結したCSVの全商品を生成（「商品名」行ごとに1商品）")
+        print("  --skip-generated  JAN/SKU索引で生成済み・重複の商品をスキップ（--all-products と併用）")
+        print("  --delta           前回の生成から規定書が変更されていなければ何もしない")
+        print("                    （変更されていれば入力が変わったページだけ描画し直して前回の出力を更新）")
         print("\n例:")
         print("  python correct_lp_generator.py 規定書.csv")
         print("  python correct_lp_generator.py 規定書.csv --upload")
+        print("  python correct_lp_generator.py 規定書_一括出力.csv --all-products")
+        print("  python correct_lp_generator.py 規定書_一括出力.csv --all-products --skip-generated")
+        print("  python correct_lp_generator.py 規定書.csv --delta")
         sys.exit(1)
     
     csv_path = sys.argv[1]
     upload_flag = '--upload' in sys.argv
     
+    if '--no-cache' in sys.argv:
+        set_cache_enabled(False)
+    
     if not os.path.exists(csv_path):
         print(f"❌ 規定書CSVファイルが見つかりません: {csv_path}")
         sys.exit(1)
     
+    try:
+        require_input_type(csv_path, [INPUT_TYPE_KISHIMA_CSV])
+    except InputTypeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
+    # 差分再生成: 前回と同じ入力・オプションなら解析も生成もしない
+    input_manifest = None
+    options = {'all_products': '--all-products' in sys.argv, 'upload': upload_flag}
+    if '--delta' in sys.argv:
+        input_manifest = InputManifest()
+        if not input_manifest.is_changed(csv_path, options):
+            print(f"💤 前回の生成から変更がないためスキップ: {csv_path}")
+            print(f"📁 前回の出力: {input_manifest.previous_output(csv_path)}")
+            return
+    
     try:
         generator = CorrectLPGenerator()
-        result = generator.generate_from_kishima_csv(csv_path, upload_to_docbase=upload_flag)
+        
+        if '--all-products' in sys.argv:
+            jan_index = JanIndex() if '--skip-generated' in sys.argv else None
+            # 差分再生成で変更された入力なら、前回生成した商品も作り直す
+            # 前回の出力ディレクトリがあれば、入力が変わったページだけ描画し直して更新する
+            previous_dir = input_manifest.previous_output(csv_path) if input_manifest is not None else None
+            regenerate = previous_dir is not None
+            if previous_dir and not os.path.isdir(previous_dir):
+                previous_dir = None
+            result = generator.generate_from_kishima_export(csv_path, output_dir=previous_dir,
+                                                            jan_index=jan_index, regenerate=regenerate)
+            if input_manifest is not None and not result['error_count']:
+                input_manifest.record(csv_path, result['output_dir'], options)
+                input_manifest.save()
+            print(f"\n🎉 処理完了！")
+            print(f"✅ 成功: {len(result['output_paths'])}件 / ❌ 失敗: {result['error_count']}件")
+            if result['skipped_count']:
+                print(f"⏭️ スキップ: {result['skipped_count']}件")
+            if result['unchanged_count']:
+                print(f"💤 変更なし: {result['unchanged_count']}件")
+            if result['removed_count']:
+                print(f"🗑️ 削除: {result['removed_count']}件")
+            print(f"📁 出力ディレクトリ: {result['output_dir']}")
+            if result['error_count']:
+                sys.exit(1)
+            return
+        
+        # 前回の出力があれば、入力が変わったページだけ描画し直して同じファイルを更新する
+        previous_output = input_manifest.previous_output(csv_path) if input_manifest is not None else None
+        if previous_output and not os.path.isfile(previous_output):
+            previous_output = None
+        result = generator.generate_from_kishima_csv(csv_path, upload_to_docbase=upload_flag,
+                                                     previous_output=previous_output)
         
         if result:
+            if input_manifest is not None:
+                input_manifest.record(csv_path, result['output_path'], options)
+                input_manifest.save()
             print(f"\n🎉 処理完了！")
             print(f"📁 出力ファイル: {result['output_path']}")
             if 'docbase_url' in result:
@@ -11,6 +11,7 @@ import requests
 from datetime import datetime
 from dotenv import load_dotenv
 from typing import Optional, Dict
+from lp_document import load_sidecar
 
 # 親ディレクトリからdotenvを読み込む
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -162,9 +163,10 @@ def main():
     with open(lp_file, 'r', encoding='utf-8') as f:
         lp_content = f.read()
     
-    # タイトルから商品名を抽出
-    lines = lp_content.split('\n')
-    product_name = None
+    # サイドカー（.lp.json）があれば商品名はそこから、なければタイトルから抽出
+    lp_document = load_sidecar(lp_file)
+    product_name = lp_document['meta'].get('product_name') if lp_document else None
+    lines = lp_content.split('\n') if not product_name else []
     for line in lines:
         if line.startswith('# ') and 'LP欄' in line:
             product_name = line.replace('# ', '').replace(' LP欄', '').strip()
@@ -8,11 +8,57 @@ import os
 import sys
 import json
 import openpyxl
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from lp_rough_generator import LPRoughGenerator
+from parse_cache import cached_parser, set_cache_enabled
+from section_parser import parse_section_rows
+from input_router import INPUT_TYPE_EXCEL, InputTypeError, require_input_type
+from xlsx_readers import XLSX_READERS, get_xlsx_backend, open_xlsx, set_xlsx_backend
+from record_validator import RECORD_TYPE_ROUGH, print_problems, validate_batch
 from docbase_lp_uploader import DocbaseLPUploader
 
+# 読み取りバックエンドで日付・数値・数式セルの値が異なるため、バックエンドもキーに含める
+@cached_parser('excel_sheet', version=2, key_args=('sheet_name',), key_extra=get_xlsx_backend)
+def parse_excel_sheet(excel_path: str, sheet_name: Optional[str] = None) -> Dict[str, Any]:
+    """指定シート（省略時はアクティブシート）をストリーミングで読み取り商品データに変換
+    
+    読み取りバックエンドは xlsx_readers の設定（環境変数 LP_XLSX_BACKEND）に従う。
+    """
+    
+    with open_xlsx(excel_path) as reader:
+        return parse_section_rows(reader.iter_rows(sheet_name))
+
+def _parse_sheet_chunk(excel_path: str, sheet_names: List[str]) -> List[Dict[str, Any]]:
+    """ワーカー処理: ワークブックを1回だけ開き、割り当てられたシートを順に解析"""
+    
+    with open_xlsx(excel_path) as reader:
+        return [parse_section_rows(reader.iter_rows(sheet_name)) for sheet_name in sheet_names]
+
+@cached_parser('excel_workbook', version=2, key_extra=get_xlsx_backend)
+def parse_excel_workbook(excel_path: str, max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """1シート1商品のワークブックを全シート解析（シートをワーカープロセスへ分配）"""
+    
+    with open_xlsx(excel_path) as reader:
+        sheet_names = reader.sheet_names
+    
+    max_workers = min(max_workers or os.cpu_count() or 1, len(sheet_names))
+    
+    if max_workers <= 1:
+        return _parse_sheet_chunk(excel_path, sheet_names)
+    
+    # シート順を保ったまま連続したチャンクに分割
+    chunk_size = -(-len(sheet_names) // max_workers)
+    chunks = [sheet_names[i:i + chunk_size] for i in range(0, len(sheet_names), chunk_size)]
+    
+    products = []
+    with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+        for chunk_products in executor.map(_parse_sheet_chunk, [excel_path] * len(chunks), chunks):
+            products.extend(chunk_products)
+    
+    return products
+
 class ExcelToLPGenerator:
     def __init__(self):
         """初期化"""
@@ -20,109 +66,7 @@ class ExcelToLPGenerator:
         
     def parse_excel_to_json(self, excel_path: str) -> Dict[str, Any]:
         """ExcelファイルをJSON形式に変換"""
-        
-        workbook = openpyxl.load_workbook(excel_path)
-        sheet = workbook.active
-        
-        product_data = {}
-        sku_list = []
-        lp_structure = []
-        page_details = []
-        
-        # セクションごとに処理
-        current_section = "basic"
-        page_data = {}
-        
-        # 全行を読み取り
-        for row in sheet.iter_rows(values_only=True):
-            if not row or not row[0]:  # 空行
-                continue
-                
-            # セクション判定
-            if str(row[0]).find("====") != -1:
-                if "SKU" in str(row[0]):
-                    current_section = "sku"
-                    continue
-                elif "LP構成" in str(row[0]):
-                    current_section = "structure"
-                    continue
-                elif "各ページ詳細" in str(row[0]):
-                    current_section = "page_details"
-                    continue
-                elif "その他" in str(row[0]):
-                    current_section = "other"
-                    continue
-            
-            # 基本情報
-            if current_section == "basic":
-                if row[0] and str(row[0]) != "項目名":
-                    product_data[str(row[0])] = str(row[1]) if len(row) > 1 and row[1] else ""
-            
-            # SKU情報
-            elif current_section == "sku":
-                if row[0] and str(row[0]) != "sku_type":
-                    if len(row) >= 3 and row[0] and row[1] and row[2]:
-                        sku_list.append({
-                            'type': str(row[0]),
-                            'sku': str(row[1]),
-                            'jan': str(row[2])
-                        })
-            
-            # LP構成
-            elif current_section == "structure":
-                if row[0] and str(row[0]).startswith("page_"):
-                    lp_structure.append(str(row[1]) if len(row) > 1 and row[1] else "")
-            
-            # ページ詳細
-            elif current_section == "page_details":
-                if row[0] and str(row[0]).startswith("page_"):
-                    key = str(row[0])
-                    value = str(row[1]) if len(row) > 1 and row[1] else ""
-                    
-                    # ページ番号を取得
-                    parts = key.split("_")
-                    if len(parts) >= 2:
-                        try:
-                            page_num = int(parts[1])
-                            
-                            # ページデータを初期化
-                            if page_num not in page_data:
-                                page_data[page_num] = {}
-                            
-                            # データタイプを判定
-                            if "_text" in key:
-                                page_data[page_num]['text'] = value.replace('\\n', '\n')
-                            elif "_layout_note" in key:
-                                page_data[page_num]['layout_note'] = value
-                            elif "_image_" in key:
-                                if 'images' not in page_data[page_num]:
-                                    page_data[page_num]['images'] = []
-                                if value:  # 画像URLがある場合のみ追加
-                                    page_data[page_num]['images'].append(value)
-                        except ValueError:
-                            pass
-            
-            # その他の情報
-            elif current_section == "other":
-                if row[0] and len(row) > 1 and row[1]:
-                    product_data[str(row[0])] = str(row[1]).replace('\\n', '\n')
-        
-        # ページ詳細を配列に変換
-        for page_num in sorted(page_data.keys()):
-            page_info = page_data[page_num]
-            if not page_info.get('images'):
-                page_info['has_images'] = True  # 画像準備中フラグ
-            page_details.append(page_info)
-        
-        # 最終的なデータ構造を作成
-        if sku_list:
-            product_data['sku_list'] = sku_list
-        if lp_structure:
-            product_data['lp_structure'] = lp_structure
-        if page_details:
-            product_data['page_details'] = page_details
-        
-        return product_data
+        return parse_excel_sheet(excel_path)
     
     def create_powerarq_excel_template(self, output_path: str = "templates/powerarq_blanket_lite.xlsx") -> str:
         """PowerArQ Electric Blanket LiteのExcelテンプレートを作成"""
@@ -213,7 +157,10 @@ class ExcelToLPGenerator:
         # データをシートに書き込み
         for row_idx, row_data in enumerate(data, 1):
             for col_idx, cell_value in enumerate(row_data, 1):
-                sheet.cell(row=row_idx, column=col_idx, value=cell_value)
+                cell = sheet.cell(row=row_idx, column=col_idx, value=cell_value)
+                # "====" 見出しが数式セルにならないよう文字列として保存（calamine・pandasでも読めるように）
+                if isinstance(cell_value, str) and cell_value.startswith('='):
+                    cell.data_type = 's'
         
         # 列幅調整
         sheet.column_dimensions['A'].width = 25
@@ -236,6 +183,39 @@ class ExcelToLPGenerator:
             print(f"❌ Excel読み込みエラー: {e}")
             return None
         
+        return self._generate_lp_from_product_data(product_data, upload_to_docbase)
+    
+    def generate_lp_from_workbook(self, excel_path: str, upload_to_docbase: bool = False,
+                                  max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """1シート1商品のワークブックから全商品のLPラフ案を生成"""
+        print(f"\n📊 Excel全シート解析開始: {excel_path}")
+        
+        try:
+            products = parse_excel_workbook(excel_path, max_workers=max_workers)
+            print(f"✅ Excel解析完了: {len(products)}シート")
+        except Exception as e:
+            print(f"❌ Excel読み込みエラー: {e}")
+            return None
+        
+        # 生成前に全シートをまとめて検証し、問題のあるシートは除外
+        valid, problems = validate_batch(products, RECORD_TYPE_ROUGH, start=1)
+        if problems:
+            print(f"⚠️ 検証エラーのため{len(problems)}シートをスキップします")
+            print_problems(problems)
+        
+        results = []
+        for _, product_data in valid:
+            try:
+                results.append(self._generate_lp_from_product_data(product_data, upload_to_docbase))
+            except Exception as e:
+                print(f"❌ LPラフ案生成エラー（{product_data.get('product_name', '商品名不明')}）: {e}")
+        
+        return results
+    
+    def _generate_lp_from_product_data(self, product_data: Dict[str, Any],
+                                       upload_to_docbase: bool = False) -> Dict[str, Any]:
+        """解析済みの商品データからLPラフ案を生成して保存"""
+        
         # LPラフ案生成
         lp_content = self.lp_generator.generate_lp_rough(product_data)
         
@@ -289,11 +269,14 @@ def main():
     
     if len(sys.argv) < 2:
         print("使用方法:")
-        print("  python excel_to_lp_generator.py <Excelファイル> [--upload]")
+        print("  python excel_to_lp_generator.py <Excelファイル> [--upload] [--no-cache] [--xlsx-backend <名前>]")
+        print("  python excel_to_lp_generator.py <Excelファイル> --all-sheets [--workers <数>] [--upload] [--no-cache]")
+        print(f"\n  --xlsx-backend  読み取りバックエンド: {' / '.join(XLSX_READERS)}（環境変数 LP_XLSX_BACKEND でも指定可）")
         print("  python excel_to_lp_generator.py --create-template")
         print("\n例:")
         print("  python excel_to_lp_generator.py templates/powerarq_blanket_lite.xlsx")
         print("  python excel_to_lp_generator.py templates/powerarq_blanket_lite.xlsx --upload")
+        print("  python excel_to_lp_generator.py data/catalog.xlsx --all-sheets --workers 8")
         print("  python excel_to_lp_generator.py --create-template")
         sys.exit(1)
     
@@ -310,13 +293,59 @@ def main():
     
     excel_path = sys.argv[1]
     upload_flag = '--upload' in sys.argv
+    all_sheets_flag = '--all-sheets' in sys.argv
+    
+    if '--no-cache' in sys.argv:
+        set_cache_enabled(False)
+    
+    if '--xlsx-backend' in sys.argv:
+        try:
+            set_xlsx_backend(sys.argv[sys.argv.index('--xlsx-backend') + 1])
+        except (IndexError, ValueError):
+            print(f"❌ --xlsx-backend には {' / '.join(XLSX_READERS)} のいずれかを指定してください")
+            sys.exit(1)
+    
+    max_workers = None
+    if '--workers' in sys.argv:
+        workers_index = sys.argv.index('--workers')
+        try:
+            max_workers = int(sys.argv[workers_index + 1])
+        except (IndexError, ValueError):
+            print("❌ --workers には整数を指定してください")
+            sys.exit(1)
+        if max_workers < 1:
+            print(f"❌ --workers には1以上の整数を指定してください: {max_workers}")
+            sys.exit(1)
     
     if not os.path.exists(excel_path):
         print(f"❌ Excelファイルが見つかりません: {excel_path}")
         sys.exit(1)
     
+    try:
+        require_input_type(excel_path, [INPUT_TYPE_EXCEL])
+    except InputTypeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
     try:
         generator = ExcelToLPGenerator()
+        
+        # 全シート（1シート1商品）モード
+        if all_sheets_flag:
+            results = generator.generate_lp_from_workbook(
+                excel_path, upload_to_docbase=upload_flag, max_workers=max_workers
+            )
+            if not results:
+                print("❌ 処理に失敗しました")
+                sys.exit(1)
+            
+            print(f"\n🎉 処理完了！ {len(results)}商品")
+            for result in results:
+                print(f"📁 出力ファイル: {result['output_path']}")
+                if 'docbase_url' in result:
+                    print(f"🌐 Docbase URL: {result['docbase_url']}")
+            return
+        
         result = generator.generate_lp_from_excel(excel_path, upload_to_docbase=upload_flag)
         
         if result:
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+差分再生成用の入力マニフェスト（パス → サイズ・更新時刻・内容ハッシュ・出力先）
+サイズと更新時刻が前回と同じファイルはハッシュも計算せずに未変更とし、
+更新時刻だけ変わったファイルは内容ハッシュで判定します
+"""
+
+import os
+import sys
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional
+
+from parse_cache import file_sha256
+
+MANIFEST_PATH = os.getenv('LP_INPUT_MANIFEST_PATH', os.path.join('.cache', 'input_manifest.json'))
+MANIFEST_VERSION = 1
+
+class InputManifest:
+    """前回生成時の入力ファイルの状態を保存するマニフェスト"""
+    
+    def __init__(self, path: str = MANIFEST_PATH):
+        """初期化（マニフェストがなければすべての入力を変更ありとして扱う）"""
+        self.path = path
+        self.files = {}
+        self._signatures = {}
+        self._load()
+    
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return
+        if manifest.get('version') == MANIFEST_VERSION:
+            self.files = manifest.get('files', {})
+    
+    def save(self):
+        """マニフェストを保存（一時ファイルに書いてから置き換える）"""
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'updated_at': datetime.now().isoformat(),
+            'files': self.files,
+        }
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.path)
+    
+    @staticmethod
+    def _key(file_path: str) -> str:
+        return os.path.abspath(file_path)
+    
+    def _signature(self, file_path: str) -> Dict[str, Any]:
+        """現在のサイズ・更新時刻（ハッシュは必要になるまで計算しない）"""
+        stat = os.stat(file_path)
+        signature = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        self._signatures[self._key(file_path)] = signature
+        return signature
+    
+    def _content_hash(self, file_path: str) -> str:
+        signature = self._signatures.get(self._key(file_path)) or self._signature(file_path)
+        if 'sha256' not in signature:
+            signature['sha256'] = file_sha256(file_path)
+        return signature['sha256']
+    
+    def is_changed(self, file_path: str, options: Optional[Mapping[str, Any]] = None) -> bool:
+        """前回の生成から入力が変わったか、出力が消えていれば True（options を渡すと生成オプションも比較）"""
+        
+        entry = self.files.get(self._key(file_path))
+        signature = self._signature(file_path)
+        if entry is None:
+            return True
+        if options is not None and entry.get('options') != dict(options):
+            return True
+        output_path = entry.get('output_path')
+        if output_path and not os.path.exists(output_path):
+            return True
+        if entry['size'] != signature['size']:
+            return True
+        if entry['mtime_ns'] == signature['mtime_ns']:
+            return False
+        
+        # 更新時刻だけ変わった（コピー・touch など）場合は内容で判定し、同じなら時刻を更新
+        if self._content_hash(file_path) != entry['sha256']:
+            return True
+        entry['mtime_ns'] = signature['mtime_ns']
+        return False
+    
+    def previous_output(self, file_path: str) -> Optional[str]:
+        """前回生成した出力ファイル"""
+        return self.files.get(self._key(file_path), {}).get('output_path')
+    
+    def record(self, file_path: str, output_path: Optional[str] = None,
+               options: Optional[Mapping[str, Any]] = None):
+        """生成に成功した入力の現在の状態を記録"""
+        self._content_hash(file_path)
+        entry = dict(self._signatures[self._key(file_path)])
+        entry['output_path'] = output_path
+        entry['options'] = dict(options or {})
+        entry['generated_at'] = datetime.now().isoformat()
+        self.files[self._key(file_path)] = entry
+    
+    def forget_missing(self) -> List[str]:
+        """存在しなくなった入力をマニフェストから削除し、削除したパスを返す"""
+        missing = [file_path for file_path in self.files if not os.path.exists(file_path)]
+        for file_path in missing:
+            del self.files[file_path]
+        return missing
+
+def main():
+    """メイン処理（マニフェストと入力の差分を表示）"""
+    
+    if len(sys.argv) < 2:
+        print("使用方法:")
+        print("  python input_manifest.py <入力ファイル> [<入力ファイル> ...]   変更ありの入力を表示")
+        print("  python input_manifest.py --clear")
+        print(f"\nマニフェスト: {MANIFEST_PATH}（環境変数 LP_INPUT_MANIFEST_PATH で変更可）")
+        sys.exit(1)
+    
+    if '--clear' in sys.argv:
+        if os.path.exists(MANIFEST_PATH):
+            os.remove(MANIFEST_PATH)
+        print(f"✅ マニフェストを削除しました: {MANIFEST_PATH}")
+        return
+    
+    manifest = InputManifest()
+    changed = [file_path for file_path in sys.argv[1:] if manifest.is_changed(file_path)]
+    for file_path in changed:
+        print(f"📝 {file_path}")
+    print(f"\n📊 変更あり: {len(changed)}件 / 未変更: {len(sys.argv) - 1 - len(changed)}件")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+入力ファイルの種類を先頭数KBの内容から判定し、対応するパーサーへ振り分けるルーター
+拡張子に頼らないため、拡張子違いのファイルも解析前に検出できます
+"""
+
+import io
+import os
+import csv
+import codecs
+import json
+import zipfile
+from typing import Dict, Any, IO, Iterable, Optional
+
+# 判定に読む先頭バイト数
+SNIFF_BYTES = 4096
+
+# 文字コード判定に読む先頭バイト数（先頭が英数字だけのファイルでも日本語の行まで届くように大きめ）
+ENCODING_SNIFF_BYTES = 65536
+
+# BOMのないテキストで試す文字コード（判定順、WindowsのExcelで保存した規定書はCP932）
+TEXT_ENCODINGS = ('utf-8', 'cp932')
+
+# 入力タイプ（--type の値と共通）
+INPUT_TYPE_EXCEL = 'excel'
+INPUT_TYPE_PDF = 'pdf'
+INPUT_TYPE_JSON = 'json'
+INPUT_TYPE_KISHIMA_CSV = 'kishima_csv'
+INPUT_TYPE_CSV = 'csv'
+INPUT_TYPE_PARQUET = 'parquet'
+INPUT_TYPE_ARROW = 'arrow'
+INPUT_TYPE_UNKNOWN = 'unknown'
+
+INPUT_TYPE_LABELS = {
+    INPUT_TYPE_EXCEL: 'Excelワークブック(xlsx)',
+    INPUT_TYPE_PDF: 'PDF',
+    INPUT_TYPE_JSON: 'JSON',
+    INPUT_TYPE_KISHIMA_CSV: '規定書CSV',
+    INPUT_TYPE_CSV: 'セクション形式CSV',
+    INPUT_TYPE_PARQUET: 'Parquetカタログ',
+    INPUT_TYPE_ARROW: 'Arrowカタログ',
+    INPUT_TYPE_UNKNOWN: '不明な形式',
+}
+
+# 規定書CSVの5列目（項目名列）に現れる項目
+KISHIMA_KEYS = ('商品名', '商品名カナ', 'メーカー型番', 'JANコード')
+
+# セクション形式CSVの1列目に現れる見出し
+SECTION_CSV_HEADERS = ('項目名', 'product_name')
+SECTION_MARKER = '==='
+
+# 商品カタログ表の先頭マジックバイト（Arrowはランダムアクセス形式とストリーム形式の継続マーカー）
+PARQUET_MAGIC = b'PAR1'
+ARROW_MAGICS = (b'ARROW1', b'\xff\xff\xff\xff')
+
+class InputTypeError(ValueError):
+    """入力ファイルの種類が期待と異なる場合のエラー"""
+    pass
+
+def _is_xlsx(file_path: str) -> bool:
+    """zipの中央ディレクトリだけを読んでxlsxか判定"""
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            return 'xl/workbook.xml' in archive.namelist()
+    except zipfile.BadZipFile:
+        return False
+
+def detect_catalog_magic(head: bytes) -> Optional[str]:
+    """先頭バイトがParquet/Arrowカタログならその入力タイプ（それ以外は None）"""
+    if head.startswith(PARQUET_MAGIC):
+        return INPUT_TYPE_PARQUET
+    if head.startswith(ARROW_MAGICS):
+        return INPUT_TYPE_ARROW
+    return None
+
+def _detect_text_type(text: str, truncated: bool) -> str:
+    """テキスト先頭部分からJSON/規定書CSV/セクション形式CSVを判定"""
+    
+    stripped = text.lstrip()
+    if stripped.startswith('{') or stripped.startswith('['):
+        return INPUT_TYPE_JSON
+    
+    lines = text.splitlines()
+    if truncated and len(lines) > 1:
+        # 途中で切れた最終行は判定に使わない
+        lines = lines[:-1]
+    
+    for row in csv.reader(io.StringIO('\n'.join(lines))):
+        if not row:
+            continue
+        
+        first = row[0].strip()
+        if len(row) >= 6 and row[4].strip().startswith(KISHIMA_KEYS):
+            return INPUT_TYPE_KISHIMA_CSV
+        if first.startswith('規定書') or first.startswith('加島商事'):
+            return INPUT_TYPE_KISHIMA_CSV
+        if first in SECTION_CSV_HEADERS or first.startswith(SECTION_MARKER):
+            return INPUT_TYPE_CSV
+    
+    return INPUT_TYPE_UNKNOWN
+
+def detect_encoding(head: bytes, truncated: bool = False) -> str:
+    """先頭ブロックのバイト列から文字コードを判定（BOM → UTF-8 → CP932の順、どれでもなければ utf-8）"""
+    
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if head.startswith(codecs.BOM_UTF16_LE) or head.startswith(codecs.BOM_UTF16_BE):
+        return 'utf-16'
+    
+    for encoding in TEXT_ENCODINGS:
+        # 途中で切れた末尾のマルチバイト文字はエラーにしない
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            decoder.decode(head, final=not truncated)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return 'utf-8'
+
+def detect_file_encoding(file_path: str) -> str:
+    """ファイル先頭ブロックから文字コードを判定"""
+    with open(file_path, 'rb') as f:
+        head = f.read(ENCODING_SNIFF_BYTES)
+        truncated = bool(f.read(1))
+    return detect_encoding(head, truncated)
+
+def open_text(file_path: str, encoding: Optional[str] = None, newline: Optional[str] = None) -> IO[str]:
+    """文字コードを判定してテキストとして開く（読みながら逐次デコードするため、全体の変換・書き出しは不要）"""
+    return open(file_path, 'r', encoding=encoding or detect_file_encoding(file_path), newline=newline)
+
+def detect_input_type(file_path: str) -> str:
+    """ファイル先頭の内容から入力タイプを判定（拡張子は見ない）"""
+    
+    with open(file_path, 'rb') as f:
+        head = f.read(SNIFF_BYTES)
+        truncated = bool(f.read(1))
+    
+    if head.startswith(b'PK\x03\x04'):
+        return INPUT_TYPE_EXCEL if _is_xlsx(file_path) else INPUT_TYPE_UNKNOWN
+    
+    # 商品カタログ表（catalog_ingest.py で処理する）
+    catalog_type = detect_catalog_magic(head)
+    if catalog_type:
+        return catalog_type
+    
+    # PDFヘッダーは先頭1024バイト以内にあればよい（仕様上の許容範囲）
+    if b'%PDF-' in head[:1024]:
+        return INPUT_TYPE_PDF
+    
+    # 末尾で切れたマルチバイト文字は無視する（BOMはデコーダーが取り除く）
+    encoding = detect_encoding(head, truncated)
+    text = codecs.getincrementaldecoder(encoding)(errors='ignore').decode(head)
+    return _detect_text_type(text, truncated)
+
+def require_input_type(file_path: str, expected: Iterable[str]) -> str:
+    """入力タイプを判定し、期待した種類でなければ InputTypeError を送出"""
+    
+    expected = tuple(expected)
+    input_type = detect_input_type(file_path)
+    if input_type not in expected:
+        expected_labels = '・'.join(INPUT_TYPE_LABELS.get(item, item) for item in expected)
+        raise InputTypeError(
+            f"{file_path} は{INPUT_TYPE_LABELS[input_type]}と判定されました（期待: {expected_labels}）"
+        )
+    return input_type
+
+def parse_input(file_path: str, input_type: str = 'auto') -> Dict[str, Any]:
+    """入力タイプに対応するパーサーで商品データを抽出（パーサーは必要になった時だけ読み込む）"""
+    
+    if input_type == 'auto':
+        input_type = detect_input_type(file_path)
+    
+    if input_type == INPUT_TYPE_KISHIMA_CSV:
+        from correct_lp_generator import parse_kishima_csv
+        return parse_kishima_csv(file_path)
+    elif input_type == INPUT_TYPE_CSV:
+        from csv_to_json_simple import parse_csv_to_json
+        return parse_csv_to_json(file_path)
+    elif input_type == INPUT_TYPE_EXCEL:
+        from excel_to_lp_generator import parse_excel_sheet
+        return parse_excel_sheet(file_path)
+    elif input_type == INPUT_TYPE_PDF:
+        from pdf_to_lp_generator import PDFToLPGenerator
+        pdf_generator = PDFToLPGenerator()
+        return pdf_generator.parse_pdf_product_data(pdf_generator.extract_spec_fields(file_path))
+    elif input_type == INPUT_TYPE_JSON:
+        with open_text(file_path) as f:
+            return json.load(f)
+    elif input_type in (INPUT_TYPE_PARQUET, INPUT_TYPE_ARROW):
+        raise InputTypeError(f"{file_path} は商品カタログです。catalog_ingest.py で一括生成してください")
+    else:
+        raise InputTypeError(f"未対応のファイルタイプ: {input_type} ({file_path})")
+
+def main():
+    """メイン処理（入力タイプの判定結果を表示）"""
+    import sys
+    
+    if len(sys.argv) < 2:
+        print("使用方法:")
+        print("  python input_router.py <入力ファイル> [<入力ファイル> ...]")
+        sys.exit(1)
+    
+    for file_path in sys.argv[1:]:
+        if not os.path.isfile(file_path):
+            print(f"❌ ファイルが見つかりません: {file_path}")
+            continue
+        input_type = detect_input_type(file_path)
+        print(f"🔍 {file_path}: {input_type}（{INPUT_TYPE_LABELS[input_type]}）")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+実行をまたいで使うJAN/SKUのハッシュ索引（JAN → 商品、SKU → 商品）
+取り込み時に商品ごとのJAN・SKUを登録し、重複した商品・別商品とJANが衝突するバリエーションを
+1行あたり辞書の参照だけで検出します。生成済みの商品はバッチ処理でスキップできます
+"""
+
+import os
+import sys
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from product_spec import JAN_KEY
+from variant_extractor import extract_variants
+
+INDEX_PATH = os.getenv('LP_JAN_INDEX_PATH', os.path.join('.cache', 'jan_index.json'))
+INDEX_VERSION = 1
+
+# claim() の判定結果
+STATUS_NEW = 'new'              # 未生成（登録して生成する）
+STATUS_GENERATED = 'generated'  # 以前の実行で生成済み
+STATUS_DUPLICATE = 'duplicate'  # 同じ実行の中で既に出てきた商品
+STATUS_CONFLICT = 'conflict'    # JAN・SKUが別の商品に登録済み
+
+STATUS_LABELS = {
+    STATUS_NEW: '新規',
+    STATUS_GENERATED: '生成済み',
+    STATUS_DUPLICATE: '重複',
+    STATUS_CONFLICT: '衝突',
+}
+
+def product_identity(product_data: Mapping[str, Any]) -> Dict[str, Any]:
+    """商品データから索引に使う {'key', 'name', 'jans', 'skus'} を取り出す
+    
+    規定書形式はメーカー型番（なければ商品名）を商品キーとし、JANは「色名：JAN」の並びから取り出す。
+    LPラフ形式は商品名を商品キーとし、sku_list のJAN・SKUを使う。
+    """
+    
+    if '商品名' in product_data:
+        name = product_data.get('商品名') or ''
+        model_number = product_data.get('メーカー型番') or ''
+        jans = [variant['jan'] for variant in extract_variants(product_data.get(JAN_KEY) or '')]
+        skus = [model_number] if model_number else []
+        key = model_number or name
+    else:
+        name = product_data.get('product_name') or ''
+        sku_list = product_data.get('sku_list') or []
+        jans = [sku['jan'] for sku in sku_list if sku.get('jan')]
+        skus = [sku['sku'] for sku in sku_list if sku.get('sku')]
+        key = name
+    
+    return {
+        'key': key,
+        'name': name,
+        'jans': list(dict.fromkeys(jans)),
+        'skus': list(dict.fromkeys(skus)),
+    }
+
+class JanIndex:
+    """JSONに保存するJAN/SKU → 商品キーの索引"""
+    
+    def __init__(self, path: str = INDEX_PATH):
+        """初期化（索引ファイルがなければ空の索引から始める）"""
+        self.path = path
+        self.jans = {}
+        self.skus = {}
+        self.products = {}
+        self.claimed = set()
+        self._load()
+    
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return
+        if index.get('version') != INDEX_VERSION:
+            return
+        self.jans = index.get('jans', {})
+        self.skus = index.get('skus', {})
+        self.products = index.get('products', {})
+    
+    def save(self):
+        """索引ファイルを保存（一時ファイルに書いてから置き換える）"""
+        index = {
+            'version': INDEX_VERSION,
+            'updated_at': datetime.now().isoformat(),
+            'jans': self.jans,
+            'skus': self.skus,
+            'products': self.products,
+        }
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+    
+    def find_conflicts(self, identity: Mapping[str, Any]) -> List[str]:
+        """別の商品に登録済みのJAN・SKUを探す"""
+        key = identity['key']
+        conflicts = []
+        for label, codes, table in (('JAN', identity['jans'], self.jans), ('SKU', identity['skus'], self.skus)):
+            for code in codes:
+                owner = table.get(code)
+                if owner is not None and owner != key:
+                    owner_name = self.products.get(owner, {}).get('name') or owner
+                    conflicts.append(f"{label} {code} は別の商品「{owner_name}」に登録済みです")
+        return conflicts
+    
+    def claim(self, identity: Mapping[str, Any], source: str = '',
+              regenerate: bool = False) -> Tuple[str, List[str]]:
+        """商品を索引に照合し、(判定, 詳細メッセージ) を返す
+        
+        新規の商品はこの時点でJAN・SKUを登録する。生成済みでも出力ファイルが消えていれば新規として扱う。
+        regenerate=True（入力が変更された商品の再生成）なら生成済みでも新規として扱う。
+        """
+        
+        key = identity['key']
+        if not key:
+            return STATUS_NEW, []
+        
+        conflicts = self.find_conflicts(identity)
+        if conflicts:
+            return STATUS_CONFLICT, conflicts
+        if key in self.claimed:
+            return STATUS_DUPLICATE, []
+        self.claimed.add(key)
+        
+        entry = self.products.get(key)
+        if not regenerate and entry and entry.get('output_path') and os.path.exists(entry['output_path']):
+            return STATUS_GENERATED, [entry['output_path']]
+        
+        for jan in identity['jans']:
+            self.jans[jan] = key
+        for sku in identity['skus']:
+            self.skus[sku] = key
+        entry = self.products.setdefault(key, {'name': identity['name'], 'sources': []})
+        entry['jans'] = identity['jans']
+        entry['skus'] = identity['skus']
+        if source and source not in entry['sources']:
+            entry['sources'].append(source)
+        return STATUS_NEW, []
+    
+    def mark_generated(self, key: str, output_path: str, docbase_url: Optional[str] = None):
+        """商品の生成済み出力（とDocbaseのURL）を記録"""
+        entry = self.products.get(key)
+        if entry is None:
+            return
+        entry['output_path'] = output_path
+        entry['generated_at'] = datetime.now().isoformat()
+        if docbase_url:
+            entry['docbase_url'] = docbase_url
+    
+    def lookup(self, code: str) -> Optional[Dict[str, Any]]:
+        """JAN・SKU・商品キーから登録内容を取得"""
+        key = self.jans.get(code) or self.skus.get(code) or (code if code in self.products else None)
+        if key is None:
+            return None
+        return dict(self.products[key], key=key)
+    
+    def stats(self) -> Dict[str, int]:
+        """登録件数"""
+        return {
+            'products': len(self.products),
+            'generated': sum(1 for entry in self.products.values() if entry.get('output_path')),
+            'jans': len(self.jans),
+            'skus': len(self.skus),
+        }
+
+def main():
+    """メイン処理（索引の状態表示・検索・削除）"""
+    
+    if len(sys.argv) < 2:
+        print("使用方法:")
+        print("  python jan_index.py --stats")
+        print("  python jan_index.py --lookup <JAN|SKU|商品キー>")
+        print("  python jan_index.py --clear")
+        print(f"\n索引ファイル: {INDEX_PATH}（環境変数 LP_JAN_INDEX_PATH で変更可）")
+        sys.exit(1)
+    
+    if '--clear' in sys.argv:
+        if os.path.exists(INDEX_PATH):
+            os.remove(INDEX_PATH)
+        print(f"✅ 索引を削除しました: {INDEX_PATH}")
+        return
+    
+    index = JanIndex()
+    
+    if '--lookup' in sys.argv:
+        try:
+            code = sys.argv[sys.argv.index('--lookup') + 1]
+        except IndexError:
+            print("❌ --lookup にはJAN・SKU・商品キーを指定してください")
+            sys.exit(1)
+        entry = index.lookup(code)
+        if entry is None:
+            print(f"❌ 登録されていません: {code}")
+            sys.exit(1)
+        print(json.dumps(entry, ensure_ascii=False, indent=2))
+        return
+    
+    stats = index.stats()
+    print(f"📊 JAN/SKU索引: {INDEX_PATH}")
+    print(f"  商品: {stats['products']}件（生成済み: {stats['generated']}件）")
+    print(f"  JAN: {stats['jans']}件 / SKU: {stats['skus']}件")
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,8 @@ import json
 import sys
 import os
 from typing import Dict, List
-import pandas as pd
+from section_parser import parse_section_rows
+from xlsx_readers import open_xlsx
 
 def parse_csv_to_json(csv_path: str) -> Dict:
     """CSVファイルをJSON形式に変換"""
@@ -118,20 +119,9 @@ def parse_csv_to_json(csv_path: str) -> Dict:
 def parse_excel_to_json(excel_path: str) -> Dict:
     """ExcelファイルをJSON形式に変換"""
     
-    # Excelを読み込み
-    df = pd.read_excel(excel_path, header=None)
-    
-    # CSVに変換して処理
-    csv_path = excel_path.replace('.xlsx', '.csv').replace('.xls', '.csv')
-    df.to_csv(csv_path, index=False, header=False, encoding='utf-8-sig')
-    
-    # CSV処理を実行
-    result = parse_csv_to_json(csv_path)
-    
-    # 一時CSVファイルを削除
-    os.remove(csv_path)
-    
-    return result
+    # 一時CSVを書き出さず、設定されたバックエンドでシートの行をそのまま解析
+    with open_xlsx(excel_path) as reader:
+        return parse_section_rows(reader.iter_rows())
 
 def main():
     """メイン処理"""
@@ -4,7 +4,7 @@
 精度向上版LPラフ案生成システム
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List
 from datetime import datetime
 
 class EnhancedLPGenerator:
@@ -284,6 +284,10 @@ class EnhancedLPGenerator:
     
     def generate_enhanced_lp_rough(self, product_data: Dict) -> str:
         """強化版LPラフ案生成"""
+        return ''.join(self.iter_enhanced_lp_rough(product_data))
+    
+    def iter_enhanced_lp_rough(self, product_data: Dict) -> Iterator[str]:
+        """強化版LPラフ案を断片ごとに生成"""
         
         # 商品カテゴリ分析
         category = self.analyze_product_category(product_data)
@@ -296,7 +300,7 @@ class EnhancedLPGenerator:
         purpose = product_data.get('purpose', '販売促進のため')
         
         # LPラフ案開始
-        lp_content = f"""# LPラフ（強化版）
+        yield f"""# LPラフ（強化版）
 ## 作成の目的、意図
 {purpose}
 
@@ -316,13 +320,13 @@ class EnhancedLPGenerator:
         # SKU情報追加
         sku_list = product_data.get('sku_list', [])
         for sku in sku_list:
-            lp_content += f"| {sku.get('type', '')} | {sku.get('sku', '')} | {sku.get('jan', '')} |\n"
+            yield f"| {sku.get('type', '')} | {sku.get('sku', '')} | {sku.get('jan', '')} |\n"
         
         if not sku_list:
-            lp_content += "| カラー/サイズ | SKUコード | JANコード |\n"
+            yield "| カラー/サイズ | SKUコード | JANコード |\n"
         
         # 基本情報セクション
-        lp_content += """
+        yield """
 ## 基本情報
 ### バナースペック
 | 項目 | 内容 |
@@ -350,19 +354,22 @@ class EnhancedLPGenerator:
 | --- | --- | --- |
 """
         
+        # 各ページの内容（構成テーブルと詳細で共通）
+        page_contents = [
+            self.generate_enhanced_page_content(i, page_title, product_data, category)
+            for i, page_title in enumerate(page_structure, 1)
+        ]
+        
         # ページ構成テーブル
-        for i, page_title in enumerate(page_structure, 1):
-            page_content = self.generate_enhanced_page_content(i, page_title, product_data, category)
+        for i, (page_title, page_content) in enumerate(zip(page_structure, page_contents), 1):
             priority = page_content.get('design_priority', 'medium')
-            lp_content += f"| {i}枚目 | {page_title} | {priority} |\n"
+            yield f"| {i}枚目 | {page_title} | {priority} |\n"
         
         # 詳細ページセクション
-        lp_content += "\n\n---\n# ラフ詳細（強化版）\n\n"
+        yield "\n\n---\n# ラフ詳細（強化版）\n\n"
         
-        for i, page_title in enumerate(page_structure, 1):
-            page_content = self.generate_enhanced_page_content(i, page_title, product_data, category)
-            
-            lp_content += f"""## {i}枚目 - {page_title}
+        for i, (page_title, page_content) in enumerate(zip(page_structure, page_contents), 1):
+            yield f"""## {i}枚目 - {page_title}
 
 ### 📸 画像指示（優先度: {page_content.get('design_priority', 'medium')}）
 {page_content.get('image_instruction', '【画像準備中】')}
@@ -381,7 +388,7 @@ class EnhancedLPGenerator:
 """
         
         # 制作ガイドライン追加
-        lp_content += """
+        yield """
 # 🎯 制作ガイドライン
 
 ## 画像制作指示
@@ -404,6 +411,4 @@ class EnhancedLPGenerator:
 - PC版（1200px）をベースデザイン
 - SP版（850px）で最適化
 - Flick版（1000px）でタブレット対応
-"""
-        
-        return lp_content
\ No newline at end of file
+"""
\ No newline at end of file
@@ -12,6 +12,16 @@ from datetime import datetime
 from typing import Dict, Any, List
 from lp_rough_generator import LPRoughGenerator
 from docbase_lp_uploader import DocbaseLPUploader
+from sales_point_features import FeatureMatcher
+
+# セールスポイントのキーワード → 特徴（先にあるものほど優先）
+SALES_POINT_FEATURES = FeatureMatcher([
+    ('10段階の温度調節機能', ['温度設定']),
+    ('キャンプギアに合うデザイン', ['カラーデザイン', 'インテリア']),
+    ('より暖かさを感じやすい素材感', ['電熱線', '暖か']),
+    ('過熱保護システム搭載', ['過熱保護']),
+    ('丸洗い可能でメンテナンス簡単', ['丸洗い']),
+])
 
 class KishimaSpecToLPGenerator:
     def __init__(self):
@@ -148,21 +158,9 @@ class KishimaSpecToLPGenerator:
                 'PowerARQブランド'
             ]
         
-        features = []
+        # セールスポイントを特徴に変換（各ポイントで最も優先度の高い特徴を1回の走査で判定）
         points = sales_text.split('\\n')
-        for point in points:
-            if point.strip():
-                # セールスポイントを特徴に変換
-                if '温度設定' in point:
-                    features.append('10段階の温度調節機能')
-                elif 'カラーデザイン' in point or 'インテリア' in point:
-                    features.append('キャンプギアに合うデザイン')
-                elif '電熱線' in point or '暖か' in point:
-                    features.append('より暖かさを感じやすい素材感')
-                elif '過熱保護' in point:
-                    features.append('過熱保護システム搭載')
-                elif '丸洗い' in point:
-                    features.append('丸洗い可能でメンテナンス簡単')
+        features = SALES_POINT_FEATURES.classify(point for point in points if point.strip())
         
         return features if features else [
             '10段階の温度調節機能',
@@ -4,7 +4,7 @@
 レイアウト案生成システム
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, List, Optional
 from datetime import datetime
 
 class LayoutGenerator:
@@ -254,15 +254,25 @@ class LayoutGenerator:
     
     def generate_layout_document(self, all_pages_data: List[Dict], category: str = 'lifestyle') -> str:
         """全ページのレイアウト指示書を生成"""
+        return ''.join(self.iter_layout_document(all_pages_data, category))
+    
+    def iter_layout_document(self, all_pages_data: Iterable[Dict], category: str = 'lifestyle',
+                             page_count: Optional[int] = None) -> Iterator[str]:
+        """全ページのレイアウト指示書を断片ごとに生成
+        
+        ページは1枚ずつ読んで書き出すので、all_pages_data にジェネレーターを渡せば
+        ページ数によらず一定のメモリで生成できる（その場合は page_count で総ページ数を指定）。
+        """
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        if page_count is None:
+            page_count = len(all_pages_data)
         
-        document = f"""# LPレイアウト指示書
+        yield f"""# LPレイアウト指示書
 生成日時: {datetime.now().strftime('%Y年%m月%d日 %H:%M:%S')}
 カテゴリ: {category}
 
 ## 📋 全体構成
-- 総ページ数: {len(all_pages_data)}枚
+- 総ページ数: {page_count}枚
 - カテゴリ最適化: {category}向けレイアウト
 - レスポンシブ対応: PC/SP/タブレット
 
@@ -292,7 +302,7 @@ class LayoutGenerator:
         for i, page_data in enumerate(all_pages_data, 1):
             layout_suggestions = self.generate_layout_suggestions(page_data, category)
             
-            document += f"""## 📄 {i}枚目レイアウト指示
+            yield f"""## 📄 {i}枚目レイアウト指示
 
 ### ページ分析
 - タイプ: {layout_suggestions['page_analysis']['page_type']}
@@ -322,12 +332,12 @@ class LayoutGenerator:
 """
             # 代替案も追加
             for j, alt_layout in enumerate(layout_suggestions['recommended_layouts'][1:], 1):
-                document += f"**案{j+1}**: {alt_layout['layout_name']} - {alt_layout['description']}\\n"
+                yield f"**案{j+1}**: {alt_layout['layout_name']} - {alt_layout['description']}\\n"
             
-            document += "\\n---\\n\\n"
+            yield "\\n---\\n\\n"
         
         # 制作ワークフロー
-        document += """## 🔄 制作ワークフロー
+        yield """## 🔄 制作ワークフロー
 
 ### Phase 1: デザインカンプ作成
 1. ワイヤーフレーム確認
@@ -351,6 +361,4 @@ class LayoutGenerator:
 - [ ] タップ可能要素のサイズ（44px以上）
 - [ ] 画像の最適化
 - [ ] ローディング速度
-"""
-        
-        return document
\ No newline at end of file
+"""
\ No newline at end of file
@@ -8,8 +8,37 @@ LPラフ案自動生成システム
 import json
 import os
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterable, Iterator, Optional, Union
 import sys
+from render_sink import SOCKET_SCHEME, STDOUT_TARGET, stream_to
+from lp_document import (document, heading, image, iter_markdown, page, paragraph, rule, sidecar_path,
+                         table, to_json, to_markdown)
+
+# バナースペック（全LP共通）
+BANNER_SPEC_ROWS = [
+    ['サイズ', 'PC:W1200px、SP：850px、flick：1000px'],
+    ['拡張子', 'JPG'],
+    ['カラーモード', 'RGB'],
+    ['画質', 'なるべく画質優先で大丈夫です'],
+    ['圧縮方式', 'プログレッシブとベースラインで容量が小さい方、同じ容量の場合はプログレッシブ優先'],
+    ['解像度', '72ppi'],
+    ['アンチエイリアス', '文字に最適'],
+    ['ICCプロファイル', '消してください'],
+]
+
+# LP構成のデフォルト
+DEFAULT_STRUCTURE = [
+    "TOPキャッチ",
+    "売れている訴求・実績",
+    "ブランド価値・安全性",
+    "メイン機能・特徴1",
+    "メイン機能・特徴2",
+    "使用シーン",
+    "サイズ・スペック詳細",
+    "付属品・同梱物",
+    "保証・アフターサービス",
+    "よくある質問"
+]
 
 class LPRoughGenerator:
     """LPラフ案生成クラス"""
@@ -24,6 +53,14 @@ class LPRoughGenerator:
     
     def generate_lp_rough(self, product_data: Dict) -> str:
         """商品データからLPラフ案を生成"""
+        return to_markdown(self.build_lp_document(product_data))
+    
+    def iter_lp_rough(self, product_data: Dict) -> Iterator[str]:
+        """商品データからLPラフ案を断片ごとに生成（必須項目のチェックは呼び出した時点で行う）"""
+        return iter_markdown(self.build_lp_document(product_data))
+    
+    def build_lp_document(self, product_data: Dict) -> Dict:
+        """商品データからLPラフ案の文書ツリーを組み立てる（Markdown / HTML / JSON はこのツリーから出力）"""
         
         # 必須項目チェック
         required_fields = ['product_name', 'purpose', 'target_platform']
@@ -31,80 +68,53 @@ class LPRoughGenerator:
             if field not in product_data:
                 raise ValueError(f"必須項目 '{field}' が入力されていません")
         
-        # LPラフ案の生成
-        lp_content = f"""# LPラフ
-## 作成の目的、意図
-{product_data.get('purpose', '商品の販売促進のため')}
-
-## 対象商品
-### 商品名
-{product_data['product_name']}
-
-### SKU・JAN
-"""
+        blocks = [
+            heading(1, 'LPラフ'),
+            heading(2, '作成の目的、意図'),
+            paragraph(product_data.get('purpose', '商品の販売促進のため')),
+            heading(2, '対象商品'),
+            heading(3, '商品名'),
+            paragraph(product_data['product_name']),
+            heading(3, 'SKU・JAN'),
+        ]
         
         # SKU/JANテーブル
         if 'sku_list' in product_data and product_data['sku_list']:
-            lp_content += "| 種類 | SKU | JAN |\n| --- | --- | --- |\n"
-            for item in product_data['sku_list']:
-                lp_content += f"| {item.get('type', '')} | {item.get('sku', '')} | {item.get('jan', '')} |\n"
+            sku_rows = [
+                [item.get('type', ''), item.get('sku', ''), item.get('jan', '')]
+                for item in product_data['sku_list']
+            ]
         else:
-            lp_content += "| 種類 | SKU | JAN |\n| --- | --- | --- |\n| - | - | - |\n"
-        
-        lp_content += "\n"
+            sku_rows = [['-', '-', '-']]
+        blocks.append(table(['種類', 'SKU', 'JAN'], sku_rows))
         
         # 基本情報
-        lp_content += """## 基本情報
-### バナースペック
-| 項目 | 内容 |
-| --- | --- |
-| サイズ | PC:W1200px、SP：850px、flick：1000px |
-| 拡張子 | JPG |
-| カラーモード | RGB |
-| 画質 | なるべく画質優先で大丈夫です |
-| 圧縮方式 | プログレッシブとベースラインで容量が小さい方、同じ容量の場合はプログレッシブ優先 |
-| 解像度 | 72ppi |
-| アンチエイリアス | 文字に最適 |
-| ICCプロファイル | 消してください |
-
-
-### フォント、カラー指定
-
-"""
+        blocks.extend([
+            heading(2, '基本情報'),
+            heading(3, 'バナースペック'),
+            table(['項目', '内容'], BANNER_SPEC_ROWS, blank_lines=2),
+            heading(3, 'フォント、カラー指定', blank_lines=1),
+        ])
         
         if product_data.get('tonmana_url'):
-            lp_content += f"下記、トンマナを踏まえて作成お願いします。\n{product_data['tonmana_url']}\n\n"
+            blocks.append(paragraph(f"下記、トンマナを踏まえて作成お願いします。\n{product_data['tonmana_url']}"))
         else:
-            lp_content += "トンマナに関しては別途共有します。\n\n"
+            blocks.append(paragraph("トンマナに関しては別途共有します。"))
         
         if product_data.get('base_data_url'):
-            lp_content += f"### ベースのデータ\n\n{product_data['base_data_url']}\n\n"
-        
-        # LP構成
-        lp_content += "---\n# LP構成\n| 枚数 | コンテンツ概要 |\n| --- | --- |\n"
-        
-        # デフォルトの構成またはカスタム構成
-        if 'lp_structure' in product_data and product_data['lp_structure']:
-            for i, content in enumerate(product_data['lp_structure'], 1):
-                lp_content += f"| {i}枚目 | {content} |\n"
-        else:
-            # デフォルト構成
-            default_structure = [
-                "TOPキャッチ",
-                "売れている訴求・実績",
-                "ブランド価値・安全性",
-                "メイン機能・特徴1",
-                "メイン機能・特徴2",
-                "使用シーン",
-                "サイズ・スペック詳細",
-                "付属品・同梱物",
-                "保証・アフターサービス",
-                "よくある質問"
-            ]
-            for i, content in enumerate(default_structure, 1):
-                lp_content += f"| {i}枚目 | {content} |\n"
-        
-        lp_content += "\n\n---\n# ラフ詳細\n\n"
+            blocks.append(heading(3, 'ベースのデータ', blank_lines=1))
+            blocks.append(paragraph(product_data['base_data_url']))
+        
+        # LP構成（デフォルトの構成またはカスタム構成）
+        structure = product_data.get('lp_structure') or DEFAULT_STRUCTURE
+        blocks.extend([
+            rule(),
+            heading(1, 'LP構成'),
+            table(['枚数', 'コンテンツ概要'], [[f"{i}枚目", content] for i, content in enumerate(structure, 1)],
+                  blank_lines=2),
+            rule(),
+            heading(1, 'ラフ詳細', blank_lines=1),
+        ])
         
         # 各ページの詳細
         pages = product_data.get('page_details', [])
@@ -112,37 +122,36 @@ class LPRoughGenerator:
             # デフォルトページを生成
             pages = self._generate_default_pages(product_data)
         
-        for i, page in enumerate(pages, 1):
-            lp_content += f"## {i}枚目\n\n"
+        for i, page_data in enumerate(pages, 1):
+            page_blocks = [heading(2, f"{i}枚目", blank_lines=1)]
             
             # レイアウト案
-            lp_content += "### レイアウト案\n"
-            if page.get('layout_image'):
-                lp_content += f"![レイアウト案]({page['layout_image']} =WxH)\n\n"
+            page_blocks.append(heading(3, 'レイアウト案'))
+            if page_data.get('layout_image'):
+                page_blocks.append(image(page_data['layout_image'], 'レイアウト案', 'WxH'))
             else:
-                lp_content += "【画像準備中】\n\n"
+                page_blocks.append(paragraph('【画像準備中】'))
             
-            if page.get('layout_note'):
-                lp_content += f"{page['layout_note']}\n\n"
+            if page_data.get('layout_note'):
+                page_blocks.append(paragraph(page_data['layout_note']))
             
             # テキスト
-            if page.get('text'):
-                lp_content += "### テキスト\n\n"
-                lp_content += f"{page['text']}\n\n"
+            if page_data.get('text'):
+                page_blocks.append(heading(3, 'テキスト', blank_lines=1))
+                page_blocks.append(paragraph(page_data['text']))
             
             # 使用画像
-            if page.get('images'):
-                lp_content += "### 使用画像\n\n"
-                for img in page['images']:
-                    if img:
-                        lp_content += f"{img}\n"
-                    else:
-                        lp_content += "【画像準備中】\n"
-                lp_content += "\n"
-            elif page.get('has_images', False):
-                lp_content += "### 使用画像\n\n【画像準備中】\n\n"
-        
-        return lp_content
+            if page_data.get('images'):
+                page_blocks.append(heading(3, '使用画像', blank_lines=1))
+                page_blocks.append(paragraph('\n'.join(f"{img}" if img else '【画像準備中】' for img in page_data['images'])))
+            elif page_data.get('has_images', False):
+                page_blocks.append(heading(3, '使用画像', blank_lines=1))
+                page_blocks.append(paragraph('【画像準備中】'))
+            
+            title = structure[i - 1] if i <= len(structure) else None
+            blocks.append(page(i, page_blocks, title))
+        
+        return document(blocks, product_name=f"{product_data['product_name']}", generator='lp_rough')
     
     def _generate_default_pages(self, product_data: Dict) -> List[Dict]:
         """デフォルトのページ詳細を生成"""
@@ -206,16 +215,28 @@ class LPRoughGenerator:
         
         return pages
     
-    def save_lp_rough(self, content: str, product_name: str) -> str:
-        """LPラフ案を保存"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"lp_rough_{product_name}_{timestamp}.md"
-        filepath = os.path.join(self.output_dir, filename)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+    def save_lp_rough(self, content: Union[str, Iterable[str], Dict], product_name: str,
+                      target: Optional[str] = None) -> str:
+        """LPラフ案を保存（content は文字列・iter_lp_rough の断片・build_lp_document のツリー、target は出力先）
+        
+        target を省略すると output/ にタイムスタンプ付きのファイル名で保存する。
+        断片を渡した場合は全体を文字列にまとめずに書き出す。
+        ツリーを渡した場合、出力先が通常のファイルならサイドカー（.lp.json）も保存する。
+        """
+        if target is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"lp_rough_{product_name}_{timestamp}.md"
+            target = os.path.join(self.output_dir, filename)
+        
+        if isinstance(content, dict):
+            stream_to(iter_markdown(content), target)
+            if target != STDOUT_TARGET and not target.startswith(SOCKET_SCHEME) and not target.endswith('.gz'):
+                with open(sidecar_path(target), 'w', encoding='utf-8') as f:
+                    f.write(to_json(content))
+        else:
+            stream_to([content] if isinstance(content, str) else content, target)
         
-        return filepath
+        return target
     
     def load_template(self, template_name: str) -> Dict:
         """テンプレートを読み込み"""
@@ -373,16 +394,25 @@ def interactive_input():
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
-        # コマンドライン引数でJSONファイルを指定
+        # コマンドライン引数でJSONファイルを指定（--output で出力先: パス・.gz・tcp://ホスト:ポート・-）
         json_path = sys.argv[1]
+        target = None
+        if '--output' in sys.argv:
+            try:
+                target = sys.argv[sys.argv.index('--output') + 1]
+            except IndexError:
+                print("❌ --output には出力先を指定してください")
+                sys.exit(1)
         if os.path.exists(json_path):
             generator = LPRoughGenerator()
             with open(json_path, 'r', encoding='utf-8') as f:
                 product_data = json.load(f)
             
-            lp_content = generator.generate_lp_rough(product_data)
-            filepath = generator.save_lp_rough(lp_content, product_data['product_name'])
-            print(f"✅ LPラフ案を生成しました: {filepath}")
+            # ツリーから Markdown の断片をそのまま出力先に書き出す
+            lp_document = generator.build_lp_document(product_data)
+            filepath = generator.save_lp_rough(lp_document, product_data['product_name'], target)
+            if target != STDOUT_TARGET:
+                print(f"✅ LPラフ案を生成しました: {filepath}")
         else:
             print(f"❌ ファイルが見つかりません: {json_path}")
     else:
@@ -15,6 +15,7 @@ from enhanced_lp_generator import EnhancedLPGenerator
 from layout_generator import LayoutGenerator
 from docbase_lp_uploader import DocbaseLPUploader
 from kishima_spec_to_lp import KishimaSpecToLPGenerator
+from input_router import detect_input_type, parse_input, require_input_type
 
 class MasterLPGenerator:
     def __init__(self):
@@ -145,49 +146,18 @@ class MasterLPGenerator:
         return result
     
     def _detect_input_type(self, file_path: str) -> str:
-        """入力ファイルタイプを自動判定"""
-        _, ext = os.path.splitext(file_path.lower())
-        
-        if ext == '.csv':
-            # CSVファイル内容を確認してサブタイプ判定
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if '規定書' in content or '加島商事' in content:
-                        return 'kishima_csv'
-                    else:
-                        return 'csv'
-            except:
-                return 'csv'
-        elif ext in ['.xlsx', '.xls']:
-            return 'excel'
-        elif ext == '.pdf':
-            return 'pdf'
-        elif ext == '.json':
-            return 'json'
-        else:
-            return 'unknown'
+        """入力ファイルタイプを内容から自動判定（拡張子は見ない）"""
+        return detect_input_type(file_path)
     
     def _extract_product_data(self, file_path: str, input_type: str) -> Dict[str, Any]:
         """入力タイプに応じて商品データを抽出"""
         
+        # 指定タイプと内容が食い違う場合は解析前にエラーにする
+        require_input_type(file_path, [input_type])
+        
         if input_type == 'kishima_csv':
             return self.kishima_generator.parse_kishima_csv(file_path)
-        elif input_type == 'csv':
-            # 通常のCSV処理（既存のcsv_to_json_simple.pyを使用）
-            from csv_to_json_simple import parse_csv_to_json
-            return parse_csv_to_json(file_path)
-        elif input_type == 'excel':
-            # Excel処理
-            from excel_to_lp_generator import ExcelToLPGenerator
-            excel_gen = ExcelToLPGenerator()
-            return excel_gen.parse_excel_to_json(file_path)
-        elif input_type == 'json':
-            # JSON直接読み込み
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        else:
-            raise ValueError(f"未対応のファイルタイプ: {input_type}")
+        return parse_input(file_path, input_type)
     
     def generate_image_checklist(self, product_data: Dict) -> str:
         """画像制作チェックリストを生成"""
@@ -283,7 +253,7 @@ def main():
         print("  python master_generator.py <入力ファイル> [オプション]")
         print("\nオプション:")
         print("  --upload          Docbaseにアップロード")
-        print("  --type <type>     入力タイプを指定 (auto|csv|excel|kishima_csv|json)")
+        print("  --type <type>     入力タイプを指定 (auto|csv|excel|kishima_csv|pdf|json)")
         print("  --checklist       画像チェックリストも生成")
         print("\n例:")
         print("  python master_generator.py data/規定書.csv")
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LPラフ案の中間表現（文書ツリー）と Markdown / HTML / JSON への出力
+ジェネレーターはツリーを1回だけ組み立て、同じツリーから各形式を出力します
+Markdown と並べて保存するサイドカー（<出力>.lp.json）にはツリーと商品名などのメタ情報が入るので、
+アップロードやCMS連携・差分確認で Markdown を読み直す必要はありません
+
+ノードはすべて 'type' を持つ辞書:
+  document   {'meta', 'blocks'}
+  section    {'name', 'blocks'}                ヘッダー・フッターなどページ以外のまとまり（同上）
+  page       {'number', 'title', 'blocks'}     LPの各ページ（Markdown には中のブロックだけを出力）
+  heading    {'level', 'text'}
+  paragraph  {'text'}                          改行を含む文章（空文字は空行1つ）
+  table      {'header', 'rows'}
+  image      {'alt', 'src', 'size'}
+  rule       {}
+ブロックの 'blank_lines' は Markdown で後ろに入れる空行の数（HTML / JSON の内容には影響しない）
+section / page の 'input_hash' は描画に使った入力のハッシュで、同じなら前回のノードをそのまま再利用できる
+"""
+
+import os
+import re
+import sys
+import json
+from html import escape
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+DOCUMENT_VERSION = 1
+SIDECAR_SUFFIX = '.lp.json'
+
+FORMAT_MARKDOWN = 'markdown'
+FORMAT_HTML = 'html'
+FORMAT_JSON = 'json'
+
+HEADING_PATTERN = re.compile(r'^(#{1,6}) (.*)$')
+IMAGE_PATTERN = re.compile(r'^!\[([^\]]*)\]\((\S+)(?: =(\S+))?\)$')
+IMAGE_SIZE_PATTERN = re.compile(r'^(\d+)x(\d+)$')
+# 中のブロックだけを Markdown に出力するノード
+CONTAINER_TYPES = ('document', 'section', 'page')
+
+# ノードの組み立て
+
+def document(blocks: List[Dict[str, Any]], **meta: Any) -> Dict[str, Any]:
+    return {'type': 'document', 'version': DOCUMENT_VERSION, 'meta': meta, 'blocks': blocks}
+
+def section(name: str, blocks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {'type': 'section', 'name': name, 'blocks': blocks}
+
+def page(number: int, blocks: List[Dict[str, Any]], title: Any = None) -> Dict[str, Any]:
+    return {'type': 'page', 'number': number, 'title': None if title is None else f"{title}", 'blocks': blocks}
+
+def heading(level: int, text: Any, blank_lines: int = 0) -> Dict[str, Any]:
+    return {'type': 'heading', 'level': level, 'text': f"{text}", 'blank_lines': blank_lines}
+
+def paragraph(text: Any, blank_lines: int = 1) -> Dict[str, Any]:
+    return {'type': 'paragraph', 'text': f"{text}", 'blank_lines': blank_lines}
+
+def table(header: Sequence[Any], rows: Iterable[Sequence[Any]], blank_lines: int = 1) -> Dict[str, Any]:
+    return {
+        'type': 'table',
+        'header': [f"{cell}" for cell in header],
+        'rows': [[f"{cell}" for cell in row] for row in rows],
+        'blank_lines': blank_lines,
+    }
+
+def image(src: str, alt: str = '', size: Optional[str] = None, blank_lines: int = 1) -> Dict[str, Any]:
+    return {'type': 'image', 'alt': alt, 'src': src, 'size': size, 'blank_lines': blank_lines}
+
+def rule(blank_lines: int = 0) -> Dict[str, Any]:
+    return {'type': 'rule', 'blank_lines': blank_lines}
+
+# Markdown
+
+def _table_row(cells: Sequence[str]) -> str:
+    return f"| {' | '.join(cells)} |\n"
+
+def _markdown_block(block: Mapping[str, Any]) -> str:
+    kind = block['type']
+    if kind == 'heading':
+        text = f"{'#' * block['level']} {block['text']}\n"
+    elif kind == 'paragraph':
+        text = f"{block['text']}\n"
+    elif kind == 'table':
+        text = _table_row(block['header']) + _table_row(['---'] * len(block['header']))
+        text += ''.join(_table_row(row) for row in block['rows'])
+    elif kind == 'image':
+        size = f" ={block['size']}" if block.get('size') else ''
+        text = f"![{block['alt']}]({block['src']}{size})\n"
+    elif kind == 'rule':
+        text = "---\n"
+    else:
+        raise ValueError(f"未対応のノードです: {kind}")
+    return text + "\n" * block.get('blank_lines', 0)
+
+def iter_markdown(node: Mapping[str, Any]) -> Iterator[str]:
+    """ツリーを Markdown の断片として順に出力"""
+    if node['type'] not in CONTAINER_TYPES:
+        yield _markdown_block(node)
+        return
+    for block in node['blocks']:
+        if block['type'] in CONTAINER_TYPES:
+            for child in block['blocks']:
+                yield _markdown_block(child)
+        else:
+            yield _markdown_block(block)
+
+def to_markdown(node: Mapping[str, Any]) -> str:
+    return ''.join(iter_markdown(node))
+
+# HTML
+
+def _html_text(text: str) -> str:
+    return '<br>\n'.join(escape(line) for line in text.split('\n'))
+
+def _iter_html(node: Mapping[str, Any]) -> Iterator[str]:
+    kind = node['type']
+    if kind == 'document':
+        for block in node['blocks']:
+            yield from _iter_html(block)
+    elif kind == 'page':
+        title = f' data-title="{escape(node["title"])}"' if node.get('title') else ''
+        yield f'<section class="lp-page" data-number="{node["number"]}"{title}>\n'
+        for block in node['blocks']:
+            yield from _iter_html(block)
+        yield '</section>\n'
+    elif kind == 'section':
+        yield f'<section class="lp-{escape(node["name"])}">\n'
+        for block in node['blocks']:
+            yield from _iter_html(block)
+        yield '</section>\n'
+    elif kind == 'heading':
+        yield f"<h{node['level']}>{escape(node['text'])}</h{node['level']}>\n"
+    elif kind == 'paragraph':
+        if node['text']:
+            yield f"<p>{_html_text(node['text'])}</p>\n"
+    elif kind == 'table':
+        yield '<table>\n<thead><tr>'
+        yield ''.join(f"<th>{escape(cell)}</th>" for cell in node['header'])
+        yield '</tr></thead>\n<tbody>\n'
+        for row in node['rows']:
+            yield f"<tr>{''.join(f'<td>{escape(cell)}</td>' for cell in row)}</tr>\n"
+        yield '</tbody>\n</table>\n'
+    elif kind == 'image':
+        size = ''
+        match = IMAGE_SIZE_PATTERN.match(node.get('size') or '')
+        if match:
+            size = f' width="{match.group(1)}" height="{match.group(2)}"'
+        yield f'<img src="{escape(node["src"])}" alt="{escape(node["alt"])}"{size}>\n'
+    elif kind == 'rule':
+        yield '<hr>\n'
+    else:
+        raise ValueError(f"未対応のノードです: {kind}")
+
+def to_html(node: Mapping[str, Any]) -> str:
+    """ツリーを HTML に出力（document はタイトル付きの1ページ、それ以外は断片）"""
+    body = ''.join(_iter_html(node))
+    if node['type'] != 'document':
+        return body
+    title = node['meta'].get('title') or node['meta'].get('product_name') or 'LPラフ'
+    return (
+        '<!DOCTYPE html>\n<html lang="ja">\n<head>\n<meta charset="utf-8">\n'
+        f'<title>{escape(title)}</title>\n</head>\n<body>\n<article class="lp-document">\n'
+        f'{body}</article>\n</body>\n</html>\n'
+    )
+
+# JSON
+
+def to_json(node: Mapping[str, Any]) -> str:
+    return json.dumps(node, ensure_ascii=False, indent=1)
+
+def render(node: Mapping[str, Any], output_format: str) -> str:
+    """指定した形式（markdown / html / json）で出力"""
+    if output_format == FORMAT_MARKDOWN:
+        return to_markdown(node)
+    if output_format == FORMAT_HTML:
+        return to_html(node)
+    if output_format == FORMAT_JSON:
+        return to_json(node)
+    raise ValueError(f"未対応の出力形式です: {output_format}")
+
+# サイドカー
+
+def sidecar_path(output_path: str) -> str:
+    """Markdown の出力ファイルに対応するサイドカーのパス"""
+    return os.path.splitext(output_path)[0] + SIDECAR_SUFFIX
+
+def save_document(node: Mapping[str, Any], output_path: str) -> str:
+    """ツリーを Markdown として保存し、同じツリーをサイドカーにも保存して Markdown を返す"""
+    content = to_markdown(node)
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    # 前回の出力を上書きする場合に備え、一時ファイルに書いてから置き換える
+    for path, text in ((output_path, content), (sidecar_path(output_path), to_json(node))):
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_path, path)
+    return content
+
+def load_sidecar(output_path: str) -> Optional[Dict[str, Any]]:
+    """Markdown の出力ファイル（またはサイドカー自身）からツリーを読み込む（なければ None）"""
+    path = output_path if output_path.endswith(SIDECAR_SUFFIX) else sidecar_path(output_path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            node = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if node.get('type') != 'document' or node.get('version') != DOCUMENT_VERSION:
+        return None
+    return node
+
+# 差分再生成
+
+def reusable_nodes(previous: Optional[Mapping[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """前回のツリーの section / page を input_hash で引ける辞書にする"""
+    if not previous:
+        return {}
+    return {node['input_hash']: node for node in previous['blocks'] if node.get('input_hash')}
+
+def changed_nodes(node: Mapping[str, Any], previous: Optional[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+    """前回のツリーから入力が変わった（再描画した）section / page"""
+    reusable = reusable_nodes(previous)
+    return [
+        block for block in node['blocks']
+        if block['type'] in CONTAINER_TYPES and block.get('input_hash') not in reusable
+    ]
+
+def main():
+    """メイン処理（サイドカーから各形式を出力）"""
+    
+    if len(sys.argv) < 2:
+        print("使用方法:")
+        print("  python lp_document.py <出力Markdown|サイドカー(.lp.json)> [--format markdown|html|json]")
+        print("\n例:")
+        print("  python lp_document.py output/lp_rough_correct_商品名_20240124_150000.md --format html")
+        sys.exit(1)
+    
+    node = load_sidecar(sys.argv[1])
+    if node is None:
+        print(f"❌ サイドカーが見つかりません: {sidecar_path(sys.argv[1])}")
+        sys.exit(1)
+    
+    output_format = FORMAT_MARKDOWN
+    if '--format' in sys.argv:
+        try:
+            output_format = sys.argv[sys.argv.index('--format') + 1]
+        except IndexError:
+            print("❌ --format には markdown / html / json を指定してください")
+            sys.exit(1)
+    
+    try:
+        sys.stdout.write(render(node, output_format))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
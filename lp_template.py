@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LPラフ案のレイアウトテンプレート（templates/layouts/*.json）を読み込み、描画関数にコンパイルするエンジン
+テンプレートは最初に1回だけPythonの関数に変換し、商品ごとの描画ではその関数を呼ぶだけにします
+
+構文:
+  {{名前}}                       値を埋め込む
+  {{#if 名前}}…{{else}}…{{/if}}  値（フラグ）が空でなければ前半、空なら else 以降
+  {{#each 名前}}…{{/each}}       リストの各要素で繰り返す（要素の項目を {{項目名}} で参照）
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+from collections import ChainMap
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from lp_document import (
+    HEADING_PATTERN, IMAGE_PATTERN, document, heading, image, page, paragraph, reusable_nodes, rule, section, table,
+)
+from sales_point_features import FeatureMatcher
+
+LAYOUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates', 'layouts')
+
+TAG_PATTERN = re.compile(r'\{\{\s*(.*?)\s*\}\}')
+NAME_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+# ブロックのタグだけの行（行末の改行を出力しない）
+STANDALONE_PATTERN = re.compile(r'^\s*\{\{\s*(?:#if\s|#each\s|else|/if|/each)[^}]*\}\}\s*$')
+# ページ一覧の繰り返し（レイアウト自身の値なのでコンパイル前に展開する）
+PAGES_PATTERN = re.compile(r'\{\{\s*#each\s+pages\s*\}\}(.*?)\{\{\s*/each\s*\}\}', re.DOTALL)
+PAGES_START_PATTERN = re.compile(r'^\s*\{\{\s*#each\s+pages\s*\}\}\s*$')
+PAGES_END_PATTERN = re.compile(r'^\s*\{\{\s*/each\s*\}\}\s*$')
+# セクションの入力ハッシュに含める文書ツリーの組み立て方の版（変えると前回のノードを再利用しない）
+SECTION_BUILD_VERSION = 2
+
+class TemplateSyntaxError(ValueError):
+    """テンプレートの構文エラー"""
+
+def _check_name(name: str, tag: str) -> str:
+    if not NAME_PATTERN.match(name):
+        raise TemplateSyntaxError(f"不正な名前です: {{{{{tag}}}}}")
+    return name
+
+def _fstring_literal(text: str) -> str:
+    """固定文字列を f-string の中身として書ける形にエスケープ"""
+    escaped = text.replace('\\', '\\\\').replace("'", "\\'").replace('{', '{{').replace('}', '}}')
+    return escaped.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
+
+def _join(expressions: List[str]) -> str:
+    """式の並びを1つの文字列式にする"""
+    if not expressions:
+        return "''"
+    if len(expressions) == 1:
+        return expressions[0]
+    return f"''.join(({', '.join(expressions)},))"
+
+def compile_source(template: str, function_name: str = 'render') -> str:
+    """テンプレートを描画関数のPythonソースに変換
+    
+    関数は1つの式を返す形にする。ブロックの間の固定文字列と値の埋め込みは1つの f-string に、
+    {{#if}} は条件式に、{{#each}} は内包表記にまとめる。コンテキストの値は関数の先頭で1回だけ
+    ローカル変数に読み込み、繰り返しの中では要素の項目 → 外側の値の順に解決する。
+    """
+    
+    names = {}  # コンテキストの名前 → ローカル変数名
+    loops = []  # 入れ子の繰り返し変数
+    # 開いているブロックごとの [種類, 名前, 条件・繰り返しの式, 式の並び, else 以降の式の並び]
+    stack = [['', '', '', [], None]]
+    pieces = []  # 次の f-string の中身
+    
+    def local(name: str) -> str:
+        if name not in names:
+            names[name] = f"v_{name}"
+        return names[name]
+    
+    def lookup(name: str) -> str:
+        expression = local(name)
+        for item in loops:
+            expression = f'{item}.get("{name}", {expression})'
+        return expression
+    
+    def flush():
+        if pieces:
+            block = stack[-1]
+            (block[4] if block[4] is not None else block[3]).append(f"f'{''.join(pieces)}'")
+        pieces.clear()
+    
+    def close(kind: str, tag: str) -> List[Any]:
+        if len(stack) == 1 or stack[-1][0] != kind:
+            raise TemplateSyntaxError(f"{{{{{tag}}}}} に対応する {{{{#{kind}}}}} がありません")
+        flush()
+        return stack.pop()
+    
+    position = 0
+    for match in TAG_PATTERN.finditer(template):
+        if match.start() > position:
+            pieces.append(_fstring_literal(template[position:match.start()]))
+        position = match.end()
+        tag = match.group(1)
+        
+        if tag.startswith('#if '):
+            flush()
+            name = _check_name(tag[4:].strip(), tag)
+            stack.append(['if', name, lookup(name), [], None])
+        elif tag == 'else':
+            if len(stack) == 1 or stack[-1][0] != 'if' or stack[-1][4] is not None:
+                raise TemplateSyntaxError("{{else}} に対応する {{#if}} がありません")
+            flush()
+            stack[-1][4] = []
+        elif tag == '/if':
+            _, _, condition, then, otherwise = close('if', tag)
+            stack[-1][3 if stack[-1][4] is None else 4].append(
+                f"({_join(then)} if {condition} else {_join(otherwise or [])})"
+            )
+        elif tag.startswith('#each '):
+            flush()
+            name = _check_name(tag[6:].strip(), tag)
+            item = f"item{len(loops)}"
+            stack.append(['each', name, f"{item} in {lookup(name)} or ()", [], None])
+            loops.append(item)
+        elif tag == '/each':
+            _, _, iteration, expressions, _ = close('each', tag)
+            loops.pop()
+            stack[-1][3 if stack[-1][4] is None else 4].append(
+                f"''.join([{_join(expressions)} for {iteration}])"
+            )
+        else:
+            pieces.append(f"{{{lookup(_check_name(tag, tag))}}}")
+    
+    if position < len(template):
+        pieces.append(_fstring_literal(template[position:]))
+    flush()
+    if len(stack) > 1:
+        kind, name = stack[-1][:2]
+        raise TemplateSyntaxError(f"{{{{#{kind} {name}}}}} が閉じられていません")
+    
+    lines = [f"def {function_name}(context):"]
+    lines.extend(f"    {variable} = context.get({name!r}, '')" for name, variable in names.items())
+    lines.append(f"    return {_join(stack[0][3])}")
+    return "\n".join(lines) + "\n"
+
+def template_names(template: str) -> List[str]:
+    """テンプレートが参照する名前（繰り返しの要素の項目名も、外側の値として引かれうるので含める）"""
+    names = set()
+    for match in TAG_PATTERN.finditer(template):
+        tag = match.group(1)
+        if tag in ('else', '/if', '/each'):
+            continue
+        names.add(tag.split(None, 1)[-1] if tag.startswith(('#if ', '#each ')) else tag)
+    return sorted(names)
+
+def compile_template(template: str) -> Callable[[Mapping[str, Any]], str]:
+    """テンプレートを描画関数にコンパイル"""
+    namespace = {}
+    exec(compile(compile_source(template), '<lp_template>', 'exec'), namespace)
+    return namespace['render']
+
+# 文書ツリー用のセクションのコンパイル
+
+def _compile_line(line: str) -> Tuple[Any, ...]:
+    """テンプレートの1行を (種類, …) に分類し、値を埋め込む部分を描画関数にする
+    
+    種類（見出し・表の行・区切り線など）はテンプレートの書き方で決め、描画した値からは推測しない。
+    表の行はセルごとにコンパイルする（セルをまたぐブロックがある行は文章の行）。
+    """
+    if line == '':
+        return ('blank',)
+    if line == '---':
+        return ('rule',)
+    match = HEADING_PATTERN.match(line)
+    if match:
+        return ('heading', len(match.group(1)), compile_template(match.group(2)))
+    if len(line) >= 4 and line.startswith('| ') and line.endswith(' |'):
+        cells = line[2:-2].split(' | ')
+        if all(cell == '---' for cell in cells):
+            return ('separator', len(cells))
+        try:
+            return ('row', [compile_template(cell) for cell in cells])
+        except TemplateSyntaxError:
+            pass
+    match = IMAGE_PATTERN.match(line)
+    if match and not TAG_PATTERN.search(match.group(3) or ''):
+        return ('image', compile_template(match.group(1)), compile_template(match.group(2)), match.group(3))
+    return ('text', compile_template(line))
+
+def _parse_lines(lines: Sequence[str]) -> List[Tuple[Any, ...]]:
+    """行のリストを {{#if}} / {{#each}} の入れ子に組み立てる（ブロックのタグはタグだけの行に書く）"""
+    
+    program = []
+    # 開いているブロックごとの [種類, ノード, 中身を追加するリスト]
+    stack = [['', None, program]]
+    for line in lines:
+        if not STANDALONE_PATTERN.match(line):
+            try:
+                stack[-1][2].append(_compile_line(line))
+            except TemplateSyntaxError as e:
+                raise TemplateSyntaxError(f"{e}（ブロックは1行の中で閉じるか、タグだけの行に書いてください）: {line}")
+            continue
+        
+        tag = TAG_PATTERN.search(line).group(1)
+        if tag.startswith('#if '):
+            node = ('if', _check_name(tag[4:].strip(), tag), [], [])
+            stack[-1][2].append(node)
+            stack.append(['if', node, node[2]])
+        elif tag.startswith('#each '):
+            node = ('each', _check_name(tag[6:].strip(), tag), [])
+            stack[-1][2].append(node)
+            stack.append(['each', node, node[2]])
+        elif tag == 'else':
+            if stack[-1][0] != 'if' or stack[-1][2] is stack[-1][1][3]:
+                raise TemplateSyntaxError("{{else}} に対応する {{#if}} がありません")
+            stack[-1][2] = stack[-1][1][3]
+        else:
+            kind = tag[1:].strip()
+            if stack[-1][0] != kind:
+                raise TemplateSyntaxError(f"{{{{{tag}}}}} に対応する {{{{#{kind}}}}} がありません")
+            stack.pop()
+    if len(stack) > 1:
+        kind, node = stack[-1][:2]
+        raise TemplateSyntaxError(f"{{{{#{kind} {node[1]}}}}} が閉じられていません")
+    return program
+
+def _run_lines(program: Sequence[Tuple[Any, ...]], context: Mapping[str, Any], lines: List[Tuple[Any, ...]]):
+    """組み立てた行をコンテキストで描画して lines に追加（繰り返しの中では要素の項目 → 外側の値の順に解決）"""
+    for node in program:
+        kind = node[0]
+        if kind == 'if':
+            _run_lines(node[2] if context.get(node[1], '') else node[3], context, lines)
+        elif kind == 'each':
+            for item in context.get(node[1], '') or ():
+                _run_lines(node[2], ChainMap(item, context), lines)
+        elif kind == 'heading':
+            lines.append(('heading', node[1], node[2](context)))
+        elif kind == 'row':
+            lines.append(('row', [cell(context) for cell in node[1]]))
+        elif kind == 'image':
+            lines.append(('image', node[1](context), node[2](context), node[3]))
+        elif kind == 'text':
+            text = node[1](context)
+            # 描画して空になった行は空行
+            lines.append(('text', text) if text else ('blank',))
+        else:
+            lines.append(node)
+
+def _line_text(line: Tuple[Any, ...]) -> str:
+    """表にならなかった表の行・区切り行を文章の行に戻す"""
+    if line[0] == 'row':
+        return f"| {' | '.join(line[1])} |"
+    if line[0] == 'separator':
+        return f"| {' | '.join(['---'] * line[1])} |"
+    return line[1]
+
+def _blocks_from_lines(lines: Sequence[Tuple[Any, ...]]) -> List[Dict[str, Any]]:
+    """描画した行を文書ツリーのブロックにまとめる（to_markdown で描画した行の並びに戻る）
+    
+    表の行の次が同じ列数の区切り行なら表（続く表の行が本文）、連続した文章の行は1つの段落にする。
+    空行は直前のブロックの後ろの空行として数える（先頭の空行は空の段落）。
+    """
+    
+    blocks = []
+    position = 0
+    while position < len(lines):
+        line = lines[position]
+        kind = line[0]
+        position += 1
+        if kind == 'blank':
+            if blocks:
+                blocks[-1]['blank_lines'] += 1
+            else:
+                blocks.append(paragraph('', blank_lines=0))
+        elif kind == 'heading':
+            blocks.append(heading(line[1], line[2]))
+        elif kind == 'rule':
+            blocks.append(rule())
+        elif kind == 'image':
+            blocks.append(image(line[2], line[1], line[3], blank_lines=0))
+        elif kind == 'row' and position < len(lines) and lines[position] == ('separator', len(line[1])):
+            position += 1
+            rows = []
+            while position < len(lines) and lines[position][0] == 'row':
+                rows.append(lines[position][1])
+                position += 1
+            blocks.append(table(line[1], rows, blank_lines=0))
+        else:
+            texts = [_line_text(line)]
+            while kind == 'text' and position < len(lines) and lines[position][0] == 'text':
+                texts.append(lines[position][1])
+                position += 1
+            blocks.append(paragraph('\n'.join(texts), blank_lines=0))
+    return blocks
+
+def compile_blocks(lines: Sequence[str]) -> Callable[[Mapping[str, Any]], List[Dict[str, Any]]]:
+    """セクションの行のリストを、文書ツリーのブロックを返す描画関数にコンパイル
+    
+    ブロックの種類はテンプレートの行から決まり、値は行（表はセル）ごとに埋め込むので、
+    値に「#」や「|」が含まれていても見出しや表にはならない。
+    """
+    program = _parse_lines(lines)
+    
+    def render_blocks(context: Mapping[str, Any]) -> List[Dict[str, Any]]:
+        lines = []
+        _run_lines(program, context, lines)
+        return _blocks_from_lines(lines)
+    return render_blocks
+
+class LPLayout:
+    """LPラフ案のレイアウト（ヘッダー・各ページ・フッター）をコンパイルしたもの
+    
+    レイアウトJSON:
+      header / footer: 行のリスト（ページ一覧は {{#each pages}} の {{number}} / {{title}} で参照し、
+                       コンパイル前に展開する。ブロックのタグだけの行は改行を出力しない）
+      page_heading:    各ページの見出し（{{number}} はページ番号に置き換える）
+      pages:           {'title': 構成表のタイトル, 'body': 行のリスト} のリスト
+      flags:           フラグ名 → セールスポイントに含まれていれば真になるキーワード（またはそのリスト）
+    文書ツリー（render_document）では、{{#if}} / {{#each}} はタグだけの行に書くか1行の中で閉じる。
+    """
+    
+    def __init__(self, layout: Mapping[str, Any], name: str = ''):
+        """初期化（テンプレート全体を1つの描画関数にコンパイル。文書ツリー用のセクションごとの関数は初回に作る）"""
+        self.name = name or layout.get('name', '')
+        self.flags = dict(layout.get('flags', {}))
+        self.features = FeatureMatcher(self.flags.items())
+        self.pages = self.page_list(layout)
+        self.sections = self.build_sections(layout)
+        self.section_lines = self.build_section_lines(layout)
+        self.template = ''.join(text for _, text in self.sections)
+        self._render = compile_template(self.template)
+        self._section_renders = None
+    
+    @staticmethod
+    def _text(lines: Sequence[str]) -> str:
+        """行のリストをテンプレート文字列に（ブロックのタグだけの行は改行を付けない）"""
+        return ''.join(line.strip() if STANDALONE_PATTERN.match(line) else f"{line}\n" for line in lines)
+    
+    @staticmethod
+    def page_list(layout: Mapping[str, Any]) -> List[Dict[str, Any]]:
+        """ページ一覧 [{'number', 'title'}]"""
+        return [
+            {'number': number, 'title': page['title']}
+            for number, page in enumerate(layout['pages'], 1)
+        ]
+    
+    @staticmethod
+    def _expand_pages(text: str, pages: Sequence[Mapping[str, Any]]) -> str:
+        """{{#each pages}}…{{/each}} をページ数分の固定文字列に展開"""
+        def expand(match):
+            return ''.join(
+                match.group(1).replace('{{number}}', str(page['number'])).replace('{{title}}', page['title'])
+                for page in pages
+            )
+        return PAGES_PATTERN.sub(expand, text)
+    
+    @classmethod
+    def build_sections(cls, layout: Mapping[str, Any]) -> List[Tuple[Optional[int], str]]:
+        """レイアウトJSONをセクション（ヘッダー・各ページ・フッター）ごとのテンプレート文字列に組み立てる
+        
+        [(ページ番号（ヘッダー・フッターは None）, テンプレート文字列)] の順につなげるとテンプレート全体になる。
+        """
+        pages = cls.page_list(layout)
+        heading = layout.get('page_heading', '')
+        sections = [(None, cls._text(layout.get('header', [])))]
+        for number, page in enumerate(layout['pages'], 1):
+            sections.append((number, heading.replace('{{number}}', str(number)) + cls._text(page.get('body', []))))
+        sections.append((None, cls._text(layout.get('footer', []))))
+        return [(number, cls._expand_pages(text, pages)) for number, text in sections]
+    
+    @classmethod
+    def build_section_lines(cls, layout: Mapping[str, Any]) -> List[List[str]]:
+        """build_sections と同じ順のセクションごとの行のリスト（文書ツリー用。ページ一覧は行ごとに展開する）"""
+        pages = cls.page_list(layout)
+        heading = layout.get('page_heading', '')
+        sections = [list(layout.get('header', []))]
+        for number, page in enumerate(layout['pages'], 1):
+            # 見出しの最後の改行より後ろは本文の1行目の先頭につながる
+            head = heading.replace('{{number}}', str(number)).split('\n')
+            body = list(page.get('body', []))
+            if head[-1]:
+                body[:1] = [head[-1] + ''.join(body[:1])]
+            sections.append(head[:-1] + body)
+        sections.append(list(layout.get('footer', [])))
+        return [cls._expand_page_lines(lines, pages) for lines in sections]
+    
+    @classmethod
+    def _expand_page_lines(cls, lines: Sequence[str], pages: Sequence[Mapping[str, Any]]) -> List[str]:
+        """タグだけの行の {{#each pages}}…{{/each}} をページ数分の行に展開（1行の中のものは _expand_pages）"""
+        expanded = []
+        position = 0
+        while position < len(lines):
+            line = lines[position]
+            position += 1
+            if not PAGES_START_PATTERN.match(line):
+                expanded.append(cls._expand_pages(line, pages))
+                continue
+            end = position
+            while end < len(lines) and not PAGES_END_PATTERN.match(lines[end]):
+                end += 1
+            for page in pages:
+                expanded.extend(
+                    body.replace('{{number}}', str(page['number'])).replace('{{title}}', page['title'])
+                    for body in lines[position:end]
+                )
+            position = end + 1
+        return expanded
+    
+    @classmethod
+    def build_template(cls, layout: Mapping[str, Any]) -> str:
+        """レイアウトJSONを1つのテンプレート文字列に組み立てる"""
+        return ''.join(text for _, text in cls.build_sections(layout))
+    
+    def sales_point_flags(self, sales_points: Sequence[str]) -> Dict[str, bool]:
+        """各フラグのキーワードがいずれかのセールスポイントに含まれるか（全キーワードを1回の走査で照合）"""
+        return self.features.flag_dict(self.features.flags(sales_points))
+    
+    def render(self, context: Mapping[str, Any]) -> str:
+        """コンテキスト（商品ごとの値・フラグ）でLPラフ案を描画"""
+        return self._render(context)
+    
+    def render_document(self, context: Mapping[str, Any], previous: Optional[Mapping[str, Any]] = None,
+                        **meta: Any) -> Dict[str, Any]:
+        """コンテキストでLPラフ案を文書ツリーとして描画（to_markdown の結果は render と同じ）
+        
+        ヘッダー・フッターは section ノード、各ページは page ノードになり、それぞれ入力のハッシュを持つ。
+        previous（前回のツリー）を渡すと、入力が変わっていないセクションは描画せずに前回のノードを使う。
+        {{#if}} / {{#each}} はセクションをまたげない。
+        """
+        reusable = reusable_nodes(previous)
+        blocks = []
+        for index, number, render_blocks, names, base_hash in self._compile_sections():
+            # セクションの入力（テンプレート・ページ番号・タイトル・参照する値）のハッシュ
+            digest = base_hash.copy()
+            digest.update(json.dumps(
+                [context.get(name, '') for name in names], ensure_ascii=False, default=str
+            ).encode('utf-8'))
+            input_hash = digest.hexdigest()
+            if input_hash in reusable:
+                blocks.append(reusable[input_hash])
+                continue
+            
+            section_blocks = render_blocks(context)
+            if number is not None:
+                node = page(number, section_blocks, self.pages[number - 1]['title'])
+            else:
+                node = section('header' if index == 0 else 'footer', section_blocks)
+            node['input_hash'] = input_hash
+            blocks.append(node)
+        return document(blocks, layout=self.name, **meta)
+    
+    def _compile_sections(self) -> List[Tuple[int, Optional[int], Callable[[Mapping[str, Any]], List[Dict[str, Any]]], List[str], Any]]:
+        """セクションごとの (位置, ページ番号, ブロックの描画関数, 参照する名前, テンプレート部分のハッシュ)（初回だけ作る）"""
+        if self._section_renders is None:
+            self._section_renders = []
+            for index, ((number, text), lines) in enumerate(zip(self.sections, self.section_lines)):
+                title = self.pages[number - 1]['title'] if number is not None else ''
+                base_hash = hashlib.sha256(f"{SECTION_BUILD_VERSION}\0{number}\0{title}\0{text}\0".encode('utf-8'))
+                self._section_renders.append((index, number, compile_blocks(lines), template_names(text), base_hash))
+        return self._section_renders
+
+def layout_path(name: str) -> str:
+    """レイアウト名（またはJSONファイルのパス）からファイルパスを求める"""
+    if name.endswith('.json') or os.sep in name:
+        return name
+    return os.path.join(LAYOUT_DIR, f"{name}.json")
+
+@lru_cache(maxsize=None)
+def _load_layout(path: str, mtime_ns: int) -> LPLayout:
+    with open(path, 'r', encoding='utf-8') as f:
+        layout = json.load(f)
+    return LPLayout(layout, os.path.splitext(os.path.basename(path))[0])
+
+def load_layout(name: str) -> LPLayout:
+    """レイアウトを読み込んでコンパイル（ファイルが更新されていなければコンパイル済みのものを再利用）"""
+    path = layout_path(name)
+    return _load_layout(path, os.stat(path).st_mtime_ns)
+
+def main():
+    """メイン処理（レイアウトを検証し、コンパイル結果を表示）"""
+    
+    if len(sys.argv) < 2:
+        print("使用方法:")
+        print("  python lp_template.py <レイアウト名|レイアウトJSON> [--source]")
+        print("\n例:")
+        print("  python lp_template.py correct_lp_rough")
+        print("  python lp_template.py templates/layouts/correct_lp_rough.json --source")
+        sys.exit(1)
+    
+    try:
+        layout = load_layout(sys.argv[1])
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ レイアウトを読み込めません: {e}")
+        sys.exit(1)
+    
+    if '--source' in sys.argv:
+        print(compile_source(layout.template))
+        return
+    
+    print(f"✅ {layout.name}: {len(layout.pages)}ページ / フラグ {len(layout.flags)}個")
+    for page in layout.pages:
+        print(f"  {page['number']}枚目: {page['title']}")
+
+if __name__ == "__main__":
+    main()
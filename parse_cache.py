@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+入力ファイル解析結果の共有キャッシュ
+ファイル内容のハッシュ＋パーサー名＋パーサーバージョンをキーに解析済みデータを保存します
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import inspect
+import functools
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, Sequence
+
+CACHE_PATH = os.getenv('LP_PARSE_CACHE_PATH', os.path.join('.cache', 'parse_cache.sqlite3'))
+CACHE_MAX_BYTES = int(os.getenv('LP_PARSE_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+
+# 子プロセス（バッチ処理のワーカー）にも引き継ぐため環境変数で無効化を伝える
+NO_CACHE_ENV = 'LP_NO_CACHE'
+
+def file_sha256(path: str) -> str:
+    """ファイル内容のSHA-256ハッシュを計算"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def set_cache_enabled(enabled: bool):
+    """キャッシュの有効/無効を切り替え（--no-cache 用）"""
+    if enabled:
+        os.environ.pop(NO_CACHE_ENV, None)
+    else:
+        os.environ[NO_CACHE_ENV] = '1'
+
+def is_cache_enabled() -> bool:
+    """キャッシュが有効か"""
+    return os.environ.get(NO_CACHE_ENV, '') in ('', '0')
+
+class ParseCache:
+    """SQLiteに保存する、サイズ上限付きLRUの解析キャッシュ"""
+    
+    def __init__(self, path: str = CACHE_PATH, max_bytes: int = CACHE_MAX_BYTES):
+        """初期化"""
+        self.path = path
+        self.max_bytes = max_bytes
+        
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS parse_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    parser TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    value TEXT NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_parse_cache_access ON parse_cache (last_access)")
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """接続を開き、抜けるときにコミット（例外ならロールバック）して閉じる"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def make_key(content_hash: str, parser: str, version: int, extra: str = '') -> str:
+        """キャッシュキーを生成"""
+        return f"{parser}:v{version}:{content_hash}:{extra}"
+    
+    def get(self, cache_key: str) -> Optional[Any]:
+        """キャッシュを取得（ヒットした場合は最終アクセス時刻を更新）"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM parse_cache WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE parse_cache SET last_access = ? WHERE cache_key = ?", (time.time(), cache_key)
+            )
+        return json.loads(row[0])
+    
+    def put(self, cache_key: str, parser: str, content_hash: str, value: Any):
+        """キャッシュを保存し、上限を超えた分を古い順に削除"""
+        payload = json.dumps(value, ensure_ascii=False)
+        size = len(payload.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO parse_cache (cache_key, parser, content_hash, size, value, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (cache_key, parser, content_hash, size, payload, time.time())
+            )
+            self._evict(conn)
+    
+    def _evict(self, conn: sqlite3.Connection):
+        """合計サイズが上限以下になるまで最終アクセスの古いものから削除"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM parse_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        evict_keys = []
+        for cache_key, size in conn.execute("SELECT cache_key, size FROM parse_cache ORDER BY last_access"):
+            evict_keys.append((cache_key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        conn.executemany("DELETE FROM parse_cache WHERE cache_key = ?", evict_keys)
+    
+    def clear(self):
+        """キャッシュを全削除"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM parse_cache")
+
+_cache_instance = None
+
+def get_parse_cache() -> ParseCache:
+    """プロセス内で共有するキャッシュインスタンスを取得"""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = ParseCache()
+    return _cache_instance
+
+def lookup_cached(path: str, parser: str, version: int, key_values: Sequence[Any] = ()) -> Optional[Any]:
+    """キャッシュ済みの解析結果を取得（未キャッシュ・キャッシュ無効時は None）"""
+    if not is_cache_enabled():
+        return None
+    
+    try:
+        cache = get_parse_cache()
+        extra = json.dumps(list(key_values), ensure_ascii=False)
+        return cache.get(cache.make_key(file_sha256(path), parser, version, extra))
+    except (OSError, sqlite3.Error, ValueError):
+        return None
+
+def store_cached(path: str, parser: str, version: int, value: Any, key_values: Sequence[Any] = ()):
+    """解析結果をキャッシュに保存（キャッシュ無効時・保存できない場合は何もしない）"""
+    if not is_cache_enabled():
+        return
+    
+    try:
+        cache = get_parse_cache()
+        content_hash = file_sha256(path)
+        extra = json.dumps(list(key_values), ensure_ascii=False)
+        cache.put(cache.make_key(content_hash, parser, version, extra), parser, content_hash, value)
+    except (OSError, sqlite3.Error, TypeError, ValueError):
+        pass
+
+def cached_parser(parser: str, version: int, key_args: Sequence[str] = (),
+                  key_extra: Optional[Callable[[], Any]] = None) -> Callable:
+    """入力ファイルのパスを受け取るパーサー関数/メソッドの結果をキャッシュするデコレーター
+
+    パスは self を除く最初の引数とし、key_args に指定した引数もキーに含める。
+    key_extra を渡すと、呼び出し時のその戻り値（読み取りバックエンドなど引数以外の設定）もキーに含める。
+    パーサーの出力形式を変えたときは version を上げること。
+    """
+    
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        path_param = next(name for name in signature.parameters if name != 'self')
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not is_cache_enabled():
+                return func(*args, **kwargs)
+            
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            path = bound.arguments[path_param]
+            key_values = [bound.arguments[name] for name in key_args]
+            if key_extra is not None:
+                key_values.append(key_extra())
+            extra = json.dumps(key_values, ensure_ascii=False)
+            
+            try:
+                cache = get_parse_cache()
+                content_hash = file_sha256(path)
+                cache_key = cache.make_key(content_hash, parser, version, extra)
+                cached = cache.get(cache_key)
+            except (OSError, sqlite3.Error, ValueError):
+                # キャッシュが使えない場合は通常どおり解析する
+                return func(*args, **kwargs)
+            
+            if cached is not None:
+                return cached
+            
+            value = func(*args, **kwargs)
+            try:
+                cache.put(cache_key, parser, content_hash, value)
+            except (TypeError, ValueError, sqlite3.Error):
+                pass
+            return value
+        
+        return wrapper
+    
+    return decorator
+
+def main():
+    """メイン処理（キャッシュ管理）"""
+    import sys
+    
+    if len(sys.argv) < 2 or sys.argv[1] not in ('--clear', '--stats'):
+        print("使用方法:")
+        print("  python parse_cache.py --stats   キャッシュの件数とサイズを表示")
+        print("  python parse_cache.py --clear   キャッシュを全削除")
+        sys.exit(1)
+    
+    cache = get_parse_cache()
+    if sys.argv[1] == '--clear':
+        cache.clear()
+        print(f"🗑️ 解析キャッシュを削除しました: {cache.path}")
+    else:
+        with cache._connect() as conn:
+            count, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parse_cache"
+            ).fetchone()
+        print(f"📦 解析キャッシュ: {cache.path}")
+        print(f"  件数: {count}件")
+        print(f"  サイズ: {total / 1024 / 1024:.1f}MB / 上限 {cache.max_bytes / 1024 / 1024:.0f}MB")
+
+if __name__ == "__main__":
+    main()
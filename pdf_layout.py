@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PDF仕様書のレイアウトを考慮したテキスト抽出
+ページの描画命令から文字列の座標を取り出し、同じ高さの文字列を1行に、表のセルを「項目名：値」の行に組み直します
+ページごとにワーカープロセスで必要な分だけ先読みして抽出し、制限時間を超えたページは空として扱うため、
+異常なページが1つあってもバッチ全体は止まりません
+"""
+
+import os
+import sys
+import multiprocessing
+from collections import deque
+from typing import Dict, Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+import PyPDF2
+from PyPDF2.generic import ContentStream
+from PyPDF2._cmap import build_char_map
+
+from parse_cache import lookup_cached, store_cached
+from spec_field_extractor import FIELD_ALIASES, SALES_POINT_HEADINGS
+
+# 解析キャッシュ上のページテキストの識別子（抽出方法・保存形式を変えたらバージョンを上げる）
+PDF_LAYOUT_PARSER = 'pdf_layout_pages'
+PDF_LAYOUT_VERSION = 2
+
+# 1ページあたりの抽出の制限時間（秒）
+DEFAULT_PAGE_TIMEOUT = 30
+
+# 同じ行とみなす高さの差（フォントサイズに対する比率）
+ROW_TOLERANCE = 0.4
+# 別のセルとみなす文字列間の空き（フォントサイズに対する比率）
+CELL_GAP = 1.5
+# 値の列にそろっているとみなす横位置の差（ポイント）
+COLUMN_TOLERANCE = 4.0
+
+Fragment = Tuple[float, float, float, str]  # (x, y, フォントサイズ, 文字列)
+
+def _multiply(m: Sequence[float], n: Sequence[float]) -> List[float]:
+    """アフィン変換行列 [a b c d e f] の積 m × n"""
+    return [
+        m[0] * n[0] + m[1] * n[2],
+        m[0] * n[1] + m[1] * n[3],
+        m[2] * n[0] + m[3] * n[2],
+        m[2] * n[1] + m[3] * n[3],
+        m[4] * n[0] + m[5] * n[2] + n[4],
+        m[4] * n[1] + m[5] * n[3] + n[5],
+    ]
+
+def _decode(raw: Any, font: Tuple[Any, Dict[str, str]]) -> str:
+    """文字列オペランドをフォントの符号化方式・ToUnicode で文字列に変換"""
+    encoding, char_map = font
+    if isinstance(raw, str):
+        text = raw
+    elif isinstance(encoding, str):
+        try:
+            text = raw.decode(encoding, 'surrogatepass')
+        except Exception:
+            text = raw.decode('utf-16-be' if encoding == 'charmap' else 'charmap', 'surrogatepass')
+    else:
+        text = ''.join(encoding.get(code, chr(code)) for code in raw)
+    return ''.join(char_map.get(char, char) for char in text)
+
+def _text_width(text: str, font_size: float) -> float:
+    """文字列の幅の概算（全角は1em、半角は0.5em）"""
+    return sum(1.0 if ord(char) > 0xFF else 0.5 for char in text) * font_size
+
+def extract_page_fragments(page: Any) -> List[Fragment]:
+    """ページの描画命令を順に処理し、位置指定ごとの文字列と座標を取り出す
+    
+    連続して描画された文字列（間に位置指定がないもの）は1つの断片にまとめる。
+    フォームXObject内の文字列は対象外。
+    """
+    
+    resources = page.get('/Resources')
+    contents = page.get('/Contents')
+    if resources is None or contents is None:
+        return []
+    
+    fonts = {}
+    for font_name in resources.get_object().get('/Font', {}):
+        _, _, encoding, char_map, _ = build_char_map(font_name, 200.0, page)
+        fonts[font_name] = (encoding, char_map)
+    
+    identity = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+    cm = list(identity)
+    cm_stack = []
+    tm = list(identity)
+    tlm = list(identity)
+    leading = 0.0
+    font = ('charmap', {})
+    font_size = 1.0
+    
+    fragments = []
+    current = None  # 位置指定以降に描画中の断片 [x, y, size, text]
+    
+    def show(text: str):
+        nonlocal current
+        if not text:
+            return
+        if current is None:
+            matrix = _multiply(tm, cm)
+            size = font_size * (abs(matrix[3]) or abs(matrix[0]) or 1.0)
+            current = [matrix[4], matrix[5], size, '']
+            fragments.append(current)
+        current[3] += text
+    
+    def next_line(tx: float, ty: float):
+        nonlocal tm, tlm, current
+        tlm = _multiply([1.0, 0.0, 0.0, 1.0, tx, ty], tlm)
+        tm = list(tlm)
+        current = None
+    
+    for operands, operator in ContentStream(contents.get_object(), page.pdf, 'bytes').operations:
+        if operator == b'q':
+            cm_stack.append(cm)
+        elif operator == b'Q':
+            cm = cm_stack.pop() if cm_stack else list(identity)
+        elif operator == b'cm':
+            cm = _multiply([float(value) for value in operands], cm)
+            current = None
+        elif operator == b'BT':
+            tm = list(identity)
+            tlm = list(identity)
+            current = None
+        elif operator == b'Tm':
+            tm = [float(value) for value in operands]
+            tlm = list(tm)
+            current = None
+        elif operator == b'Td':
+            next_line(float(operands[0]), float(operands[1]))
+        elif operator == b'TD':
+            leading = -float(operands[1])
+            next_line(float(operands[0]), float(operands[1]))
+        elif operator == b'TL':
+            leading = float(operands[0])
+        elif operator == b'T*':
+            next_line(0.0, -leading)
+        elif operator == b'Tf':
+            font = fonts.get(operands[0], ('charmap', {}))
+            font_size = float(operands[1])
+        elif operator == b'Tj':
+            show(_decode(operands[0], font))
+        elif operator in (b"'", b'"'):
+            next_line(0.0, -leading)
+            show(_decode(operands[-1], font))
+        elif operator == b'TJ':
+            for item in operands[0]:
+                if isinstance(item, (str, bytes)):
+                    show(_decode(item, font))
+                elif float(item) < -250:
+                    # 大きな詰め戻しは単語間の空白
+                    show(' ')
+    
+    return [
+        (x, y, size, text.strip())
+        for x, y, size, text in fragments
+        if text.strip()
+    ]
+
+def group_rows(fragments: Sequence[Fragment]) -> List[List[Tuple[float, str]]]:
+    """断片を上から下の行に分け、各行を左から右の (x, セル文字列) の並びにする"""
+    
+    rows = []
+    for x, y, size, text in sorted(fragments, key=lambda fragment: (-fragment[1], fragment[0])):
+        if rows and abs(rows[-1][0] - y) <= max(rows[-1][1], size) * ROW_TOLERANCE:
+            rows[-1][2].append((x, size, text))
+        else:
+            rows.append((y, size, [(x, size, text)]))
+    
+    grouped = []
+    for _, _, items in rows:
+        cells = []
+        end = None
+        for x, size, text in sorted(items):
+            if cells and end is not None and x - end <= size * CELL_GAP:
+                cells[-1] = (cells[-1][0], cells[-1][1] + text)
+            else:
+                cells.append((x, text))
+            end = x + _text_width(text, size)
+        grouped.append(cells)
+    return grouped
+
+def _label(cell: str) -> str:
+    """セルの見出し部分（【】・末尾のコロンを除く）"""
+    return cell.strip('【】[]■ 　').rstrip('：:').strip()
+
+def rows_to_lines(rows: Sequence[Sequence[Tuple[float, str]]]) -> List[str]:
+    """行を SpecFieldExtractor が読める「項目名：値」形式の行に組み直す
+    
+    1列目が既知の項目名なら残りのセルを値とし、次の行以降で値の列にだけ文字列がある行は
+    同じ項目の続き（JANのバリエーション行など）として扱う。
+    1列目がセールスポイントの見出しなら、見出しと値を別々の行にする。
+    """
+    
+    lines = []
+    key = None
+    value_x = None
+    for cells in rows:
+        label = _label(cells[0][1])
+        
+        if label in SALES_POINT_HEADINGS:
+            lines.append(label)
+            lines.extend(text for _, text in cells[1:])
+            key, value_x = None, cells[1][0] if len(cells) > 1 else None
+        elif label in FIELD_ALIASES and len(cells) > 1:
+            key, value_x = label, cells[1][0]
+            lines.append(f"{key}：{' '.join(text for _, text in cells[1:])}")
+        elif value_x is not None and abs(cells[0][0] - value_x) <= COLUMN_TOLERANCE:
+            # 値の列の続き
+            text = ' '.join(text for _, text in cells)
+            lines.append(f"{key}：{text}" if key else text)
+        else:
+            key, value_x = None, None
+            lines.append(' '.join(text for _, text in cells))
+    return lines
+
+def extract_page_text(page: Any) -> str:
+    """1ページをレイアウトを考慮して抽出（座標が取れないページは通常のテキスト抽出）"""
+    fragments = extract_page_fragments(page)
+    if not fragments:
+        return page.extract_text() or ""
+    return "\n".join(rows_to_lines(group_rows(fragments)))
+
+def extract_plain_text(page: Any) -> str:
+    """1ページを通常のテキスト抽出（レイアウトを考慮しない）"""
+    return page.extract_text() or ""
+
+# ワーカープロセスごとに開いたPDFとページの抽出関数
+_worker_reader = None
+_worker_extract = None
+
+def _init_layout_worker(pdf_path: str, extract: Callable[[Any], str] = extract_page_text):
+    """ワーカープロセスの初期化（PDFを1回だけ開く）"""
+    global _worker_reader, _worker_extract
+    _worker_reader = PyPDF2.PdfReader(pdf_path)
+    _worker_extract = extract
+
+def _extract_worker_page(index: int) -> str:
+    """ワーカー処理: index 番目のページを抽出"""
+    return _worker_extract(_worker_reader.pages[index])
+
+def count_pages(pdf_path: str) -> int:
+    """PDFのページ数"""
+    with open(pdf_path, 'rb') as file:
+        return len(PyPDF2.PdfReader(file).pages)
+
+def _iter_worker_pages(pdf_path: str, extract: Callable[[Any], str], start: int, page_count: int,
+                       page_timeout: float, max_workers: Optional[int],
+                       report: Dict[str, List[int]]) -> Iterator[Tuple[str, bool]]:
+    """start 番目以降のページをワーカープロセスで先読みしながら抽出し、(テキスト, 成功したか) を順に返す
+    
+    投入するのは返していないページのうち先頭からワーカー数の2倍までなので、呼び出し側が途中で
+    読むのをやめれば残りのページは抽出しない。各ページの結果は get(timeout) で待ち、制限時間を
+    超えたページは空文字とする。止まったワーカーはプールごと破棄し、終わっていないページは
+    新しいプールで抽出し直す。report の timed_out / failed に1始まりのページ番号を追加する。
+    """
+    
+    max_workers = max_workers or os.cpu_count() or 1
+    window = max_workers * 2
+    pending = deque(range(start, page_count))  # 未投入のページ
+    in_flight = deque()  # 投入済みのページ (index, 結果)
+    finished = {}  # プールを破棄する前に終わっていたページ index → (テキスト, 成功したか)
+    pool = None
+    try:
+        for index in range(start, page_count):
+            if index in finished:
+                yield finished.pop(index)
+                continue
+            
+            if pool is None:
+                pool = multiprocessing.Pool(max(1, min(max_workers, len(pending))), _init_layout_worker, (pdf_path, extract))
+            while pending and len(in_flight) < window:
+                next_index = pending.popleft()
+                in_flight.append((next_index, pool.apply_async(_extract_worker_page, (next_index,))))
+            
+            _, result = in_flight.popleft()
+            try:
+                yield result.get(timeout=page_timeout), True
+            except multiprocessing.TimeoutError:
+                report['timed_out'].append(index + 1)
+                # 終わっているページの結果だけ受け取り、残りはプールを作り直して再投入
+                retry = []
+                for later_index, later_result in in_flight:
+                    if not later_result.ready():
+                        retry.append(later_index)
+                    elif later_result.successful():
+                        finished[later_index] = (later_result.get(), True)
+                    else:
+                        report['failed'].append(later_index + 1)
+                        finished[later_index] = ("", False)
+                in_flight.clear()
+                pending.extendleft(reversed(retry))
+                pool.terminate()
+                pool.join()
+                pool = None
+                yield "", False
+            except Exception:
+                report['failed'].append(index + 1)
+                yield "", False
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+def iter_extracted_pages(pdf_path: str, extract: Callable[[Any], str] = extract_page_text,
+                         parser: str = PDF_LAYOUT_PARSER, version: int = PDF_LAYOUT_VERSION,
+                         page_timeout: float = DEFAULT_PAGE_TIMEOUT, max_workers: Optional[int] = None,
+                         report: Optional[Dict[str, List[int]]] = None) -> Iterator[str]:
+    """PDFのページテキストを先頭から1ページずつ返す（ワーカープロセスで先読み、途中でやめれば残りは抽出しない）
+    
+    解析キャッシュには先頭から続けて抽出できたページだけを {'page_count', 'pages'} として保存し、
+    次回はキャッシュ済みのページを返してから続きだけを抽出する。制限時間を超えたり失敗したりした
+    ページ以降は保存しないので、一時的に遅い・落ちるページが空のままキャッシュに残ることはない。
+    """
+    
+    if report is None:
+        report = {'timed_out': [], 'failed': []}
+    cached = lookup_cached(pdf_path, parser, version)
+    if cached is None:
+        cached = {'page_count': count_pages(pdf_path), 'pages': []}
+    page_count = cached['page_count']
+    pages = list(cached['pages'])
+    
+    try:
+        yield from cached['pages']
+        clean = True
+        for text, ok in _iter_worker_pages(pdf_path, extract, len(pages), page_count,
+                                           page_timeout, max_workers, report):
+            clean = clean and ok
+            if clean:
+                pages.append(text)
+            yield text
+    finally:
+        # 途中で読むのをやめた場合も、新しく抽出できた先頭からのページは保存する
+        if len(pages) > len(cached['pages']):
+            store_cached(pdf_path, parser, version, {'page_count': page_count, 'pages': pages})
+
+def iter_layout_pages(pdf_path: str, page_timeout: float = DEFAULT_PAGE_TIMEOUT,
+                      max_workers: Optional[int] = None,
+                      report: Optional[Dict[str, List[int]]] = None) -> Iterator[str]:
+    """レイアウトを考慮して組み直したページテキストを先頭から1ページずつ返す"""
+    return iter_extracted_pages(pdf_path, extract_page_text, PDF_LAYOUT_PARSER, PDF_LAYOUT_VERSION,
+                                page_timeout, max_workers, report)
+
+def extract_layout_pages(pdf_path: str, page_timeout: float = DEFAULT_PAGE_TIMEOUT,
+                         max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """全ページをワーカープロセスで抽出し、{'pages', 'timed_out', 'failed'} を返す
+
+    制限時間を超えた・失敗したページは空文字。timed_out / failed は1始まりのページ番号。
+    """
+    report = {'timed_out': [], 'failed': []}
+    pages = list(iter_layout_pages(pdf_path, page_timeout, max_workers, report))
+    return {'pages': pages, 'timed_out': sorted(report['timed_out']), 'failed': sorted(report['failed'])}
+
+def main():
+    """メイン処理（組み直した各ページのテキストを表示）"""
+    
+    if len(sys.argv) < 2:
+        print("使用方法:")
+        print("  python pdf_layout.py <PDFファイル> [--page-timeout <秒>]")
+        print("\n例:")
+        print("  python pdf_layout.py data/spec_sheet.pdf --page-timeout 10")
+        sys.exit(1)
+    
+    pdf_path = sys.argv[1]
+    if not os.path.exists(pdf_path):
+        print(f"❌ PDFファイルが見つかりません: {pdf_path}")
+        sys.exit(1)
+    
+    page_timeout = DEFAULT_PAGE_TIMEOUT
+    if '--page-timeout' in sys.argv:
+        try:
+            page_timeout = float(sys.argv[sys.argv.index('--page-timeout') + 1])
+        except (IndexError, ValueError):
+            print("❌ --page-timeout には秒数を指定してください")
+            sys.exit(1)
+    if not page_timeout > 0:
+        print(f"❌ --page-timeout には0より大きい秒数を指定してください: {page_timeout}")
+        sys.exit(1)
+    
+    result = extract_layout_pages(pdf_path, page_timeout)
+    for number, text in enumerate(result['pages'], 1):
+        print(f"===== {number}ページ =====")
+        print(text)
+    
+    if result['timed_out']:
+        print(f"⚠️ 制限時間（{page_timeout:g}秒）を超えたページ: {', '.join(map(str, result['timed_out']))}")
+    if result['failed']:
+        print(f"⚠️ 抽出に失敗したページ: {', '.join(map(str, result['failed']))}")
+
+if __name__ == "__main__":
+    main()
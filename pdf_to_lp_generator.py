@@ -6,126 +6,99 @@ PDFプレスリリースからLPラフ案を直接生成するスクリプト
 
 import os
 import sys
-import json
-import PyPDF2
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional
 from lp_rough_generator import LPRoughGenerator
+from spec_field_extractor import SpecFieldExtractor
+from pdf_layout import DEFAULT_PAGE_TIMEOUT, extract_plain_text, iter_extracted_pages, iter_layout_pages
+from parse_cache import set_cache_enabled
+from input_router import INPUT_TYPE_PDF, InputTypeError, require_input_type
 from docbase_lp_uploader import DocbaseLPUploader
 
+# 解析キャッシュ上のページテキストの識別子（抽出方法・保存形式を変えたらバージョンを上げる）
+PDF_PAGES_PARSER = 'pdf_pages'
+PDF_PAGES_VERSION = 2
+
+def iter_pdf_pages(pdf_path: str, page_timeout: float = DEFAULT_PAGE_TIMEOUT,
+                   max_workers: Optional[int] = None,
+                   report: Optional[Dict[str, List[int]]] = None) -> Iterator[str]:
+    """PDFのページテキスト（通常のテキスト抽出）を先頭から1ページずつ返す
+    
+    ページはワーカープロセスで並列に先読みし、抽出できたページは解析キャッシュに保存する。
+    呼び出し側が途中で読むのをやめれば、残りのページは抽出しない。
+    """
+    return iter_extracted_pages(pdf_path, extract_plain_text, PDF_PAGES_PARSER, PDF_PAGES_VERSION,
+                                page_timeout, max_workers, report)
+
 class PDFToLPGenerator:
-    def __init__(self):
-        """初期化"""
+    def __init__(self, layout: bool = True, page_timeout: float = DEFAULT_PAGE_TIMEOUT):
+        """初期化（layout=False なら表の座標を使わない従来のテキスト抽出）"""
         self.lp_generator = LPRoughGenerator()
+        self.layout = layout
+        self.page_timeout = page_timeout
         
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """PDFからテキストを抽出"""
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
+            return "".join(f"{page}\n" for page in iter_pdf_pages(pdf_path, self.page_timeout))
         except Exception as e:
             print(f"❌ PDF読み込みエラー: {e}")
             return ""
     
-    def parse_powerarq_blanket_data(self, pdf_text: str) -> Dict[str, Any]:
-        """PowerArQ Electric Blanket Liteの情報を解析してLP用データに変換"""
+    def extract_spec_fields(self, pdf_path: str) -> Dict[str, Any]:
+        """PDFから商品スペック項目を抽出（必須項目が揃った時点で以降のページは読まない）"""
+        
+        extractor = SpecFieldExtractor()
+        report = {'timed_out': [], 'failed': []}
+        if self.layout:
+            # 表のセルを座標から「項目名：値」に組み直したページで抽出（ページごとに制限時間あり）
+            pages = iter_layout_pages(pdf_path, self.page_timeout, report=report)
+        else:
+            pages = iter_pdf_pages(pdf_path, self.page_timeout, report=report)
+        try:
+            fields = extractor.extract(pages)
+        finally:
+            # 必須項目が揃ったら先読み中のワーカーも止める
+            pages.close()
+        
+        if report['timed_out']:
+            timed_out = ', '.join(map(str, sorted(report['timed_out'])))
+            print(f"⚠️ 制限時間（{self.page_timeout:g}秒）を超えたためスキップしたページ: {timed_out}")
+        if report['failed']:
+            print(f"⚠️ 抽出に失敗したページ: {', '.join(map(str, sorted(report['failed'])))}")
+        
+        print(f"📄 読み取りページ数: {extractor.pages_read}")
+        if extractor.invalid_jans:
+            print(f"⚠️ チェックデジットが一致しないため除外したJAN: {', '.join(extractor.invalid_jans)}")
+        missing_fields = extractor.missing_fields()
+        if missing_fields:
+            print(f"⚠️ 抽出できなかった項目: {', '.join(missing_fields)}")
+        
+        return fields
+    
+    def parse_pdf_product_data(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """抽出したスペック項目をLP用データに変換"""
+        
+        product_name = fields.get('商品名', '商品名不明')
+        sales_points = fields.get('セールスポイント', [])
+        
+        specifications = {}
+        for key in ('サイズ', '重量', '定格'):
+            if fields.get(key):
+                specifications[key] = fields[key]
         
-        # 基本的な商品データ構造
         product_data = {
-            'product_name': 'PowerArQ Electric Blanket Lite',
-            'purpose': 'PowerArQ Electric Blanket Liteの販売促進とブランド認知向上',
-            'price': '9,000円（税込）',
-            'release_date': '2025年10月上旬',
-            'main_features': [
-                '10段階の温度調節機能',
-                '1〜8時間のタイマー機能', 
-                '過熱防止機能による安全性',
-                '軽量設計（2.0kg）',
-                '大判サイズ（188cm×130cm）'
-            ],
-            'specifications': {
-                'サイズ': '188cm × 130cm',
-                '重量': '2.0kg',
-                '消費電力': '100V 115W',
-                '温度調節': '10段階',
-                'タイマー': '1〜8時間',
-                '安全機能': '過熱防止機能'
-            },
-            'design_variants': ['グレー系', 'ベージュ系'],
-            'target_users': ['寒がりの方', '電気代を節約したい方', 'テレワーカー', '高齢者'],
-            'usage_scenes': ['リビング', '寝室', '書斎', 'オフィス'],
-            'brand_value': 'PowerARQブランドの信頼性と品質',
+            'product_name': product_name,
+            'purpose': f'{product_name}の販売促進とブランド認知向上',
+            'target_platform': 'ECサイト',
+            'release_date': fields.get('発売日', ''),
+            'main_features': '\n'.join(f'• {point}' for point in sales_points),
+            'sales_points': sales_points,
+            'specifications': specifications,
+            'specs': '\n'.join(f'{key}：{value}' for key, value in specifications.items()),
             'sku_list': [
-                {'type': 'グレー', 'sku': 'PAQ-BLANKET-LITE-GR', 'jan': '4573211999999'},
-                {'type': 'ベージュ', 'sku': 'PAQ-BLANKET-LITE-BG', 'jan': '4573211999998'}
-            ],
-            'lp_structure': [
-                'TOPキャッチ・商品紹介',
-                'PowerARQブランドの信頼性',
-                'メイン機能・10段階温度調節',
-                'タイマー機能・省エネ性',
-                '使用シーン・ライフスタイル提案',
-                'サイズ・スペック詳細',
-                'カラーバリエーション',
-                '安全機能・品質保証',
-                'よくある質問',
-                '購入特典・キャンペーン情報'
-            ],
-            'page_details': [
-                {
-                    'text': 'PowerArQ Electric Blanket Lite\n\n心地よい温もりを、もっと身近に\n\n• 10段階の細かい温度調節\n• 軽量2.0kgで持ち運び便利\n• 1〜8時間タイマー機能',
-                    'layout_note': '商品の温かみを感じるメインビジュアル',
-                    'has_images': True
-                },
-                {
-                    'text': 'PowerARQブランド\n\n信頼と品質の証\n\n累計販売台数◯万台突破\n※2025年◯月時点',
-                    'layout_note': 'ブランドロゴと実績を前面に',
-                    'has_images': True
-                },
-                {
-                    'text': '10段階の温度調節\n\nあなた好みの温かさを\n\n細かな調節で快適温度をキープ',
-                    'layout_note': '温度調節の操作イメージ',
-                    'has_images': True
-                },
-                {
-                    'text': 'タイマー機能で省エネ\n\n1〜8時間の設定で\n電気代を抑えながら快適に',
-                    'layout_note': 'タイマー設定画面とコスト比較',
-                    'has_images': True
-                },
-                {
-                    'text': 'いつでも、どこでも温かく\n\nリビング・寝室・書斎\nあらゆるシーンで活躍',
-                    'layout_note': '様々な使用シーンの写真',
-                    'has_images': True
-                },
-                {
-                    'text': '仕様・スペック\n\nサイズ：188cm × 130cm\n重量：2.0kg\n消費電力：100V 115W',
-                    'layout_note': 'スペック表とサイズ感の比較',
-                    'has_images': True
-                },
-                {
-                    'text': 'カラーバリエーション\n\nグレー・ベージュの2色展開\nお部屋に合わせてお選びください',
-                    'layout_note': '2色並べたカラー比較',
-                    'has_images': True
-                },
-                {
-                    'text': '安全機能搭載\n\n過熱防止機能で安心\nPSEマーク取得済み',
-                    'layout_note': '安全認証マークと機能説明',
-                    'has_images': True
-                },
-                {
-                    'text': 'よくある質問\n\nQ: 電気代はどのくらい？\nA: 1時間あたり約◯円（中温時）',
-                    'layout_note': 'FAQ形式で見やすく',
-                    'has_images': False
-                },
-                {
-                    'text': '今なら特典付き\n\n送料無料\n1年間の品質保証',
-                    'layout_note': '特典内容を目立たせて',
-                    'has_images': True
-                }
+                {'type': item['label'], 'sku': '', 'jan': item['jan']}
+                for item in fields.get('JAN', [])
             ]
         }
         
@@ -135,16 +108,21 @@ class PDFToLPGenerator:
         """PDFからLPラフ案を生成"""
         print(f"\n📄 PDF解析開始: {pdf_path}")
         
-        # PDFテキスト抽出
-        pdf_text = self.extract_text_from_pdf(pdf_path)
-        if not pdf_text.strip():
-            print("❌ PDFからテキストを抽出できませんでした")
+        # スペック項目抽出
+        try:
+            fields = self.extract_spec_fields(pdf_path)
+        except Exception as e:
+            print(f"❌ PDF読み込みエラー: {e}")
+            return None
+        
+        if not fields:
+            print("❌ PDFから商品情報を抽出できませんでした")
             return None
         
-        print("✅ PDFテキスト抽出完了")
+        print("✅ PDFスペック項目抽出完了")
         
-        # 商品データ生成（PowerArQ Electric Blanket Lite専用）
-        product_data = self.parse_powerarq_blanket_data(pdf_text)
+        # 商品データ生成
+        product_data = self.parse_pdf_product_data(fields)
         print(f"✅ 商品データ解析完了: {product_data['product_name']}")
         
         # LPラフ案生成
@@ -174,7 +152,9 @@ class PDFToLPGenerator:
             try:
                 uploader = DocbaseLPUploader()
                 title = f"【LPラフ案】{product_data['product_name']}"
-                tags = ['LPラフ案', 'PowerArQ', '電気毛布', 'PDF生成']
+                tags = ['LPラフ案', 'PDF生成']
+                if 'PowerArQ' in product_data['product_name']:
+                    tags.extend(['PowerArQ', '電気毛布'])
                 
                 print(f"\n📤 Docbaseにアップロード中...")
                 docbase_result = uploader.create_lp_post(title, lp_content, tags)
@@ -195,21 +175,44 @@ def main():
     
     if len(sys.argv) < 2:
         print("使用方法:")
-        print("  python pdf_to_lp_generator.py <PDFファイル> [--upload]")
+        print("  python pdf_to_lp_generator.py <PDFファイル> [--upload] [--no-cache] [--plain-text] [--page-timeout <秒>]")
+        print("\n  --plain-text          表の座標を使わずにページのテキストをそのまま抽出")
+        print(f"  --page-timeout <秒>   1ページあたりの抽出の制限時間（デフォルト: {DEFAULT_PAGE_TIMEOUT}秒）")
         print("\n例:")
         print("  python pdf_to_lp_generator.py data/press_release.pdf")
         print("  python pdf_to_lp_generator.py data/press_release.pdf --upload")
+        print("  python pdf_to_lp_generator.py data/spec_sheet.pdf --page-timeout 10")
         sys.exit(1)
     
     pdf_path = sys.argv[1]
     upload_flag = '--upload' in sys.argv
     
+    if '--no-cache' in sys.argv:
+        set_cache_enabled(False)
+    
+    page_timeout = DEFAULT_PAGE_TIMEOUT
+    if '--page-timeout' in sys.argv:
+        try:
+            page_timeout = float(sys.argv[sys.argv.index('--page-timeout') + 1])
+        except (IndexError, ValueError):
+            print("❌ --page-timeout には秒数を指定してください")
+            sys.exit(1)
+    if not page_timeout > 0:
+        print(f"❌ --page-timeout には0より大きい秒数を指定してください: {page_timeout}")
+        sys.exit(1)
+    
     if not os.path.exists(pdf_path):
         print(f"❌ PDFファイルが見つかりません: {pdf_path}")
         sys.exit(1)
     
     try:
-        generator = PDFToLPGenerator()
+        require_input_type(pdf_path, [INPUT_TYPE_PDF])
+    except InputTypeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
+    try:
+        generator = PDFToLPGenerator(layout='--plain-text' not in sys.argv, page_timeout=page_timeout)
         result = generator.generate_lp_from_pdf(pdf_path, upload_to_docbase=upload_flag)
         
         if result:
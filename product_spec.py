@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+規定書の商品スペックを保持する軽量レコード
+属性は __slots__ で固定し、従来の product_data 辞書と同じキーで読める Mapping としても使えます
+"""
+
+from collections.abc import Mapping
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+JAN_KEY = "JANコード\n（バリエーション別）"
+
+# 規定書の項目名の列（0始まり）と、連結した規定書で各商品の先頭になる項目
+KISHIMA_KEY_COLUMN = 4
+KISHIMA_BLOCK_KEY = '商品名'
+
+def is_kishima_block_start(row: List[str]) -> bool:
+    """規定書の商品の先頭行（項目名の列が「商品名」で、それより左の列が空の行）か
+    
+    連結した規定書の分割（correct_lp_generator）とオフセット索引（spec_index）で同じ境界を使う。
+    """
+    return (
+        len(row) > KISHIMA_KEY_COLUMN and row[KISHIMA_KEY_COLUMN] == KISHIMA_BLOCK_KEY
+        and not any(row[:KISHIMA_KEY_COLUMN])
+    )
+
+class ProductSpec(Mapping):
+    """規定書の主要項目を属性で持つ商品スペック（未設定の項目は None）"""
+    
+    # 属性名 → 規定書（product_data）のキー
+    FIELD_KEYS = {
+        'name': '商品名',
+        'kana': '商品名カナ',
+        'model_number': 'メーカー型番',
+        'jan_info': JAN_KEY,
+        'size': '商品サイズ(cm)',
+        'weight': '1個 重量(kg)',
+        'power': '定格',
+        'material': '表面素材',
+        'release_date': '発売日',
+        'sales_points': 'セールスポイント',
+    }
+    KEY_FIELDS = {key: field for field, key in FIELD_KEYS.items()}
+    
+    __slots__ = tuple(FIELD_KEYS) + ('extra',)
+    
+    def __init__(self, name: Optional[str] = None, kana: Optional[str] = None,
+                 model_number: Optional[str] = None, jan_info: Optional[str] = None,
+                 size: Optional[str] = None, weight: Optional[str] = None,
+                 power: Optional[str] = None, material: Optional[str] = None,
+                 release_date: Optional[str] = None, sales_points: Optional[List[str]] = None,
+                 extra: Optional[Dict[str, Any]] = None):
+        """初期化"""
+        self.name = name
+        self.kana = kana
+        self.model_number = model_number
+        self.jan_info = jan_info
+        self.size = size
+        self.weight = weight
+        self.power = power
+        self.material = material
+        self.release_date = release_date
+        self.sales_points = sales_points
+        # 主要項目以外の規定書の項目（ない場合は辞書を作らない）
+        self.extra = extra
+    
+    @classmethod
+    def from_items(cls, items: Iterable[Tuple[str, Any]]) -> 'ProductSpec':
+        """(規定書のキー, 値) の並びから生成"""
+        
+        spec = cls()
+        key_fields = cls.KEY_FIELDS
+        for key, value in items:
+            field = key_fields.get(key)
+            if field:
+                setattr(spec, field, value)
+            else:
+                if spec.extra is None:
+                    spec.extra = {}
+                spec.extra[key] = value
+        return spec
+    
+    @classmethod
+    def from_dict(cls, product_data: Dict[str, Any]) -> 'ProductSpec':
+        """従来の product_data 辞書から生成（ProductSpec ならそのまま返す）"""
+        if isinstance(product_data, cls):
+            return product_data
+        return cls.from_items(product_data.items())
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """従来の product_data 辞書に変換"""
+        return dict(self.items())
+    
+    def __getitem__(self, key: str) -> Any:
+        field = self.KEY_FIELDS.get(key)
+        if field:
+            value = getattr(self, field)
+            if value is not None:
+                return value
+        elif self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """dict.get 互換（例外を使わずに引く）"""
+        field = self.KEY_FIELDS.get(key)
+        if field:
+            value = getattr(self, field)
+            return default if value is None else value
+        if self.extra is not None:
+            return self.extra.get(key, default)
+        return default
+    
+    def __iter__(self) -> Iterator[str]:
+        for field, key in self.FIELD_KEYS.items():
+            if getattr(self, field) is not None:
+                yield key
+        if self.extra is not None:
+            yield from self.extra
+    
+    def __len__(self) -> int:
+        count = sum(1 for field in self.FIELD_KEYS if getattr(self, field) is not None)
+        return count + (len(self.extra) if self.extra is not None else 0)
+    
+    def __repr__(self) -> str:
+        return f"ProductSpec({self.to_dict()!r})"
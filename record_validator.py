@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+取り込み直後の商品データをまとめて検証するバリデーター
+スキーマは最初に1回だけチェック関数の並びに変換し、バッチ内の全レコードの問題を1パスで洗い出します
+"""
+
+import os
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from product_spec import JAN_KEY
+
+# レコードの種類（catalog_ingest の --target と同じ値）
+RECORD_TYPE_CORRECT = 'correct'  # 規定書形式（CorrectLPGenerator 用）
+RECORD_TYPE_ROUGH = 'rough'      # LPラフ形式（LPRoughGenerator 用）
+
+# 種類ごとのスキーマ
+#   required: 空でない文字列が必要な項目 / text: あれば文字列 / lists: あれば文字列のリスト
+#   sku_list・page_details: 行の形をチェックするか
+RECORD_SCHEMAS = {
+    RECORD_TYPE_ROUGH: {
+        'required': ('product_name', 'purpose', 'target_platform'),
+        'text': ('catch_copy', 'main_features', 'tonmana_url', 'base_data_url'),
+        'lists': ('lp_structure',),
+        'sku_list': True,
+        'page_details': True,
+    },
+    RECORD_TYPE_CORRECT: {
+        'required': ('商品名',),
+        'text': ('商品名カナ', 'メーカー型番', JAN_KEY, '商品サイズ(cm)', '1個 重量(kg)', '定格'),
+        'lists': ('セールスポイント',),
+        'sku_list': False,
+        'page_details': False,
+    },
+}
+
+# 各ページ詳細の項目 → 期待する型
+PAGE_FIELD_TYPES = {
+    'text': str,
+    'layout_note': str,
+    'images': list,
+    'has_images': bool,
+}
+
+Check = Callable[[Mapping[str, Any], List[str]], None]
+
+def _required_check(keys: Sequence[str]) -> Check:
+    def check(record: Mapping[str, Any], errors: List[str]):
+        for key in keys:
+            value = record.get(key)
+            if value is None or value == '':
+                errors.append(f"必須項目 '{key}' が入力されていません")
+            elif value.__class__ is not str:
+                errors.append(f"'{key}' が文字列ではありません（{type(value).__name__}）")
+    return check
+
+def _text_check(keys: Sequence[str]) -> Check:
+    def check(record: Mapping[str, Any], errors: List[str]):
+        for key in keys:
+            value = record.get(key)
+            if value is not None and value.__class__ is not str:
+                errors.append(f"'{key}' が文字列ではありません（{type(value).__name__}）")
+    return check
+
+def _list_check(keys: Sequence[str]) -> Check:
+    def check(record: Mapping[str, Any], errors: List[str]):
+        for key in keys:
+            value = record.get(key)
+            if value is None:
+                continue
+            if value.__class__ is not list:
+                errors.append(f"'{key}' がリストではありません（{type(value).__name__}）")
+            elif not all(item.__class__ is str for item in value):
+                errors.append(f"'{key}' に文字列以外の項目があります")
+    return check
+
+def _sku_list_check(record: Mapping[str, Any], errors: List[str]):
+    sku_list = record.get('sku_list')
+    if sku_list is None:
+        return
+    if sku_list.__class__ is not list:
+        errors.append(f"'sku_list' がリストではありません（{type(sku_list).__name__}）")
+        return
+    for number, sku in enumerate(sku_list, 1):
+        if sku.__class__ is not dict:
+            errors.append(f"SKU {number}行目が辞書ではありません")
+            continue
+        values = [sku.get(key) for key in ('type', 'sku', 'jan')]
+        if any(value is not None and value.__class__ is not str for value in values):
+            errors.append(f"SKU {number}行目に文字列以外の値があります")
+            continue
+        sku_type, sku_code, jan = values
+        if not sku_code and not jan:
+            errors.append(f"SKU {number}行目（{sku_type or '種類なし'}）にSKU・JANがありません")
+        elif jan and not jan.isdigit():
+            errors.append(f"SKU {number}行目のJANが数字ではありません: {jan}")
+
+def _page_details_check(record: Mapping[str, Any], errors: List[str]):
+    page_details = record.get('page_details')
+    if page_details is None:
+        return
+    if page_details.__class__ is not list:
+        errors.append(f"'page_details' がリストではありません（{type(page_details).__name__}）")
+        return
+    for number, page in enumerate(page_details, 1):
+        if page.__class__ is not dict:
+            errors.append(f"ページ詳細 {number}枚目が辞書ではありません")
+            continue
+        for key, value in page.items():
+            expected = PAGE_FIELD_TYPES.get(key)
+            if expected is None:
+                errors.append(f"ページ詳細 {number}枚目に未知の項目があります: {key}")
+            elif value.__class__ is not expected:
+                errors.append(f"ページ詳細 {number}枚目の '{key}' の型が不正です（{type(value).__name__}）")
+        images = page.get('images')
+        if images.__class__ is list and not all(image.__class__ is str for image in images):
+            errors.append(f"ページ詳細 {number}枚目の画像に文字列以外の項目があります")
+
+def compile_schema(schema: Mapping[str, Any]) -> List[Check]:
+    """スキーマをチェック関数の並びに変換（使わないチェックは含めない）"""
+    
+    checks = []
+    if schema.get('required'):
+        checks.append(_required_check(tuple(schema['required'])))
+    if schema.get('text'):
+        checks.append(_text_check(tuple(schema['text'])))
+    if schema.get('lists'):
+        checks.append(_list_check(tuple(schema['lists'])))
+    if schema.get('sku_list'):
+        checks.append(_sku_list_check)
+    if schema.get('page_details'):
+        checks.append(_page_details_check)
+    return checks
+
+COMPILED_SCHEMAS = {record_type: compile_schema(schema) for record_type, schema in RECORD_SCHEMAS.items()}
+
+def _compiled_checks(record_type: str) -> List[Check]:
+    checks = COMPILED_SCHEMAS.get(record_type)
+    if checks is None:
+        raise ValueError(f"未対応のレコード種類: {record_type}（{' / '.join(COMPILED_SCHEMAS)}）")
+    return checks
+
+def validate_record(record: Mapping[str, Any], record_type: str = RECORD_TYPE_ROUGH) -> List[str]:
+    """1件の商品データを検証し、見つかった問題をすべて返す（問題なしなら空リスト）"""
+    
+    if not isinstance(record, Mapping):
+        return [f"商品データが辞書ではありません（{type(record).__name__}）"]
+    errors = []
+    for check in _compiled_checks(record_type):
+        check(record, errors)
+    return errors
+
+def record_name(record: Any, record_type: str = RECORD_TYPE_ROUGH) -> str:
+    """問題の表示に使う商品名"""
+    if not isinstance(record, Mapping):
+        return '商品名不明'
+    key = '商品名' if record_type == RECORD_TYPE_CORRECT else 'product_name'
+    return record.get(key) or '商品名不明'
+
+def validate_batch(records: Iterable[Any], record_type: str = RECORD_TYPE_ROUGH,
+                   start: int = 0) -> Tuple[List[Tuple[int, Any]], List[Dict[str, Any]]]:
+    """商品データのバッチを1パスで検証し、(正常な (番号, レコード) の一覧, 問題の一覧) を返す
+    
+    番号は start からの通し番号。問題は {'index', 'name', 'errors'} の形で、
+    1件に複数の問題があればすべて errors に含める。
+    """
+    
+    checks = _compiled_checks(record_type)
+    valid = []
+    problems = []
+    for index, record in enumerate(records, start):
+        if not isinstance(record, Mapping):
+            errors = [f"商品データが辞書ではありません（{type(record).__name__}）"]
+        else:
+            errors = []
+            for check in checks:
+                check(record, errors)
+        if errors:
+            problems.append({'index': index, 'name': record_name(record, record_type), 'errors': errors})
+        else:
+            valid.append((index, record))
+    return valid, problems
+
+def print_problems(problems: Sequence[Dict[str, Any]]):
+    """検証で見つかった問題を表示"""
+    for problem in problems:
+        print(f"❌ [{problem['index']}] {problem['name']}: {len(problem['errors'])}件の問題")
+        for error in problem['errors']:
+            print(f"    - {error}")
+
+def main():
+    """メイン処理（入力ファイルを解析して検証結果を表示）"""
+    
+    if len(sys.argv) < 2:
+        print("使用方法:")
+        print("  python record_validator.py <入力ファイル> [<入力ファイル> ...]")
+        print("\n例:")
+        print("  python record_validator.py templates/product_template.csv data/specs/*.csv")
+        sys.exit(1)
+    
+    from input_router import INPUT_TYPE_KISHIMA_CSV, InputTypeError, detect_input_type, parse_input
+    
+    problem_count = 0
+    for file_path in sys.argv[1:]:
+        if not os.path.isfile(file_path):
+            print(f"❌ ファイルが見つかりません: {file_path}")
+            problem_count += 1
+            continue
+        try:
+            input_type = detect_input_type(file_path)
+            record = parse_input(file_path, input_type)
+        except (InputTypeError, ValueError, OSError) as e:
+            print(f"❌ {file_path}: {e}")
+            problem_count += 1
+            continue
+        
+        record_type = RECORD_TYPE_CORRECT if input_type == INPUT_TYPE_KISHIMA_CSV else RECORD_TYPE_ROUGH
+        errors = validate_record(record, record_type)
+        if errors:
+            problem_count += 1
+            print_problems([{'index': file_path, 'name': record_name(record, record_type), 'errors': errors}])
+        else:
+            print(f"✅ {file_path}: {record_name(record, record_type)}")
+    
+    if problem_count:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ストリーミング描画の出力先（ファイル・gzip・ソケット・標準出力）
+各ジェネレーターの iter_* が返す文字列の断片を、全体を1つの文字列にまとめずにそのまま書き出します
+"""
+
+import os
+import sys
+import gzip
+import socket
+from contextlib import contextmanager
+from typing import IO, Iterable, Iterator, Tuple
+
+SOCKET_SCHEME = 'tcp://'
+STDOUT_TARGET = '-'
+
+# 断片をまとめて書き出すバッファの大きさ（文字数）
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+def parse_socket_target(target: str) -> Tuple[str, int]:
+    """tcp://ホスト:ポート を (ホスト, ポート) に分解"""
+    host, separator, port = target[len(SOCKET_SCHEME):].rpartition(':')
+    if not separator or not host or not port.isdigit():
+        raise ValueError(f"ソケットの出力先は tcp://ホスト:ポート で指定してください: {target}")
+    return host.strip('[]'), int(port)
+
+@contextmanager
+def open_sink(target: str, encoding: str = 'utf-8') -> Iterator[IO[str]]:
+    """出力先を文字列を書き込めるファイルとして開く
+
+    tcp://ホスト:ポート はソケット、末尾が .gz のパスは gzip 圧縮ファイル、- は標準出力、
+    それ以外は通常のファイル。
+    """
+    
+    if target == STDOUT_TARGET:
+        yield sys.stdout
+        sys.stdout.flush()
+        return
+    
+    if target.startswith(SOCKET_SCHEME):
+        with socket.create_connection(parse_socket_target(target)) as connection:
+            with connection.makefile('w', encoding=encoding, buffering=DEFAULT_BUFFER_SIZE) as sink:
+                yield sink
+            connection.shutdown(socket.SHUT_WR)
+        return
+    
+    os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+    if target.endswith('.gz'):
+        with gzip.open(target, 'wt', encoding=encoding) as sink:
+            yield sink
+    else:
+        with open(target, 'w', encoding=encoding, buffering=DEFAULT_BUFFER_SIZE) as sink:
+            yield sink
+
+def write_chunks(chunks: Iterable[str], sink: IO[str]) -> int:
+    """断片を順に書き出し、書き出した文字数を返す"""
+    written = 0
+    write = sink.write
+    for chunk in chunks:
+        write(chunk)
+        written += len(chunk)
+    return written
+
+def stream_to(chunks: Iterable[str], target: str, encoding: str = 'utf-8') -> int:
+    """断片を出力先（パス・.gz・tcp://・-）に書き出し、書き出した文字数を返す"""
+    with open_sink(target, encoding) as sink:
+        return write_chunks(chunks, sink)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+セールスポイントの特徴フラグ抽出
+既知のキーワード（10段階・過熱保護・丸洗い・キャンプ・コントローラーなど）を1つの照合器にまとめ、
+セールスポイント全体を1つの文字列にしてから照合することで、フラグごとにリストを走査し直さずに
+該当するフラグの集合を求めます
+"""
+
+import sys
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+Keywords = Union[str, Sequence[str]]
+
+class FeatureMatcher:
+    """キーワード → フラグの多パターン照合器
+    
+    rules は (フラグ, キーワードまたはキーワードのリスト) の並びで、先にあるものほど優先度が高い。
+    """
+    
+    def __init__(self, rules: Iterable[Tuple[str, Keywords]]):
+        """初期化（キーワードを優先度順の (キーワード, フラグ) の並びにまとめる）"""
+        self.flag_order = []
+        self.keywords = []  # (キーワード, フラグ) を優先度順に
+        for flag, keywords in rules:
+            if flag not in self.flag_order:
+                self.flag_order.append(flag)
+            for keyword in ([keywords] if isinstance(keywords, str) else keywords):
+                if '\n' in keyword:
+                    raise ValueError(f"キーワードに改行は使えません: {keyword!r}")
+                if keyword:
+                    self.keywords.append((keyword, flag))
+    
+    def match(self, text: str) -> Set[str]:
+        """テキストに含まれるキーワードのフラグ
+        
+        キーワードごとの判定は文字列の部分一致（C実装の高速検索）で行う。
+        キーワード数十個程度までは、正規表現の選択肢1つにまとめるより速い。
+        """
+        if not text:
+            return set()
+        return {flag for keyword, flag in self.keywords if keyword in text}
+    
+    def flags(self, texts: Iterable[str]) -> FrozenSet[str]:
+        """いずれかのテキストに含まれるキーワードのフラグ（`in` で O(1) 判定できる集合）"""
+        # キーワードは改行をまたがないので、改行でつないだ全文を1回照合すればよい
+        return frozenset(self.match('\n'.join(text for text in texts if text)))
+    
+    def first_flag(self, text: str) -> Optional[str]:
+        """テキストに含まれるフラグのうち最も優先度の高いもの（if/elif の連鎖と同じ判定）"""
+        for keyword, flag in self.keywords:
+            if keyword in text:
+                return flag
+        return None
+    
+    def classify(self, texts: Iterable[str]) -> List[str]:
+        """テキストごとに最も優先度の高いフラグを並べる（該当なしのテキストは除く）"""
+        return [flag for flag in map(self.first_flag, texts) if flag is not None]
+    
+    def flag_dict(self, found: FrozenSet[str]) -> Dict[str, bool]:
+        """フラグ集合をテンプレートのコンテキスト用の {フラグ: 真偽} にする"""
+        return {flag: flag in found for flag in self.flag_order}
+
+def main():
+    """メイン処理（セールスポイントのテキストからフラグを表示）"""
+    
+    if len(sys.argv) < 3:
+        print("使用方法:")
+        print("  python sales_point_features.py <レイアウト名|レイアウトJSON> <セールスポイント> [<セールスポイント> ...]")
+        print("\n例:")
+        print("  python sales_point_features.py correct_lp_rough '●10段階の温度調節' '●丸洗いOK'")
+        sys.exit(1)
+    
+    from lp_template import load_layout
+    
+    try:
+        layout = load_layout(sys.argv[1])
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ レイアウトを読み込めません: {e}")
+        sys.exit(1)
+    
+    found = layout.features.flags(sys.argv[2:])
+    for flag in layout.features.flag_order:
+        print(f"  {'✅' if flag in found else '  '} {flag}")
+
+if __name__ == "__main__":
+    main()
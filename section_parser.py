@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+セクション形式（==== SKU / LP構成 / 各ページ詳細 / その他）の入力を商品データに変換する共通パーサー
+CSV・Excel・pandas・Arrowなど、行を先頭から順に返すイテレータであれば何でも受け付けます
+"""
+
+import re
+from typing import Dict, Any, Iterable, Iterator, Optional, Sequence
+
+# セクション見出しのキーワード → セクション名
+SECTION_KEYWORDS = {
+    'SKU': 'sku',
+    'LP構成': 'structure',
+    '各ページ詳細': 'page_details',
+    'その他': 'other',
+}
+
+# 見出し行の判定（テンプレートによって "===" と "====" の両方があるため3個以上の "=" で判定する）
+MARKER_PREFIX = '==='
+MARKER_PATTERN = re.compile(
+    '={3,}.*?(?P<section>' + '|'.join(map(re.escape, SECTION_KEYWORDS)) + ')'
+)
+
+# 各ページ詳細の行キー（page_<番号>_<項目>）を1回の照合で分解するパターン
+PAGE_KEY_PATTERN = re.compile(r'page_(\d+)(?:_(text|layout_note|image_))?')
+
+# 各ページ詳細の項目 → (ページデータのキー, "\\n" を改行に戻すか)
+PAGE_FIELDS = {
+    'text': ('text', True),
+    'layout_note': ('layout_note', False),
+}
+
+def _normalize_cell(value: Any) -> str:
+    """セル値を文字列に正規化（None・欠損値(NaN)は空文字）"""
+    if value.__class__ is str:
+        return value
+    if value is None or value != value:
+        return ""
+    return str(value)
+
+class SectionParser:
+    """セクションごとの読み取りループを表で切り替えるセクション形式パーサー
+    
+    各ループは見出し行に当たるまで同じ共有イテレータを読み進め、次のセクション名を返す。
+    行の正規化（空行の読み飛ばし・キーと値の文字列化）は、行ごとに関数呼び出しやジェネレーターを
+    挟むと表駆動にした分の速度が失われるため、各ループの先頭に同じ形で書く（変えるときは全ループをそろえる）。
+    SKU行は品番かJANのどちらかがある行のみ、その他の行は値が空でない行のみ取り込む
+    （旧CSV版は空でも取り込み、旧Excel版は品番・JANの両方を必須にしていたのを統一）。
+    """
+    
+    def __init__(self):
+        """初期化"""
+        self.product_data = {}
+        self.sku_list = []
+        self.lp_structure = []
+        self.page_data = {}
+        self.section = 'basic'
+        self._readers = {
+            'basic': self._read_basic,
+            'sku': self._read_sku,
+            'structure': self._read_structure,
+            'page_details': self._read_page_details,
+            'other': self._read_other,
+        }
+    
+    @staticmethod
+    def _marker_section(key: str) -> Optional[str]:
+        """見出し行のセクション名（未知の見出しは None）"""
+        match = MARKER_PATTERN.match(key)
+        return SECTION_KEYWORDS[match.group('section')] if match else None
+    
+    def _read_basic(self, rows: Iterator[Sequence[Any]]) -> Optional[str]:
+        product_data = self.product_data
+        for row in rows:
+            if not row:
+                continue
+            key = row[0]
+            if key.__class__ is not str:
+                key = _normalize_cell(key)
+            if not key:  # 空行
+                continue
+            value = row[1] if len(row) > 1 else ""
+            if value.__class__ is not str:
+                value = _normalize_cell(value)
+            if key.startswith(MARKER_PREFIX):
+                section = self._marker_section(key)
+                if section:
+                    return section
+            elif key != '項目名':
+                product_data[key] = value
+        return None
+    
+    def _read_sku(self, rows: Iterator[Sequence[Any]]) -> Optional[str]:
+        sku_list = self.sku_list
+        for row in rows:
+            if not row:
+                continue
+            key = row[0]
+            if key.__class__ is not str:
+                key = _normalize_cell(key)
+            if not key:  # 空行
+                continue
+            value = row[1] if len(row) > 1 else ""
+            if value.__class__ is not str:
+                value = _normalize_cell(value)
+            if key.startswith(MARKER_PREFIX):
+                section = self._marker_section(key)
+                if section:
+                    return section
+            elif key != 'sku_type':
+                jan = row[2] if len(row) > 2 else ""
+                if jan.__class__ is not str:
+                    jan = _normalize_cell(jan)
+                if value or jan:
+                    sku_list.append({'type': key, 'sku': value, 'jan': jan})
+        return None
+    
+    def _read_structure(self, rows: Iterator[Sequence[Any]]) -> Optional[str]:
+        lp_structure = self.lp_structure
+        for row in rows:
+            if not row:
+                continue
+            key = row[0]
+            if key.__class__ is not str:
+                key = _normalize_cell(key)
+            if not key:  # 空行
+                continue
+            value = row[1] if len(row) > 1 else ""
+            if value.__class__ is not str:
+                value = _normalize_cell(value)
+            if key.startswith('page_'):
+                lp_structure.append(value)
+            elif key.startswith(MARKER_PREFIX):
+                section = self._marker_section(key)
+                if section:
+                    return section
+        return None
+    
+    def _read_page_details(self, rows: Iterator[Sequence[Any]]) -> Optional[str]:
+        page_data = self.page_data
+        match_page_key = PAGE_KEY_PATTERN.match
+        for row in rows:
+            if not row:
+                continue
+            key = row[0]
+            if key.__class__ is not str:
+                key = _normalize_cell(key)
+            if not key:  # 空行
+                continue
+            value = row[1] if len(row) > 1 else ""
+            if value.__class__ is not str:
+                value = _normalize_cell(value)
+            match = match_page_key(key)
+            if match is None:
+                if key.startswith(MARKER_PREFIX):
+                    section = self._marker_section(key)
+                    if section:
+                        return section
+                continue
+            
+            page_num, field = match.groups()
+            page_num = int(page_num)
+            page = page_data.get(page_num)
+            if page is None:
+                page = page_data[page_num] = {}
+            
+            if field == 'image_':
+                images = page.setdefault('images', [])
+                if value:  # 画像URLがある場合のみ追加
+                    images.append(value)
+            elif field:
+                page_key, unescape = PAGE_FIELDS[field]
+                page[page_key] = value.replace('\\n', '\n') if unescape else value
+        return None
+    
+    def _read_other(self, rows: Iterator[Sequence[Any]]) -> Optional[str]:
+        product_data = self.product_data
+        for row in rows:
+            if not row:
+                continue
+            key = row[0]
+            if key.__class__ is not str:
+                key = _normalize_cell(key)
+            if not key:  # 空行
+                continue
+            value = row[1] if len(row) > 1 else ""
+            if value.__class__ is not str:
+                value = _normalize_cell(value)
+            if key.startswith(MARKER_PREFIX):
+                section = self._marker_section(key)
+                if section:
+                    return section
+            elif value:
+                product_data[key] = value.replace('\\n', '\n')
+        return None
+    
+    def feed(self, rows: Iterable[Sequence[Any]]):
+        """行イテレータを先頭から処理（行をリストに溜め込まない）"""
+        
+        rows = iter(rows)
+        section = self.section
+        while section:
+            self.section = section
+            section = self._readers[section](rows)
+    
+    def result(self) -> Dict[str, Any]:
+        """解析結果の商品データを返す（feed の後に1回だけ呼ぶ）"""
+        
+        product_data = self.product_data
+        
+        # ページ詳細を配列に変換
+        page_details = []
+        for page_num in sorted(self.page_data):
+            page_info = self.page_data[page_num]
+            if not page_info.get('images'):
+                page_info['has_images'] = True  # 画像準備中フラグ
+            page_details.append(page_info)
+        
+        # 最終的なデータ構造を作成
+        if self.sku_list:
+            product_data['sku_list'] = self.sku_list
+        if self.lp_structure:
+            product_data['lp_structure'] = self.lp_structure
+        if page_details:
+            product_data['page_details'] = page_details
+        
+        return product_data
+
+def parse_section_rows(rows: Iterable[Sequence[Any]]) -> Dict[str, Any]:
+    """セクション形式の行イテレータを商品データに変換
+    
+    例: csv.reader(f) / worksheet.iter_rows(values_only=True) /
+        df.itertuples(index=False, name=None) / zip(*[column.to_pylist() for column in table.columns])
+    """
+    
+    parser = SectionParser()
+    parser.feed(rows)
+    return parser.result()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+仕様書・プレスリリースのテキストから商品スペック項目を抽出するルールエンジン
+"""
+
+import re
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from variant_extractor import is_valid_jan
+
+# 項目名の表記ゆれ → 抽出フィールド名
+FIELD_ALIASES = {
+    '商品名': '商品名',
+    '製品名': '商品名',
+    '品名': '商品名',
+    'サイズ': 'サイズ',
+    '商品サイズ': 'サイズ',
+    '本体サイズ': 'サイズ',
+    '寸法': 'サイズ',
+    '外形寸法': 'サイズ',
+    '重量': '重量',
+    '本体重量': '重量',
+    '重さ': '重量',
+    '定格': '定格',
+    '定格電圧': '定格',
+    '消費電力': '定格',
+    '電源': '定格',
+    'JANコード': 'JAN',
+    'JAN': 'JAN',
+    '発売日': '発売日',
+    '発売予定日': '発売日',
+    '発売時期': '発売日',
+}
+
+# 見出しだけの行（以降の箇条書きをセールスポイントとして扱う）
+SALES_POINT_HEADINGS = ('セールスポイント', '特長', '特徴', '主な機能')
+
+# 見出しの外でもセールスポイントとみなす行頭記号（規定書と同じ「●」）
+SALES_POINT_BULLET = '●'
+
+REQUIRED_FIELDS = ('商品名', 'サイズ', '重量', '定格', 'JAN', '発売日', 'セールスポイント')
+
+_KEY_ALTERNATION = '|'.join(sorted(map(re.escape, FIELD_ALIASES), key=len, reverse=True))
+_HEADING_ALTERNATION = '|'.join(map(re.escape, SALES_POINT_HEADINGS))
+
+# 1回の走査で全ルールを評価する行パターン（先に一致した選択肢が優先）
+LINE_PATTERN = re.compile(
+    rf"""
+    ^[ \t　]*[【\[■]?(?P<key>{_KEY_ALTERNATION})(?:[（(][^）)\n]{{0,10}}[）)])?[】\]]?[ \t　]*[：:][ \t　]*(?P<value>[^\n]*?)[ \t　]*$
+    | ^[ \t　]*[【\[■]?(?P<heading>{_HEADING_ALTERNATION})[】\]]?[ \t　]*[：:]?[ \t　]*$
+    | ^[ \t　]*(?P<bullet>[●・◆◇○■\-])[ \t　]*(?P<point>[^\n]+?)[ \t　]*$
+    | (?:(?P<jan_label>[^\s：:、,0-9]{{1,20}})[ \t　]*[：:][ \t　]*)?(?<!\d)(?P<jan>\d{{13}})(?!\d)
+    """,
+    re.MULTILINE | re.VERBOSE
+)
+
+JAN_PATTERN = re.compile(
+    r'(?:(?P<jan_label>[^\s：:、,0-9]{1,20})[ \t　]*[：:][ \t　]*)?(?<!\d)(?P<jan>\d{13})(?!\d)'
+)
+
+class SpecFieldExtractor:
+    """ページ単位でテキストを受け取り、必須項目が揃った時点で読み取りを打ち切る抽出器"""
+    
+    def __init__(self, required_fields: Iterable[str] = REQUIRED_FIELDS):
+        """初期化"""
+        self.required_fields = tuple(required_fields)
+        self.reset()
+    
+    def reset(self):
+        """抽出状態をクリア"""
+        self.fields = {}
+        self.jan_codes = []
+        self.invalid_jans = []  # チェックデジットが合わず採用しなかった13桁の数字
+        self.sales_points = []
+        self.pages_read = 0
+        self._seen_jans = set()
+        self._in_sales_points = False
+    
+    def is_complete(self) -> bool:
+        """必須項目がすべて抽出済みか"""
+        return all(self._has_field(field) for field in self.required_fields)
+    
+    def missing_fields(self) -> List[str]:
+        """未抽出の必須項目"""
+        return [field for field in self.required_fields if not self._has_field(field)]
+    
+    def _has_field(self, field: str) -> bool:
+        if field == 'JAN':
+            return bool(self.jan_codes)
+        if field == 'セールスポイント':
+            return bool(self.sales_points)
+        return field in self.fields
+    
+    def _add_jan(self, jan: str, label: Optional[str]):
+        if jan in self._seen_jans:
+            return
+        self._seen_jans.add(jan)
+        if is_valid_jan(jan):
+            self.jan_codes.append({'label': label or '', 'jan': jan})
+        else:
+            # 電話番号・型番などの13桁の数字は JAN として扱わない
+            self.invalid_jans.append(jan)
+    
+    def feed(self, text: str) -> bool:
+        """1ページ分のテキストを処理し、必須項目が揃ったかを返す"""
+        
+        self.pages_read += 1
+        
+        for match in LINE_PATTERN.finditer(text):
+            key = match.group('key')
+            if key:
+                self._in_sales_points = False
+                field = FIELD_ALIASES[key]
+                value = match.group('value')
+                if field == 'JAN':
+                    for jan_match in JAN_PATTERN.finditer(value):
+                        self._add_jan(jan_match.group('jan'), jan_match.group('jan_label'))
+                elif value and field not in self.fields:
+                    # 最初に出現した値を採用（後続ページの注記などで上書きしない）
+                    self.fields[field] = value
+            elif match.group('heading'):
+                self._in_sales_points = True
+            elif match.group('point'):
+                if self._in_sales_points or match.group('bullet') == SALES_POINT_BULLET:
+                    self.sales_points.append(match.group('point'))
+            elif match.group('jan'):
+                self._add_jan(match.group('jan'), match.group('jan_label'))
+        
+        return self.is_complete()
+    
+    def extract(self, pages: Iterable[str]) -> Dict[str, Any]:
+        """ページのイテレータから項目を抽出（必須項目が揃った時点で以降のページは読まない）"""
+        
+        self.reset()
+        for text in pages:
+            if self.feed(text):
+                break
+        
+        return self.result()
+    
+    def result(self) -> Dict[str, Any]:
+        """抽出結果を辞書で返す"""
+        
+        result = dict(self.fields)
+        if self.jan_codes:
+            result['JAN'] = list(self.jan_codes)
+        if self.sales_points:
+            result['セールスポイント'] = list(self.sales_points)
+        return result
+
+def extract_spec_fields(pages: Iterable[str],
+                        required_fields: Iterable[str] = REQUIRED_FIELDS) -> Tuple[Dict[str, Any], int]:
+    """ページのイテレータから項目を抽出し、(抽出結果, 読み取ったページ数) を返す"""
+    
+    extractor = SpecFieldExtractor(required_fields)
+    fields = extractor.extract(pages)
+    return fields, extractor.pages_read
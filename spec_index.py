@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+複数商品をまとめた大きな規定書CSV・セクション形式CSVのバイトオフセット索引
+ファイルをmmapで開いて商品の境界だけを探し、索引ファイルに保存します
+各商品はマップしたファイルの該当範囲だけを切り出して解析するため、ファイル全体を読み込みません
+"""
+
+import io
+import os
+import re
+import sys
+import csv
+import json
+import mmap
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from input_router import (
+    INPUT_TYPE_CSV, INPUT_TYPE_KISHIMA_CSV, INPUT_TYPE_LABELS, detect_file_encoding, detect_input_type
+)
+from product_spec import KISHIMA_BLOCK_KEY, KISHIMA_KEY_COLUMN
+
+INDEX_SUFFIX = '.offsets.json'
+INDEX_VERSION = 2
+
+# mmap上でバイト列のまま境界を探せる文字コード（区切り文字・引用符・改行がASCIIと同じバイトになるもの）
+INDEXABLE_ENCODINGS = ('utf-8', 'utf-8-sig', 'cp932')
+
+# 商品の先頭行の (セル, 列番号)（先に見つかったものを使う）
+# 規定書: 5列目が「商品名」の行（product_spec.is_kishima_block_start と同じ境界）
+# セクション形式: 「項目名」見出し行（見出しがなければ product_name 行）
+BOUNDARY_CELLS = {
+    INPUT_TYPE_KISHIMA_CSV: ((KISHIMA_BLOCK_KEY, KISHIMA_KEY_COLUMN),),
+    INPUT_TYPE_CSV: (('項目名', 0), ('product_name', 0)),
+}
+
+@lru_cache(maxsize=None)
+def _boundary_patterns(input_type: str, encoding: str) -> Tuple['re.Pattern', ...]:
+    """column 列目（0始まり）が cell の行頭に一致するバイト列パターン（文字コードごと）"""
+    cell_encoding = 'utf-8' if encoding == 'utf-8-sig' else encoding
+    return tuple(
+        re.compile(
+            b'^(?:\xef\xbb\xbf)?' + b',' * column + b'"?' + re.escape(cell.encode(cell_encoding)) + b'"?(?:,|\r?$)',
+            re.M,
+        )
+        for cell, column in BOUNDARY_CELLS[input_type]
+    )
+
+def _segment_encoding(encoding: str) -> str:
+    """切り出した範囲のデコードに使う文字コード（UTF-8は先頭範囲のBOMも取り除く）"""
+    return 'utf-8-sig' if encoding in ('utf-8', 'utf-8-sig') else encoding
+
+def _parse_segment(text: str, input_type: str) -> Dict[str, Any]:
+    """1商品分のテキストを解析（ファイルを開いた場合と同じく改行コードは \\n にそろえる）"""
+    rows = csv.reader(io.StringIO(text, newline=None))
+    if input_type == INPUT_TYPE_KISHIMA_CSV:
+        from correct_lp_generator import parse_kishima_rows
+        return parse_kishima_rows(rows)
+    from section_parser import parse_section_rows
+    return parse_section_rows(rows)
+
+def find_product_offsets(data, input_type: str, encoding: str = 'utf-8') -> List[Tuple[int, int]]:
+    """マップしたファイルから商品ごとの (開始, 終了) バイトオフセットを求める
+    
+    境界候補は正規表現で直接バッファを走査して探し、引用符で囲まれた複数行セルの途中にある
+    候補は、直前の位置からの引用符の数の偶奇で除外する。最初の商品より前の行は最初の商品に含める。
+    """
+    
+    starts = []
+    for pattern in _boundary_patterns(input_type, encoding):
+        position = 0
+        quoted = False
+        for match in pattern.finditer(data):
+            start = match.start()
+            if data[position:start].count(b'"') % 2:
+                quoted = not quoted
+            position = start
+            if not quoted:
+                starts.append(start)
+        if starts:
+            break
+    
+    if not starts:
+        return [(0, len(data))] if len(data) else []
+    starts[0] = 0
+    ends = starts[1:] + [len(data)]
+    return list(zip(starts, ends))
+
+def index_path_for(csv_path: str) -> str:
+    """索引ファイルのパス（CSVと同じディレクトリ）"""
+    return csv_path + INDEX_SUFFIX
+
+def _file_signature(csv_path: str) -> Dict[str, int]:
+    stat = os.stat(csv_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+class SpecFileIndex:
+    """複数商品CSVの商品オフセット索引（索引ファイルがあり、元ファイルが変わっていなければ再利用）"""
+    
+    def __init__(self, csv_path: str, rebuild: bool = False):
+        """初期化"""
+        self.csv_path = csv_path
+        self.input_type = None
+        self.encoding = None
+        self.offsets = []
+        self.loaded_from_index = False
+        if rebuild or not self._load():
+            self._build()
+            self._save()
+    
+    def _load(self) -> bool:
+        """索引ファイルを読み込む（元ファイルのサイズ・更新時刻が一致する場合のみ）"""
+        try:
+            with open(index_path_for(self.csv_path), 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return False
+        
+        if index.get('version') != INDEX_VERSION or index.get('source') != _file_signature(self.csv_path):
+            return False
+        self.input_type = index['input_type']
+        self.encoding = index['encoding']
+        self.offsets = [tuple(offset) for offset in index['offsets']]
+        self.loaded_from_index = True
+        return True
+    
+    def _build(self):
+        """ファイルをmmapで走査して索引を作成"""
+        
+        input_type = detect_input_type(self.csv_path)
+        if input_type not in BOUNDARY_CELLS:
+            raise ValueError(
+                f"索引を作成できない形式です: {self.csv_path}（{INPUT_TYPE_LABELS.get(input_type, input_type)}）"
+            )
+        encoding = detect_file_encoding(self.csv_path)
+        if encoding not in INDEXABLE_ENCODINGS:
+            raise ValueError(f"索引を作成できない文字コードです: {self.csv_path}（{encoding}）")
+        self.input_type = input_type
+        self.encoding = encoding
+        
+        if os.path.getsize(self.csv_path) == 0:
+            self.offsets = []
+            return
+        with open(self.csv_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                self.offsets = find_product_offsets(data, input_type, encoding)
+    
+    def _save(self):
+        """索引ファイルを保存（書き込めない場所なら保存しない）"""
+        index = {
+            'version': INDEX_VERSION,
+            'source': _file_signature(self.csv_path),
+            'input_type': self.input_type,
+            'encoding': self.encoding,
+            'offsets': self.offsets,
+        }
+        try:
+            with open(index_path_for(self.csv_path), 'w', encoding='utf-8') as f:
+                json.dump(index, f)
+        except OSError:
+            pass
+    
+    def __len__(self) -> int:
+        return len(self.offsets)
+    
+    def read_product(self, index: int) -> Dict[str, Any]:
+        """index 番目の商品だけを切り出して解析"""
+        start, end = self.offsets[index]
+        return parse_product_at(self.csv_path, start, end, self.input_type, self.encoding)
+    
+    def iter_products(self) -> Iterator[Dict[str, Any]]:
+        """商品を先頭から1件ずつ解析（ファイルは1回だけマップする）"""
+        if not self.offsets:
+            return
+        with open(self.csv_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for start, end in self.offsets:
+                    yield _parse_segment(data[start:end].decode(_segment_encoding(self.encoding)), self.input_type)
+    
+    def parse_all(self, max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """全商品を複数プロセスで解析（各ワーカーにはオフセットだけを渡す）"""
+        if len(self.offsets) < 2 or max_workers == 1:
+            return list(self.iter_products())
+        
+        count = len(self.offsets)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                parse_product_at,
+                [self.csv_path] * count,
+                [start for start, _ in self.offsets],
+                [end for _, end in self.offsets],
+                [self.input_type] * count,
+                [self.encoding] * count,
+                chunksize=max(1, count // ((max_workers or os.cpu_count() or 1) * 4)),
+            ))
+
+def parse_product_at(csv_path: str, start: int, end: int, input_type: str,
+                     encoding: str = 'utf-8') -> Dict[str, Any]:
+    """ファイルをmmapで開き、[start, end) の範囲の1商品だけを解析（ワーカープロセスからも呼べる）"""
+    with open(csv_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            segment = data[start:end]
+    return _parse_segment(segment.decode(_segment_encoding(encoding)), input_type)
+
+def main():
+    """メイン処理"""
+    
+    if len(sys.argv) < 2:
+        print("使用方法:")
+        print("  python spec_index.py <複数商品CSV> [オプション]")
+        print("\nオプション:")
+        print("  --rebuild          索引ファイルを作り直す")
+        print("  --product <番号>   指定した商品（1始まり）だけを解析してJSONで表示")
+        print("  --workers <数>     全商品を並列解析するワーカー数")
+        print("\n例:")
+        print("  python spec_index.py exports/erp_specs.csv --product 120")
+        sys.exit(1)
+    
+    csv_path = sys.argv[1]
+    if not os.path.exists(csv_path):
+        print(f"❌ ファイルが見つかりません: {csv_path}")
+        sys.exit(1)
+    
+    try:
+        index = SpecFileIndex(csv_path, rebuild='--rebuild' in sys.argv)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
+    source = "索引ファイルを使用" if index.loaded_from_index else "索引を作成"
+    print(f"📑 {len(index)}商品（{INPUT_TYPE_LABELS[index.input_type]}、{source}）: {index_path_for(csv_path)}")
+    
+    if '--product' in sys.argv:
+        try:
+            number = int(sys.argv[sys.argv.index('--product') + 1])
+            if number < 1:
+                raise IndexError(number)
+            product_data = index.read_product(number - 1)
+        except (IndexError, ValueError):
+            print(f"❌ --product には 1〜{len(index)} の番号を指定してください")
+            sys.exit(1)
+        print(json.dumps(product_data, ensure_ascii=False, indent=2))
+        return
+    
+    if '--workers' in sys.argv:
+        try:
+            max_workers = int(sys.argv[sys.argv.index('--workers') + 1])
+        except (IndexError, ValueError):
+            print("❌ --workers には整数を指定してください")
+            sys.exit(1)
+        if max_workers < 1:
+            print(f"❌ --workers には1以上の整数を指定してください: {max_workers}")
+            sys.exit(1)
+        products = index.parse_all(max_workers)
+        print(f"✅ {len(products)}商品を解析しました")
+
+if __name__ == "__main__":
+    main()
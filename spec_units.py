@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+規定書のサイズ・重量・定格の文字列を数値（mm / g / V / W）に正規化するモジュール
+カタログ全体を列単位でNumPy配列にまとめ、スペックでの絞り込み・並べ替えに使います
+"""
+
+import os
+import re
+import sys
+import operator
+import unicodedata
+from typing import Dict, Any, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# 正規化後の数値項目（欠損は NaN）
+SPEC_FIELDS = ('width_mm', 'depth_mm', 'height_mm', 'weight_g', 'voltage_v', 'power_w')
+
+# 規定書のキー（キー名の単位を既定の単位とする）
+SIZE_KEY = '商品サイズ(cm)'
+WEIGHT_KEY = '1個 重量(kg)'
+RATING_KEY = '定格'
+
+LENGTH_UNITS_MM = {'mm': 1.0, 'cm': 10.0, 'm': 1000.0}
+WEIGHT_UNITS_G = {'g': 1.0, 'kg': 1000.0}
+
+_NUMBER = r'(\d+(?:\.\d+)?)'
+_DIMENSION = r'(?:[WDHLwdhl]\s*)?' + _NUMBER + r'\s*(mm|cm|m)?'
+_TIMES = r'\s*[×xX*]\s*'
+
+# 「188×130cm」「W188cm×D130cm×H5cm」など最初の寸法の組（最大3辺）
+SIZE_PATTERN = re.compile(_DIMENSION + '(?:' + _TIMES + _DIMENSION + ')?(?:' + _TIMES + _DIMENSION + ')?')
+WEIGHT_PATTERN = re.compile(_NUMBER + r'\s*(kg|g)?')
+VOLTAGE_PATTERN = re.compile(_NUMBER + r'\s*V(?![A-Za-z])')
+POWER_PATTERN = re.compile(_NUMBER + r'\s*(k?)W(?![A-Za-z])')
+
+# 桁区切りのカンマ（1,100g → 1100g）
+THOUSANDS_PATTERN = re.compile(r'(?<=\d),(?=\d{3}(?!\d))')
+
+# 絞り込み条件（例: power_w<=120）
+CONDITION_PATTERN = re.compile(r'\s*(?P<field>\w+)\s*(?P<op><=|>=|==|!=|<|>)\s*(?P<value>-?\d+(?:\.\d+)?)\s*$')
+CONDITION_OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+NAN = float('nan')
+
+# 列ごとに保持する変換結果の上限（表記の種類が多いカタログでメモリを使い過ぎない）
+MEMO_MAX_ENTRIES = 100_000
+
+def _import_numpy():
+    """numpy を必要になった時だけ読み込む（1件ずつの正規化だけなら不要）"""
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        raise ImportError("スペックの一括正規化には numpy が必要です: pip install numpy")
+
+def _normalize_text(value: Any) -> str:
+    """全角英数字・記号を半角にそろえ、桁区切りのカンマを除く"""
+    text = unicodedata.normalize('NFKC', str(value))
+    return THOUSANDS_PATTERN.sub('', text) if ',' in text else text
+
+def parse_size_mm(value: Any, default_unit: str = 'cm') -> Tuple[float, float, float]:
+    """サイズを (幅, 奥行, 高さ) のmmに変換（単位のない辺は後ろの辺の単位、なければ既定の単位）"""
+    
+    if value is None or value == '':
+        return (NAN, NAN, NAN)
+    if isinstance(value, (int, float)):
+        return (float(value) * LENGTH_UNITS_MM[default_unit], NAN, NAN)
+    
+    match = SIZE_PATTERN.search(_normalize_text(value))
+    if not match:
+        return (NAN, NAN, NAN)
+    
+    numbers = match.group(1, 3, 5)
+    units = match.group(2, 4, 6)
+    
+    dimensions = []
+    unit = default_unit
+    for number, own_unit in reversed(list(zip(numbers, units))):
+        if number is None:
+            dimensions.append(NAN)
+            continue
+        unit = own_unit or unit
+        dimensions.append(float(number) * LENGTH_UNITS_MM[unit])
+    dimensions.reverse()
+    return tuple(dimensions)
+
+def parse_weight_g(value: Any, default_unit: str = 'kg') -> float:
+    """重量をgに変換"""
+    
+    if value is None or value == '':
+        return NAN
+    if isinstance(value, (int, float)):
+        return float(value) * WEIGHT_UNITS_G[default_unit]
+    
+    match = WEIGHT_PATTERN.search(_normalize_text(value))
+    if not match:
+        return NAN
+    return float(match.group(1)) * WEIGHT_UNITS_G[match.group(2) or default_unit]
+
+def parse_rating(value: Any) -> Tuple[float, float]:
+    """定格を (電圧V, 消費電力W) に変換（記載のない方は NaN）"""
+    
+    if value is None or value == '':
+        return (NAN, NAN)
+    
+    text = _normalize_text(value)
+    voltage = VOLTAGE_PATTERN.search(text)
+    power = POWER_PATTERN.search(text)
+    return (
+        float(voltage.group(1)) if voltage else NAN,
+        float(power.group(1)) * (1000.0 if power.group(2) else 1.0) if power else NAN,
+    )
+
+def normalize_spec(product_data: Mapping[str, Any]) -> Dict[str, float]:
+    """商品データ（辞書または ProductSpec）のサイズ・重量・定格を数値項目に変換"""
+    
+    width, depth, height = parse_size_mm(product_data.get(SIZE_KEY))
+    voltage, power = parse_rating(product_data.get(RATING_KEY))
+    return {
+        'width_mm': width,
+        'depth_mm': depth,
+        'height_mm': height,
+        'weight_g': parse_weight_g(product_data.get(WEIGHT_KEY)),
+        'voltage_v': voltage,
+        'power_w': power,
+    }
+
+def _parse_column(parse, values: Iterable[Any], memo: Dict[Any, Any]) -> List[Any]:
+    """列の値を変換（カタログでは同じ表記が繰り返し出るため変換結果を使い回す）"""
+    if len(memo) > MEMO_MAX_ENTRIES:
+        memo.clear()
+    results = []
+    append = results.append
+    for value in values:
+        key = value if value.__class__ is str else repr(value)
+        parsed = memo.get(key)
+        if parsed is None:
+            parsed = memo[key] = parse(value)
+        append(parsed)
+    return results
+
+def normalize_spec_columns(sizes: Sequence[Any], weights: Sequence[Any], ratings: Sequence[Any],
+                           memo: Optional[Dict[str, Dict[Any, Any]]] = None) -> Dict[str, Any]:
+    """サイズ・重量・定格の列をまとめて変換し、項目ごとの float64 配列を返す"""
+    
+    numpy = _import_numpy()
+    if memo is None:
+        memo = {}
+    
+    count = max(len(sizes), len(weights), len(ratings))
+    columns = {}
+    
+    if sizes:
+        size_array = numpy.array(_parse_column(parse_size_mm, sizes, memo.setdefault('size', {})), dtype=numpy.float64)
+    else:
+        size_array = numpy.full((count, 3), numpy.nan)
+    columns['width_mm'] = size_array[:, 0]
+    columns['depth_mm'] = size_array[:, 1]
+    columns['height_mm'] = size_array[:, 2]
+    
+    if weights:
+        columns['weight_g'] = numpy.array(_parse_column(parse_weight_g, weights, memo.setdefault('weight', {})), dtype=numpy.float64)
+    else:
+        columns['weight_g'] = numpy.full(count, numpy.nan)
+    
+    if ratings:
+        rating_array = numpy.array(_parse_column(parse_rating, ratings, memo.setdefault('rating', {})), dtype=numpy.float64)
+    else:
+        rating_array = numpy.full((count, 2), numpy.nan)
+    columns['voltage_v'] = rating_array[:, 0]
+    columns['power_w'] = rating_array[:, 1]
+    
+    return columns
+
+def read_catalog_specs(catalog_path: str, batch_size: int = 8192) -> Dict[str, Any]:
+    """カタログの商品名とスペック列だけを読み、{'name': 商品名配列, 各数値項目: float64配列} を返す"""
+    
+    from catalog_ingest import TARGET_CORRECT, iter_column_batches, read_catalog_columns, resolve_columns
+    
+    numpy = _import_numpy()
+    mapping = resolve_columns(read_catalog_columns(catalog_path), TARGET_CORRECT)
+    spec_keys = ('商品名', SIZE_KEY, WEIGHT_KEY, RATING_KEY)
+    columns = list(dict.fromkeys(mapping[key] for key in spec_keys if key in mapping))
+    if not columns:
+        raise ValueError(f"カタログにスペックの列がありません: {catalog_path}")
+    
+    names = []
+    chunks = {field: [] for field in SPEC_FIELDS}
+    memo = {}
+    for batch in iter_column_batches(catalog_path, columns, batch_size):
+        size = len(batch[columns[0]])
+        names.extend(batch[mapping['商品名']] if '商品名' in mapping else [''] * size)
+        batch_specs = normalize_spec_columns(
+            batch[mapping[SIZE_KEY]] if SIZE_KEY in mapping else [],
+            batch[mapping[WEIGHT_KEY]] if WEIGHT_KEY in mapping else [],
+            batch[mapping[RATING_KEY]] if RATING_KEY in mapping else [],
+            memo,
+        ) if size else {field: numpy.empty(0) for field in SPEC_FIELDS}
+        for field in SPEC_FIELDS:
+            chunks[field].append(batch_specs[field])
+    
+    specs = {'name': numpy.array(names, dtype=object)}
+    for field in SPEC_FIELDS:
+        specs[field] = numpy.concatenate(chunks[field]) if chunks[field] else numpy.empty(0)
+    return specs
+
+def parse_condition(condition: str) -> Tuple[str, Any, float]:
+    """絞り込み条件の文字列（例: weight_g<=2500）を (項目, 比較演算, 値) に変換"""
+    match = CONDITION_PATTERN.match(condition)
+    if not match or match.group('field') not in SPEC_FIELDS:
+        raise ValueError(f"絞り込み条件が不正です: {condition}（項目: {', '.join(SPEC_FIELDS)}）")
+    return match.group('field'), CONDITION_OPERATORS[match.group('op')], float(match.group('value'))
+
+def select_products(specs: Dict[str, Any], conditions: Sequence[str] = (),
+                    sort_by: Optional[str] = None, descending: bool = False) -> Any:
+    """条件をすべて満たす商品の行番号を配列演算で求める（sort_by 指定時はその項目順、NaNは末尾）"""
+    
+    numpy = _import_numpy()
+    mask = numpy.ones(len(specs['name']), dtype=bool)
+    for condition in conditions:
+        field, compare, value = parse_condition(condition)
+        mask &= compare(specs[field], value)
+    indices = numpy.flatnonzero(mask)
+    
+    if sort_by:
+        if sort_by not in SPEC_FIELDS:
+            raise ValueError(f"並べ替えの項目が不正です: {sort_by}（項目: {', '.join(SPEC_FIELDS)}）")
+        values = specs[sort_by][indices]
+        order = numpy.argsort(-values if descending else values, kind='stable')
+        indices = indices[order]
+    return indices
+
+def main():
+    """メイン処理"""
+    
+    if len(sys.argv) < 2:
+        print("使用方法:")
+        print("  python spec_units.py <カタログ(.parquet/.arrow/.csv)> [オプション]")
+        print("\nオプション:")
+        print(f"  --where <条件>     絞り込み（複数指定可、項目: {', '.join(SPEC_FIELDS)}）")
+        print("  --sort <項目>      指定項目の昇順で並べ替え")
+        print("  --desc             降順で並べ替え")
+        print("  --limit <数>       表示件数（デフォルト: 20）")
+        print("\n例:")
+        print("  python spec_units.py data/catalog.parquet --where \"power_w<=120\" --sort weight_g")
+        sys.exit(1)
+    
+    catalog_path = sys.argv[1]
+    if not os.path.exists(catalog_path):
+        print(f"❌ カタログファイルが見つかりません: {catalog_path}")
+        sys.exit(1)
+    
+    conditions = [sys.argv[i + 1] for i, arg in enumerate(sys.argv[:-1]) if arg == '--where']
+    sort_by = sys.argv[sys.argv.index('--sort') + 1] if '--sort' in sys.argv[:-1] else None
+    limit = 20
+    if '--limit' in sys.argv:
+        try:
+            limit = int(sys.argv[sys.argv.index('--limit') + 1])
+        except (IndexError, ValueError):
+            print("❌ --limit には整数を指定してください")
+            sys.exit(1)
+    
+    try:
+        specs = read_catalog_specs(catalog_path)
+        indices = select_products(specs, conditions, sort_by, '--desc' in sys.argv)
+    except (ImportError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
+    print(f"\n📐 {len(indices)} / {len(specs['name'])}件が該当")
+    print("| 行 | 商品名 | " + " | ".join(SPEC_FIELDS) + " |")
+    for index in indices[:limit]:
+        values = " | ".join("" if specs[field][index] != specs[field][index] else f"{specs[field][index]:g}"
+                            for field in SPEC_FIELDS)
+        print(f"| {index + 1} | {specs['name'][index]} | {values} |")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""
+テスト共通設定（リポジトリ直下・legacy のモジュールを読み込めるようにし、キャッシュ・索引は一時ディレクトリを使う）
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT_DIR, os.path.join(ROOT_DIR, 'legacy')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# CorrectLPGenerator はDocbaseのトークンがないと初期化できない（テストでは投稿しない）
+os.environ.setdefault('DOCBASE_ACCESS_TOKEN', 'test-token')
+# リポジトリの .cache を使わないよう、解析キャッシュは既定で無効にする（parse_cache フィクスチャで有効化）
+os.environ['LP_NO_CACHE'] = '1'
+
+@pytest.fixture
+def parse_cache(tmp_path, monkeypatch):
+    """一時ディレクトリの解析キャッシュを有効にして返す"""
+    import parse_cache as parse_cache_module
+    
+    cache = parse_cache_module.ParseCache(str(tmp_path / 'parse_cache.sqlite3'))
+    monkeypatch.setattr(parse_cache_module, '_cache_instance', cache)
+    monkeypatch.delenv('LP_NO_CACHE')
+    return cache
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+入力ハッシュによるページ単位の差分再生成（lp_template.render_document / 連結規定書の再生成）のテスト
+"""
+
+import csv
+import json
+import os
+
+import pytest
+
+from correct_lp_generator import CorrectLPGenerator
+from lp_document import changed_nodes, load_sidecar, to_markdown
+from product_spec import JAN_KEY
+
+def _product(name='PowerArQ Electric Blanket Lite', model_number='J-OB31201', sales_points=None):
+    return {
+        '商品名': name,
+        'メーカー型番': model_number,
+        JAN_KEY: 'ブラック：4571427130640',
+        '商品サイズ(cm)': '約188×130cm',
+        'セールスポイント': sales_points or ['12段階の温度設定が可能', '丸洗い可能'],
+    }
+
+@pytest.fixture(scope='module')
+def generator():
+    return CorrectLPGenerator()
+
+def _round_trip(node):
+    """サイドカーに保存して読み直したのと同じ形にする"""
+    return json.loads(json.dumps(node, ensure_ascii=False))
+
+def test_unchanged_input_reuses_every_section(generator):
+    previous = _round_trip(generator.build_correct_lp_document(_product()))
+    lp_document = generator.build_correct_lp_document(_product(), previous)
+    
+    assert changed_nodes(lp_document, previous) == []
+    assert lp_document['blocks'] == previous['blocks']
+
+@pytest.mark.parametrize('changes', [
+    {'商品サイズ(cm)': '約200×140cm'},
+    {'商品名': 'PowerArQ Electric Blanket'},
+    {'セールスポイント': ['過熱保護システム搭載', 'コントローラーで簡単操作']},
+    {JAN_KEY: 'ブラック：4571427130640\nベージュ：4571427130657'},
+])
+def test_incremental_markdown_matches_fresh_rendering(generator, changes):
+    previous = _round_trip(generator.build_correct_lp_document(_product()))
+    product_data = dict(_product(), **changes)
+    
+    incremental = generator.build_correct_lp_document(dict(product_data), previous)
+    fresh = generator.build_correct_lp_document(dict(product_data))
+    
+    assert to_markdown(incremental) == to_markdown(fresh)
+    assert to_markdown(incremental) == generator.generate_correct_lp_rough(dict(product_data))
+    # 入力が変わったセクションだけを描画し直す
+    changed = changed_nodes(incremental, previous)
+    assert 0 < len(changed) < len(incremental['blocks'])
+
+def _write_export(path, products):
+    """規定書を連結したCSVを書く"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        for product_data in products:
+            writer.writerow(['規定書', '', '', '', '', ''])
+            writer.writerow(['', '', '', '', '商品名', product_data['商品名']])
+            writer.writerow(['', '', '', '', 'メーカー型番', product_data['メーカー型番']])
+            writer.writerow(['', '', '', '', 'JANコード', product_data[JAN_KEY]])
+            writer.writerow(['', '', '', '', '商品サイズ(cm)', product_data['商品サイズ(cm)']])
+            writer.writerow(['', '', '', 'セールスポイント', '', ''])
+            for point in product_data['セールスポイント']:
+                writer.writerow(['', '', '', f'●{point}', '', ''])
+
+def test_export_reuses_outputs_by_product_and_removes_orphans(tmp_path, generator):
+    alpha = _product('Alpha', 'PAQ-A')
+    beta = _product('Beta', 'PAQ-B')
+    gamma = _product('Gamma', 'PAQ-C')
+    output_dir = str(tmp_path / 'out')
+    
+    _write_export(tmp_path / 'v1.csv', [alpha, beta, gamma])
+    generator.generate_from_kishima_export(str(tmp_path / 'v1.csv'), output_dir)
+    
+    # 並びが変わり、Beta が消えた連結規定書
+    _write_export(tmp_path / 'v2.csv', [gamma, alpha])
+    result = generator.generate_from_kishima_export(str(tmp_path / 'v2.csv'), output_dir)
+    
+    assert result['removed_count'] == 3
+    assert sorted(os.listdir(output_dir)) == [
+        'lp_rough_correct_0001_Gamma.lp.json', 'lp_rough_correct_0001_Gamma.md',
+        'lp_rough_correct_0002_Alpha.lp.json', 'lp_rough_correct_0002_Alpha.md',
+    ]
+    for output_path in result['output_paths']:
+        lp_document = load_sidecar(output_path)
+        product_data = {'Alpha': alpha, 'Gamma': gamma}[lp_document['meta']['product_name']]
+        assert lp_document['meta']['product_key'] == product_data['メーカー型番']
+        with open(output_path, 'r', encoding='utf-8') as f:
+            assert f.read() == generator.generate_correct_lp_rough(dict(product_data))
+    
+    # 変更がなければ書き直さない
+    result = generator.generate_from_kishima_export(str(tmp_path / 'v2.csv'), output_dir)
+    assert result['unchanged_count'] == 2
+    assert result['removed_count'] == 0
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+入力マニフェスト（input_manifest.py）のテスト
+"""
+
+import os
+
+from input_manifest import InputManifest
+
+def _recorded_manifest(tmp_path, options=None):
+    """入力1件を記録して保存したマニフェストと (入力, 出力) のパス"""
+    input_path = tmp_path / 'spec.csv'
+    input_path.write_text('商品名,テスト\n', encoding='utf-8')
+    output_path = tmp_path / 'lp.md'
+    output_path.write_text('# LP', encoding='utf-8')
+    
+    manifest = InputManifest(str(tmp_path / 'manifest.json'))
+    manifest.record(str(input_path), str(output_path), options)
+    manifest.save()
+    return InputManifest(manifest.path), input_path, output_path
+
+def test_unknown_input_is_changed(tmp_path):
+    input_path = tmp_path / 'spec.csv'
+    input_path.write_text('商品名,テスト\n', encoding='utf-8')
+    assert InputManifest(str(tmp_path / 'manifest.json')).is_changed(str(input_path))
+
+def test_recorded_input_is_unchanged(tmp_path):
+    manifest, input_path, _ = _recorded_manifest(tmp_path, {'upload': False})
+    assert not manifest.is_changed(str(input_path), {'upload': False})
+
+def test_edited_content_is_changed(tmp_path):
+    manifest, input_path, _ = _recorded_manifest(tmp_path)
+    input_path.write_text('商品名,別の商品\n', encoding='utf-8')
+    assert manifest.is_changed(str(input_path))
+
+def test_touched_file_with_same_content_is_unchanged(tmp_path):
+    manifest, input_path, _ = _recorded_manifest(tmp_path)
+    stat = os.stat(input_path)
+    os.utime(input_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    
+    assert not manifest.is_changed(str(input_path))
+    # 内容で確認した後は新しい更新時刻を記録する
+    assert manifest.files[os.path.abspath(input_path)]['mtime_ns'] == stat.st_mtime_ns + 10 ** 9
+
+def test_same_size_edit_with_new_mtime_is_changed(tmp_path):
+    manifest, input_path, _ = _recorded_manifest(tmp_path)
+    stat = os.stat(input_path)
+    input_path.write_text('商品名,テスツ\n', encoding='utf-8')
+    os.utime(input_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    
+    assert os.stat(input_path).st_size == stat.st_size
+    assert manifest.is_changed(str(input_path))
+
+def test_changed_options_or_missing_output_is_changed(tmp_path):
+    manifest, input_path, output_path = _recorded_manifest(tmp_path, {'upload': False})
+    assert manifest.is_changed(str(input_path), {'upload': True})
+    
+    output_path.unlink()
+    assert manifest.is_changed(str(input_path), {'upload': False})
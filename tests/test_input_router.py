@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+入力タイプ判定（input_router.detect_input_type）のテスト
+"""
+
+import pytest
+
+from catalog_ingest import detect_catalog_format
+from input_router import (
+    INPUT_TYPE_ARROW, INPUT_TYPE_CSV, INPUT_TYPE_JSON, INPUT_TYPE_KISHIMA_CSV, INPUT_TYPE_PARQUET,
+    INPUT_TYPE_PDF, detect_input_type,
+)
+
+@pytest.mark.parametrize('head, input_type', [
+    (b'PAR1\x15\x04', INPUT_TYPE_PARQUET),
+    (b'ARROW1\x00\x00', INPUT_TYPE_ARROW),
+    (b'\xff\xff\xff\xff\x10\x00\x00\x00', INPUT_TYPE_ARROW),  # Arrow IPC ストリーム形式
+    (b'%PDF-1.7\n', INPUT_TYPE_PDF),
+    ('{"商品名": "テスト"}'.encode('utf-8'), INPUT_TYPE_JSON),
+    (',,,,商品名,テスト\n'.encode('cp932'), INPUT_TYPE_KISHIMA_CSV),
+    ('項目名,値\n商品名,テスト\n'.encode('utf-8'), INPUT_TYPE_CSV),
+])
+def test_detect_input_type(tmp_path, head, input_type):
+    file_path = tmp_path / 'input'
+    file_path.write_bytes(head)
+    assert detect_input_type(str(file_path)) == input_type
+
+@pytest.mark.parametrize('head', [b'PAR1\x15\x04', b'ARROW1\x00\x00', b'\xff\xff\xff\xff\x10\x00\x00\x00'])
+def test_catalog_format_agrees_with_input_type(tmp_path, head):
+    file_path = tmp_path / 'catalog'
+    file_path.write_bytes(head)
+    assert detect_catalog_format(str(file_path)) == detect_input_type(str(file_path))
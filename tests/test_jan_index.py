@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+JAN/SKU索引（jan_index.py）のテスト
+"""
+
+from jan_index import (
+    STATUS_CONFLICT, STATUS_DUPLICATE, STATUS_GENERATED, STATUS_NEW, JanIndex, product_identity,
+)
+from product_spec import JAN_KEY
+
+def _identity(model_number, jan, name='テスト商品'):
+    return product_identity({
+        '商品名': name,
+        'メーカー型番': model_number,
+        JAN_KEY: f'ブラック：{jan}',
+    })
+
+def test_product_identity_uses_model_number_and_jans():
+    identity = _identity('PAQ-1', '4571427130640')
+    assert identity['key'] == 'PAQ-1'
+    assert identity['jans'] == ['4571427130640']
+    assert identity['skus'] == ['PAQ-1']
+
+def test_claim_new_then_duplicate_in_same_run(tmp_path):
+    index = JanIndex(str(tmp_path / 'jan_index.json'))
+    identity = _identity('PAQ-1', '4571427130640')
+    
+    assert index.claim(identity, 'a.csv') == (STATUS_NEW, [])
+    assert index.claim(identity, 'a.csv') == (STATUS_DUPLICATE, [])
+
+def test_claim_conflict_when_jan_belongs_to_another_product(tmp_path):
+    index = JanIndex(str(tmp_path / 'jan_index.json'))
+    index.claim(_identity('PAQ-1', '4571427130640'))
+    
+    status, details = index.claim(_identity('PAQ-2', '4571427130640', name='別の商品'))
+    assert status == STATUS_CONFLICT
+    assert len(details) == 1 and '4571427130640' in details[0]
+
+def test_claim_generated_across_runs_until_output_is_removed(tmp_path):
+    index_path = str(tmp_path / 'jan_index.json')
+    output_path = tmp_path / 'lp.md'
+    output_path.write_text('# LP', encoding='utf-8')
+    identity = _identity('PAQ-1', '4571427130640')
+    
+    index = JanIndex(index_path)
+    assert index.claim(identity)[0] == STATUS_NEW
+    index.mark_generated(identity['key'], str(output_path))
+    index.save()
+    
+    # 次の実行では生成済み（regenerate なら新規として作り直す）
+    assert JanIndex(index_path).claim(identity) == (STATUS_GENERATED, [str(output_path)])
+    assert JanIndex(index_path).claim(identity, regenerate=True)[0] == STATUS_NEW
+    
+    # 出力ファイルが消えていれば新規として扱う
+    output_path.unlink()
+    assert JanIndex(index_path).claim(identity)[0] == STATUS_NEW
+
+def test_claim_without_key_is_always_new(tmp_path):
+    index = JanIndex(str(tmp_path / 'jan_index.json'))
+    identity = {'key': '', 'name': '', 'jans': [], 'skus': []}
+    assert index.claim(identity)[0] == STATUS_NEW
+    assert index.claim(identity)[0] == STATUS_NEW
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+連結規定書の分割（correct_lp_generator.iter_kishima_products）のテスト
+"""
+
+from correct_lp_generator import iter_kishima_products, parse_kishima_rows
+from product_spec import JAN_KEY
+
+def _row(key='', value='', point=''):
+    return ['', '', '', point, key, value]
+
+def test_single_product_with_jan_continuation_and_sales_points():
+    rows = [
+        ['規定書', '', '', '', '', ''],
+        _row('商品名', 'Alpha'),
+        _row('JANコード', 'ブラック：4571427130640'),
+        _row('', 'ベージュ：4571427130657'),
+        _row(point='セールスポイント'),
+        _row(point='●丸洗い可能'),
+    ]
+    product_data = parse_kishima_rows(rows)
+    
+    assert product_data['商品名'] == 'Alpha'
+    assert product_data[JAN_KEY] == 'ブラック：4571427130640\nベージュ：4571427130657'
+    assert product_data['セールスポイント'] == ['丸洗い可能']
+
+def test_repeated_key_inside_one_product_does_not_split_it():
+    rows = [
+        _row('商品名', 'Alpha'),
+        _row('備考', 'a'),
+        _row('定格', '100V'),
+        _row('備考', 'b'),
+        _row('発売日', '2025年9月30日'),
+        _row(point='セールスポイント'),
+        _row(point='●丸洗い可能'),
+    ]
+    products = list(iter_kishima_products(rows))
+    
+    assert len(products) == 1
+    assert products[0]['備考'] == 'b'
+    assert products[0]['発売日'] == '2025年9月30日'
+    assert products[0]['セールスポイント'] == ['丸洗い可能']
+    assert parse_kishima_rows(rows) == products[0]
+
+def test_each_product_name_row_starts_a_new_product():
+    rows = [
+        ['規定書', '', '', '', '', ''],
+        _row('商品名', 'Alpha'), _row('メーカー型番', 'PAQ-A'),
+        _row(point='セールスポイント'), _row(point='●a'),
+        ['規定書', '', '', '', '', ''],
+        _row('商品名', 'Beta'), _row('メーカー型番', 'PAQ-B'),
+        _row(point='セールスポイント'), _row(point='●b'),
+    ]
+    products = list(iter_kishima_products(rows))
+    
+    assert [(p['商品名'], p['メーカー型番'], p['セールスポイント']) for p in products] == [
+        ('Alpha', 'PAQ-A', ['a']),
+        ('Beta', 'PAQ-B', ['b']),
+    ]
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+LPラフ案の文書ツリー（lp_document.py）のテスト
+"""
+
+import pytest
+
+from correct_lp_generator import CorrectLPGenerator
+from lp_document import (
+    document, heading, image, load_sidecar, page, paragraph, save_document,
+    sidecar_path, table, to_html, to_markdown,
+)
+from product_spec import JAN_KEY
+
+PRODUCT_DATA = {
+    '商品名': 'PowerArQ Electric Blanket Lite',
+    '商品名カナ': 'パワーアーク エレクトリック ブランケット ライト',
+    'メーカー型番': 'J-OB31201',
+    JAN_KEY: 'ブラック：4571427130640\nベージュ：4571427130657',
+    '商品サイズ(cm)': '約188×130cm',
+    'セールスポイント': ['12段階の温度設定が可能', '丸洗い可能'],
+}
+
+@pytest.fixture(scope='module')
+def generator():
+    return CorrectLPGenerator()
+
+def test_document_markdown_matches_string_rendering(generator):
+    lp_document = generator.build_correct_lp_document(dict(PRODUCT_DATA))
+    assert to_markdown(lp_document) == generator.generate_correct_lp_rough(dict(PRODUCT_DATA))
+    assert lp_document['meta']['model_number'] == 'J-OB31201'
+    assert lp_document['meta']['jan_codes'] == ['4571427130640', '4571427130657']
+
+def test_document_nodes_follow_template_not_values(generator):
+    """値に Markdown の記号が含まれていても、ノードの種類はテンプレートの行で決まる"""
+    product_data = dict(PRODUCT_DATA, **{'商品名': '# 見出し風 | 表風 |'})
+    lp_document = generator.build_correct_lp_document(dict(product_data))
+    assert to_markdown(lp_document) == generator.generate_correct_lp_rough(dict(product_data))
+    
+    header = lp_document['blocks'][0]
+    assert header['type'] == 'section' and header['name'] == 'header'
+    assert heading(1, 'LPラフ') == header['blocks'][0]
+    assert paragraph('# 見出し風 | 表風 |\n（パワーアーク エレクトリック ブランケット ライト）') in header['blocks']
+    variants = next(block for block in header['blocks'] if block['type'] == 'table')
+    assert variants['header'] == ['種類', 'SKU', 'JAN']
+    assert variants['rows'] == [['ブラック', 'J-OB31201-ブラック', '4571427130640'], ['ベージュ', 'J-OB31201-ベージュ', '4571427130657']]
+
+def test_html_escapes_text_and_marks_pages():
+    lp_document = document([
+        page(1, [heading(2, '<タイトル>'), paragraph('a & b\n2行目')], title='構成 "1"'),
+        page(2, [table(['項目', '値'], [['<b>', '1']]), image('a.png', 'alt', '300x200')]),
+    ], product_name='商品 <A>')
+    html = to_html(lp_document)
+    
+    assert '<title>商品 &lt;A&gt;</title>' in html
+    assert '<section class="lp-page" data-number="1" data-title="構成 &quot;1&quot;">' in html
+    assert '<h2>&lt;タイトル&gt;</h2>' in html
+    assert '<p>a &amp; b<br>\n2行目</p>' in html
+    assert '<td>&lt;b&gt;</td>' in html
+    assert '<img src="a.png" alt="alt" width="300" height="200">' in html
+
+def test_save_document_writes_markdown_and_sidecar(tmp_path, generator):
+    lp_document = generator.build_correct_lp_document(dict(PRODUCT_DATA))
+    output_path = str(tmp_path / 'lp.md')
+    content = save_document(lp_document, output_path)
+    
+    with open(output_path, 'r', encoding='utf-8') as f:
+        assert f.read() == content
+    assert load_sidecar(output_path) == lp_document
+    assert load_sidecar(sidecar_path(output_path)) == lp_document
+    assert load_sidecar(str(tmp_path / 'missing.md')) is None
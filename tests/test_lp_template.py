@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+レイアウトテンプレートのコンパイラ（lp_template.py）のテスト
+"""
+
+import pytest
+
+from lp_document import heading, image, paragraph, table, to_markdown
+from lp_template import LPLayout, TemplateSyntaxError, compile_source, compile_template, template_names
+
+def test_literal_text_is_escaped():
+    template = "quote ' backslash \\ braces {} {{x}} tab\tcr\r\nnext"
+    render = compile_template(template)
+    assert render({'x': '{v}'}) == "quote ' backslash \\ braces {} {v} tab\tcr\r\nnext"
+
+def test_values_are_not_interpreted_as_format_strings():
+    render = compile_template("{{name}}")
+    assert render({'name': "{0} '\\n' {{x}}"}) == "{0} '\\n' {{x}}"
+
+def test_missing_values_render_empty():
+    assert compile_template("[{{missing}}]")({}) == "[]"
+
+def test_if_else():
+    render = compile_template("{{#if flag}}yes {{name}}{{else}}no{{/if}}!")
+    assert render({'flag': True, 'name': 'A'}) == "yes A!"
+    assert render({'flag': False, 'name': 'A'}) == "no!"
+    assert render({}) == "no!"
+
+def test_nested_each_resolves_item_fields_before_outer_values():
+    template = (
+        "{{#each groups}}{{title}}:"
+        "{{#each items}}{{#if jan}}{{name}}={{jan}}{{else}}{{name}}-{{title}}{{/if}},{{/each}}"
+        ";{{/each}}"
+    )
+    render = compile_template(template)
+    context = {
+        'title': 'outer',
+        'groups': [
+            {'title': 'G1', 'items': [{'name': 'a', 'jan': '1'}, {'name': 'b'}]},
+            {'items': [{'name': 'c'}]},
+        ],
+    }
+    assert render(context) == "G1:a=1,b-G1,;outer:c-outer,;"
+
+def test_each_over_empty_or_missing_list():
+    render = compile_template("[{{#each items}}{{name}}{{/each}}]")
+    assert render({'items': []}) == "[]"
+    assert render({}) == "[]"
+
+def test_context_values_are_read_once_at_function_start():
+    source = compile_source("{{a}}{{#if a}}{{b}}{{/if}}{{a}}")
+    assert source.count("context.get('a'") == 1
+    assert source.count("context.get('b'") == 1
+
+@pytest.mark.parametrize('template', [
+    "{{#if a}}open",
+    "{{/if}}",
+    "{{#each a}}{{/if}}",
+    "{{else}}",
+    "{{#if a}}{{else}}{{else}}{{/if}}",
+    "{{not a name}}",
+    "{{#if a.b}}{{/if}}",
+])
+def test_syntax_errors(template):
+    with pytest.raises(TemplateSyntaxError):
+        compile_source(template)
+
+def test_template_names():
+    assert template_names("{{#each items}}{{name}}{{/each}}{{#if flag}}{{title}}{{/if}}") == [
+        'flag', 'items', 'name', 'title',
+    ]
+
+def test_layout_document_blocks_come_from_template_lines():
+    layout = LPLayout({
+        'header': [
+            "# {{title}}",
+            "| 種類 | JAN |",
+            "| --- | --- |",
+            "{{#each variants}}",
+            "| {{color}} | {{jan}} |",
+            "{{/each}}",
+            "",
+            "{{#if flag}}あり{{/if}}",
+            "![{{alt}}]({{src}} =300x200)",
+            "| 枚数 | 概要 |",
+            "| --- | --- |",
+            "{{#each pages}}",
+            "| {{number}}枚目 | {{title}} |",
+            "{{/each}}",
+        ],
+        'page_heading': "## {{number}}枚目\n\n",
+        'pages': [{'title': 'TOP', 'body': ["{{body}}", "続き"]}],
+    })
+    context = {
+        'title': '| 表ではない |', 'variants': [{'color': '黒', 'jan': '1|2'}], 'flag': False,
+        'alt': '画像', 'src': 'a.png', 'body': '# 見出しではない',
+    }
+    lp_document = layout.render_document(context)
+    assert to_markdown(lp_document) == layout.render(context)
+    
+    header, first_page, footer = lp_document['blocks']
+    assert header['blocks'] == [
+        heading(1, '| 表ではない |'),
+        table(['種類', 'JAN'], [['黒', '1|2']], blank_lines=2),
+        image('a.png', '画像', '300x200', blank_lines=0),
+        table(['枚数', '概要'], [['1枚目', 'TOP']], blank_lines=0),
+    ]
+    assert first_page['blocks'] == [heading(2, '1枚目', blank_lines=1), paragraph('# 見出しではない\n続き', blank_lines=0)]
+    assert footer['blocks'] == []
+
+def test_layout_document_rejects_blocks_across_lines():
+    layout = LPLayout({'header': ["{{#if flag}}a", "b{{/if}}"], 'pages': []})
+    with pytest.raises(TemplateSyntaxError):
+        layout.render_document({})
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+解析キャッシュ（parse_cache.py）のテスト
+"""
+
+import itertools
+import json
+import os
+
+import pytest
+
+import parse_cache
+from parse_cache import ParseCache, cached_parser
+
+def _fake_clock(monkeypatch):
+    """最終アクセス時刻を呼び出しごとに1秒ずつ進める"""
+    clock = itertools.count(1000)
+    monkeypatch.setattr(parse_cache.time, 'time', lambda: float(next(clock)))
+
+def _payload_size(value):
+    return len(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+
+def test_get_returns_stored_value(tmp_path):
+    cache = ParseCache(str(tmp_path / 'cache.sqlite3'))
+    key = cache.make_key('hash', 'parser', 1)
+    
+    assert cache.get(key) is None
+    cache.put(key, 'parser', 'hash', {'商品名': 'テスト', 'pages': [1, 2]})
+    assert cache.get(key) == {'商品名': 'テスト', 'pages': [1, 2]}
+
+def test_eviction_removes_least_recently_used(tmp_path, monkeypatch):
+    _fake_clock(monkeypatch)
+    value = 'x' * 100
+    cache = ParseCache(str(tmp_path / 'cache.sqlite3'), max_bytes=_payload_size(value) * 3)
+    
+    for name in ('a', 'b', 'c'):
+        cache.put(name, 'parser', name, value)
+    # a を読んで最終アクセスを更新すると、次に古い b が先に消える
+    assert cache.get('a') == value
+    cache.put('d', 'parser', 'd', value)
+    
+    assert cache.get('b') is None
+    assert [cache.get(name) for name in ('a', 'c', 'd')] == [value, value, value]
+
+def test_eviction_keeps_total_size_under_limit(tmp_path, monkeypatch):
+    _fake_clock(monkeypatch)
+    value = 'y' * 100
+    cache = ParseCache(str(tmp_path / 'cache.sqlite3'), max_bytes=_payload_size(value) * 2)
+    
+    for index in range(5):
+        cache.put(f'key{index}', 'parser', f'hash{index}', value)
+    
+    assert [cache.get(f'key{index}') for index in range(5)] == [None, None, None, value, value]
+
+def test_value_larger_than_limit_is_not_stored(tmp_path):
+    cache = ParseCache(str(tmp_path / 'cache.sqlite3'), max_bytes=10)
+    cache.put('big', 'parser', 'hash', 'z' * 100)
+    assert cache.get('big') is None
+
+def test_cached_parser_is_keyed_by_content_and_extra(tmp_path, parse_cache):
+    calls = []
+    backend = ['first']
+    
+    @cached_parser('test_parser', version=1, key_extra=lambda: backend[0])
+    def parse(path):
+        calls.append(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            return {'text': f.read()}
+    
+    input_path = tmp_path / 'input.txt'
+    input_path.write_text('one', encoding='utf-8')
+    copy_path = tmp_path / 'copy.txt'
+    copy_path.write_text('one', encoding='utf-8')
+    
+    assert parse(str(input_path)) == {'text': 'one'}
+    # 同じ内容なら別のパスでもキャッシュから返す
+    assert parse(str(copy_path)) == {'text': 'one'}
+    assert len(calls) == 1
+    
+    input_path.write_text('two', encoding='utf-8')
+    assert parse(str(input_path)) == {'text': 'two'}
+    backend[0] = 'second'
+    assert parse(str(input_path)) == {'text': 'two'}
+    assert len(calls) == 3
+
+@pytest.mark.skipif(not os.path.isdir('/proc/self/fd'), reason='/proc/self/fd が必要')
+def test_operations_close_their_connections(tmp_path):
+    cache = ParseCache(str(tmp_path / 'cache.sqlite3'))
+    cache.put('warmup', 'parser', 'hash', 'value')
+    open_files = len(os.listdir('/proc/self/fd'))
+    
+    for index in range(50):
+        cache.put(f'key{index}', 'parser', f'hash{index}', index)
+        assert cache.get(f'key{index}') == index
+    
+    assert len(os.listdir('/proc/self/fd')) <= open_files
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+商品データのバッチ検証（record_validator.py）のテスト
+"""
+
+from record_validator import RECORD_TYPE_CORRECT, RECORD_TYPE_ROUGH, validate_batch, validate_record
+
+def _rough_record(**overrides):
+    record = {'product_name': 'テスト商品', 'purpose': '新商品LP', 'target_platform': '自社EC'}
+    record.update(overrides)
+    return record
+
+def test_valid_rough_record_has_no_errors():
+    record = _rough_record(
+        lp_structure=['ファーストビュー'],
+        sku_list=[{'type': 'ブラック', 'sku': 'SKU-1', 'jan': '4571427130640'}],
+        page_details=[{'text': '本文', 'images': [], 'has_images': True}],
+    )
+    assert validate_record(record) == []
+
+def test_all_errors_of_a_record_are_reported():
+    record = _rough_record(purpose='', lp_structure='ファーストビュー', sku_list=[{'type': '赤', 'sku': '', 'jan': ''}])
+    errors = validate_record(record)
+    
+    assert len(errors) == 3
+    assert any("'purpose'" in error for error in errors)
+    assert any("'lp_structure'" in error for error in errors)
+    assert any('SKU 1行目' in error for error in errors)
+
+def test_correct_record_requires_product_name():
+    assert validate_record({'商品名': 'テスト', 'セールスポイント': ['a']}, RECORD_TYPE_CORRECT) == []
+    assert validate_record({'商品名': '', 'セールスポイント': ['a']}, RECORD_TYPE_CORRECT)
+
+def test_validate_batch_splits_valid_records_and_problems():
+    records = [_rough_record(), _rough_record(product_name=''), 'not a record', _rough_record(product_name='3件目')]
+    valid, problems = validate_batch(records, RECORD_TYPE_ROUGH, start=1)
+    
+    assert [index for index, _ in valid] == [1, 4]
+    assert [problem['index'] for problem in problems] == [2, 3]
+    assert all(problem['errors'] for problem in problems)
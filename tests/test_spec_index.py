@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+複数商品CSVのオフセット索引（spec_index.py）のテスト
+"""
+
+import csv
+
+import pytest
+
+from correct_lp_generator import iter_kishima_csv_products
+from spec_index import SpecFileIndex
+
+def _row(key='', value='', point=''):
+    return ['', '', '', point, key, value]
+
+EXPORT_ROWS = [
+    ['規定書', '', '', '', '', ''],
+    _row('商品名', 'Alpha'), _row('メーカー型番', 'PAQ-A'),
+    _row('JANコード', 'ブラック：4571427130640'), _row('', 'ベージュ：4571427130657'),
+    _row('備考', '1行目'), _row('備考', '2行目'),
+    _row(point='セールスポイント'), _row(point='●a'),
+    # 2件目は「メーカー型番」が「商品名」より前にある
+    ['規定書', '', '', '', '', ''],
+    _row('メーカー型番', 'PAQ-B'), _row('商品名', 'Beta'),
+    _row('JANコード', 'ブラック：4571427130664'),
+    _row(point='セールスポイント'), _row(point='●b'),
+    _row('商品名', 'Gamma'), _row('備考', '複数行\nのセル'),
+]
+
+@pytest.mark.parametrize('encoding', ['utf-8', 'utf-8-sig', 'cp932'])
+def test_index_lookups_match_streaming_split(tmp_path, encoding):
+    csv_path = tmp_path / 'export.csv'
+    with open(csv_path, 'w', encoding=encoding, newline='') as f:
+        csv.writer(f).writerows(EXPORT_ROWS)
+    
+    streamed = list(iter_kishima_csv_products(str(csv_path)))
+    index = SpecFileIndex(str(csv_path))
+    
+    assert [product['商品名'] for product in streamed] == ['Alpha', 'Beta', 'Gamma']
+    assert [index.read_product(number) for number in range(len(index))] == streamed
+    assert list(index.iter_products()) == streamed
+    # 索引ファイルから読み直しても同じ
+    assert SpecFileIndex(str(csv_path)).loaded_from_index
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+規定書の「色名：JAN」欄からバリエーション（色・JAN）を抽出するモジュール
+全角・半角のコロン、読点・カンマ・改行区切りに対応し、JANのチェックデジットを検証します
+"""
+
+import re
+import sys
+from typing import Dict, Any, Iterable, List, Optional
+
+# 区切り文字（改行・カンマ・読点・スラッシュ）と列結合用のレコード区切り
+VARIANT_SEPARATORS = '\n,，、/／'
+RECORD_SEPARATOR = '\x1e'
+
+# 色名の前に付くことがある見出し（例: 「カラー ブラック」）
+COLOR_PREFIXES = ('カラー', 'color', 'Color')
+
+# 「色名：JAN」1組（色名は区切り文字・コロンを含まない最短一致、JANは8〜14桁）
+_COLOR_CLASS = '[^' + re.escape(VARIANT_SEPARATORS + RECORD_SEPARATOR) + '：:]'
+VARIANT_PATTERN = re.compile(
+    r'\s*(?:(?:' + '|'.join(COLOR_PREFIXES) + r')\s*(?=[^\s：:]))?'
+    r'(?P<color>' + _COLOR_CLASS + r'+?)'
+    r'\s*[：:]\s*(?P<jan>\d{8,14})(?!\d)'
+)
+
+# 列をまとめて走査するためのパターン（レコード区切りも1つの一致として拾う）
+COLUMN_PATTERN = re.compile('(' + RECORD_SEPARATOR + ')|' + VARIANT_PATTERN.pattern)
+
+def is_valid_jan(code: str) -> bool:
+    """JAN（GTIN-8/13、UPCの12桁・GTIN-14も可）のチェックデジットを検証"""
+    
+    if len(code) not in (8, 12, 13, 14) or not code.isdigit():
+        return False
+    
+    # チェックデジットを除いた右端から 3,1,3,1... の重み
+    total = sum(map(int, code[-2::-2])) * 3 + sum(map(int, code[-3::-2]))
+    return (10 - total % 10) % 10 == int(code[-1])
+
+def extract_variants(jan_info: Optional[str]) -> List[Dict[str, Any]]:
+    """JAN欄のテキストから [{'color', 'jan', 'valid'}] を出現順に抽出（同じ色・JANの重複は除く）"""
+    
+    if not jan_info:
+        return []
+    
+    variants = []
+    seen = set()
+    for pair in VARIANT_PATTERN.findall(jan_info):
+        if pair not in seen:
+            seen.add(pair)
+            variants.append({'color': pair[0], 'jan': pair[1], 'valid': is_valid_jan(pair[1])})
+    return variants
+
+def extract_variants_column(values: Iterable[Any]) -> List[List[Dict[str, Any]]]:
+    """カタログ列（JAN欄の値の並び）をまとめて抽出し、行ごとのバリエーション一覧を返す
+    
+    列全体をレコード区切りで連結して1回の findall で照合し、区切りの一致で行を進める
+    （行ごとに正規表現を呼び出すオーバーヘッドを避ける）。同じJANの検証結果は使い回す。
+    """
+    
+    texts = ['' if value is None else str(value) for value in values]
+    results = [[] for _ in texts]
+    if not texts:
+        return results
+    
+    validity = {}
+    row = 0
+    variants = results[0]
+    seen = set()
+    for separator, color, jan in COLUMN_PATTERN.findall(RECORD_SEPARATOR.join(texts)):
+        if separator:
+            row += 1
+            variants = results[row]
+            seen = set()
+            continue
+        pair = (color, jan)
+        if pair in seen:
+            continue
+        seen.add(pair)
+        valid = validity.get(jan)
+        if valid is None:
+            valid = validity[jan] = is_valid_jan(jan)
+        variants.append({'color': color, 'jan': jan, 'valid': valid})
+    return results
+
+def main():
+    """メイン処理"""
+    
+    if len(sys.argv) < 2:
+        print("使用方法:")
+        print("  python variant_extractor.py <JAN欄のテキスト>")
+        print("\n例:")
+        print("  python variant_extractor.py \"ブラック：4571427000004、ベージュ:4571427000011\"")
+        sys.exit(1)
+    
+    variants = extract_variants(sys.argv[1].replace('\\n', '\n'))
+    if not variants:
+        print("❌ バリエーションが見つかりません")
+        sys.exit(1)
+    
+    for variant in variants:
+        mark = "✅" if variant['valid'] else "❌ チェックデジット不一致"
+        print(f"  {variant['color']}: {variant['jan']} {mark}")
+
+if __name__ == "__main__":
+    main()
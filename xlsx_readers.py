@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+xlsxワークブックの読み取りバックエンド（openpyxl / calamine / pandas）を切り替えて使う共通インターフェース
+バックエンドは引数・環境変数 LP_XLSX_BACKEND の順で決まります（デフォルト: openpyxl）
+"""
+
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+XLSX_BACKEND_ENV = 'LP_XLSX_BACKEND'
+
+BACKEND_OPENPYXL = 'openpyxl'
+BACKEND_CALAMINE = 'calamine'
+BACKEND_PANDAS = 'pandas'
+DEFAULT_BACKEND = BACKEND_OPENPYXL
+
+# バックエンド → インストールが必要なパッケージ
+BACKEND_PACKAGES = {
+    BACKEND_OPENPYXL: 'openpyxl',
+    BACKEND_CALAMINE: 'python-calamine',
+    BACKEND_PANDAS: 'pandas',
+}
+
+class XlsxReader(ABC):
+    """ワークブック読み取りの共通インターフェース（行はセル値のタプル、空セルは None）"""
+    
+    backend = None
+    
+    def __init__(self, excel_path: str):
+        """初期化"""
+        self.excel_path = excel_path
+    
+    @property
+    @abstractmethod
+    def sheet_names(self) -> List[str]:
+        """シート名の一覧"""
+    
+    @abstractmethod
+    def iter_rows(self, sheet_name: Optional[str] = None) -> Iterator[Sequence[Any]]:
+        """指定シート（省略時は先頭/アクティブシート）の行を先頭から順に返す"""
+    
+    def close(self):
+        pass
+    
+    def __enter__(self) -> 'XlsxReader':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+class OpenpyxlReader(XlsxReader):
+    """openpyxl の読み込み専用（ストリーミング）モード"""
+    
+    backend = BACKEND_OPENPYXL
+    
+    def __init__(self, excel_path: str):
+        """初期化"""
+        import openpyxl
+        super().__init__(excel_path)
+        # 旧テンプレートの "====" 見出しは数式セルとして保存されているため data_only は使わない
+        self.workbook = openpyxl.load_workbook(excel_path, read_only=True)
+    
+    @property
+    def sheet_names(self) -> List[str]:
+        return self.workbook.sheetnames
+    
+    def iter_rows(self, sheet_name: Optional[str] = None) -> Iterator[Sequence[Any]]:
+        sheet = self.workbook[sheet_name] if sheet_name else self.workbook.active
+        return sheet.iter_rows(values_only=True)
+    
+    def close(self):
+        self.workbook.close()
+
+def _calamine_cell(value: Any) -> Any:
+    """calamine のセル値を openpyxl と同じ型にそろえる（空文字は None、整数値の float は int）"""
+    if value == '':
+        return None
+    if value.__class__ is float and value.is_integer():
+        return int(value)
+    return value
+
+class CalamineReader(XlsxReader):
+    """python-calamine（Rust実装）による高速読み取り（数式セルはキャッシュ値のみ）"""
+    
+    backend = BACKEND_CALAMINE
+    
+    def __init__(self, excel_path: str):
+        """初期化"""
+        from python_calamine import CalamineWorkbook
+        super().__init__(excel_path)
+        self.workbook = CalamineWorkbook.from_path(excel_path)
+    
+    @property
+    def sheet_names(self) -> List[str]:
+        return self.workbook.sheet_names
+    
+    def iter_rows(self, sheet_name: Optional[str] = None) -> Iterator[Sequence[Any]]:
+        sheet = (
+            self.workbook.get_sheet_by_name(sheet_name) if sheet_name
+            else self.workbook.get_sheet_by_index(0)
+        )
+        for row in sheet.iter_rows():
+            yield tuple(_calamine_cell(value) for value in row)
+    
+    def close(self):
+        close = getattr(self.workbook, 'close', None)
+        if close:
+            close()
+
+class PandasReader(XlsxReader):
+    """pandas.read_excel によるシート単位の一括読み取り（数式セルはキャッシュ値のみ）"""
+    
+    backend = BACKEND_PANDAS
+    
+    def __init__(self, excel_path: str):
+        """初期化"""
+        import pandas
+        super().__init__(excel_path)
+        self.pandas = pandas
+        self.excel_file = pandas.ExcelFile(excel_path)
+    
+    @property
+    def sheet_names(self) -> List[str]:
+        return self.excel_file.sheet_names
+    
+    def iter_rows(self, sheet_name: Optional[str] = None) -> Iterator[Sequence[Any]]:
+        # 型推論でJANなどが float になるのを避けるため object のまま読む
+        frame = self.excel_file.parse(sheet_name if sheet_name else 0, header=None, dtype=object)
+        return frame.itertuples(index=False, name=None)
+    
+    def close(self):
+        self.excel_file.close()
+
+XLSX_READERS = {
+    BACKEND_OPENPYXL: OpenpyxlReader,
+    BACKEND_CALAMINE: CalamineReader,
+    BACKEND_PANDAS: PandasReader,
+}
+
+def get_xlsx_backend() -> str:
+    """環境変数で指定されたバックエンド名（未指定ならデフォルト）"""
+    return os.environ.get(XLSX_BACKEND_ENV) or DEFAULT_BACKEND
+
+def set_xlsx_backend(backend: str):
+    """バックエンドを指定（環境変数経由なのでワーカープロセスにも引き継がれる）"""
+    if backend not in XLSX_READERS:
+        raise ValueError(f"未対応のxlsxバックエンド: {backend}（{' / '.join(XLSX_READERS)}）")
+    os.environ[XLSX_BACKEND_ENV] = backend
+
+def available_backends() -> Dict[str, bool]:
+    """各バックエンドのパッケージがインストール済みか"""
+    import importlib.util
+    modules = {BACKEND_OPENPYXL: 'openpyxl', BACKEND_CALAMINE: 'python_calamine', BACKEND_PANDAS: 'pandas'}
+    return {backend: importlib.util.find_spec(module) is not None for backend, module in modules.items()}
+
+def open_xlsx(excel_path: str, backend: Optional[str] = None) -> XlsxReader:
+    """指定（省略時は設定）のバックエンドでワークブックを開く"""
+    
+    backend = backend or get_xlsx_backend()
+    reader_class = XLSX_READERS.get(backend)
+    if reader_class is None:
+        raise ValueError(f"未対応のxlsxバックエンド: {backend}（{' / '.join(XLSX_READERS)}）")
+    try:
+        return reader_class(excel_path)
+    except ImportError:
+        raise ImportError(
+            f"xlsxバックエンド {backend} には {BACKEND_PACKAGES[backend]} が必要です: pip install {BACKEND_PACKAGES[backend]}"
+        )